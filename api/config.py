@@ -17,20 +17,59 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)  # NEU: Datenbank-Verzeichnis
 
 # Datei-Einstellungen
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "500"))
+# Uploads werden hier gestreamt und erst nach der Prüfung ins Job-Verzeichnis verschoben
+INCOMING_DIR = UPLOAD_DIR / ".incoming"
 ALLOWED_EXTENSIONS = {".pdf"}
 
 # Job-Einstellungen
 JOB_RETENTION_MINUTES = 15  # Nach 15 Minuten automatisch löschen
 MAX_JOBS_PER_IP_PER_HOUR = 999999  # Rate-Limiting (DISABLED FOR TESTING)
 
-# Datenbank
+# Parsing: Worker-Prozesse für seitenparalleles Parsen (1 = seriell)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "1"))
+PARSE_PARALLEL_MIN_PAGES = int(os.getenv("PARSE_PARALLEL_MIN_PAGES", "8"))
+# Fonts, die der Worker über Jobs hinweg behält (LRU, 0 = nur pro Dokument)
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "64"))
+# Arbeitsbudget pro Seite (0 = unbegrenzt): Seiten darüber werden übersprungen
+# und als Warnung am Job vermerkt, statt den Worker bis zum Task-Timeout zu blockieren
+PAGE_MAX_CHARS = int(os.getenv("PAGE_MAX_CHARS", "20000"))
+PAGE_MAX_OBJECTS = int(os.getenv("PAGE_MAX_OBJECTS", "20000"))
+PAGE_MAX_SECONDS = float(os.getenv("PAGE_MAX_SECONDS", "10"))
+# Ergebnis-Cache nach PDF-Hash (erneuter Upload desselben Auszugs): Obergrenze
+# in Bytes (0 = aus), Einträge leben höchstens JOB_RETENTION_MINUTES
+CONVERSION_CACHE_DIR = Path(os.getenv("CONVERSION_CACHE_DIR", str(DATA_DIR / "conversion_cache")))
+CONVERSION_CACHE_MAX_BYTES = int(os.getenv("CONVERSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Größere Auszüge werden nicht gecacht (die Transaktionen werden dafür im Speicher gesammelt)
+CONVERSION_CACHE_MAX_ROWS = int(os.getenv("CONVERSION_CACHE_MAX_ROWS", "20000"))
+# Server-Geheimnis für die Schlüssel der Einträge (der PDF-Hash allein reicht
+# nicht); ohne Angabe wird es einmal zufällig erzeugt und in der Datei abgelegt
+CONVERSION_CACHE_SECRET = os.getenv("CONVERSION_CACHE_SECRET", "")
+CONVERSION_CACHE_SECRET_FILE = Path(os.getenv("CONVERSION_CACHE_SECRET_FILE", str(DATA_DIR / "conversion_cache.secret")))
+
+# Datenbank: DATABASE_URL wählt den Job-Store (sqlite:///..., redis://..., postgresql://...)
 DATABASE_PATH = os.getenv("DATABASE_PATH", str(DATA_DIR / "jobs.db"))
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATABASE_PATH}")
+# SQLite: Wartezeit auf Sperren, fsync-Stufe (NORMAL reicht im WAL-Modus) und
+# gecachte Prepared Statements pro Verbindung
+DATABASE_BUSY_TIMEOUT_MS = int(os.getenv("DATABASE_BUSY_TIMEOUT_MS", "5000"))
+DATABASE_SYNCHRONOUS = os.getenv("DATABASE_SYNCHRONOUS", "NORMAL")
+DATABASE_CACHED_STATEMENTS = int(os.getenv("DATABASE_CACHED_STATEMENTS", "64"))
+# Threads, auf denen die async-Routen der API Datenbankzugriffe ausführen
+# (je eine Verbindung pro Thread)
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "4"))
 
 # Celery (Redis)
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
+# Status-Events per Redis Pub/Sub an den Browser (SSE); leer = nur Polling
+JOB_EVENTS_URL = os.getenv("JOB_EVENTS_URL", CELERY_BROKER_URL)
+# Kommentarzeile im Stream, damit Proxys die Verbindung nicht schließen
+JOB_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", "15"))
+# Danach endet ein Stream auch ohne fertigen Job (der Browser pollt weiter)
+JOB_EVENTS_MAX_SECONDS = float(os.getenv("JOB_EVENTS_MAX_SECONDS", "600"))
+
 # DSGVO-Einstellungen
 LOG_IP_ADDRESSES = False  # IPs nicht loggen (DSGVO)
 ANONYMIZE_LOGS = True  # Logs anonymisieren
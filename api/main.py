@@ -11,7 +11,8 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from api.routes import upload, jobs, download, preview
-from api.services.database import init_db
+from api.services.database import init_db, shutdown_pool
+from api.services.job_events import job_events
 from api.services.cleanup import start_cleanup_scheduler
 
 # Logging-Konfiguration
@@ -35,6 +36,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("👋 Shutting down Kontoauszug2Excel API")
+    shutdown_pool()
+    await job_events.close()
 
 
 app = FastAPI(
@@ -5,7 +5,7 @@ Speichert nur Metadaten, keine Transaktionsdaten (DSGVO)
 from enum import Enum
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class JobStatus(str, Enum):
@@ -31,6 +31,11 @@ class JobResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    detection: Optional[str] = None  # Signal der Auto-Detection (z.B. "bic+table_header")
+    pages_total: Optional[int] = None
+    pages_skipped: Optional[int] = None  # Seiten ohne Buchungen, von der Triage übersprungen
+    pages_over_budget: Optional[int] = None  # Seiten über dem Arbeitsbudget, übersprungen
+    warnings: List[str] = []
     download_url: Optional[str] = None
     expires_at: Optional[datetime] = None
 
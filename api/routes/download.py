@@ -7,9 +7,10 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 
 from api.config import UPLOAD_DIR
-from api.services.database import get_job
+from api.services.database import get_job_async, run_in_pool
 from api.services.cleanup import delete_job_files
 from api.models.job import JobStatus
+from core.exporter import MEDIA_TYPES
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -26,7 +27,7 @@ async def download_result(job_id: str):
     Returns:
         FileResponse mit Excel-Datei
     """
-    job = get_job(job_id)
+    job = await get_job_async(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
@@ -49,7 +50,7 @@ async def download_result(job_id: str):
     return FileResponse(
         path=str(output_file),
         filename=f"kontoauszug_{job_id[:8]}.{job.output_format}",
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        media_type=MEDIA_TYPES.get(job.output_format, "application/octet-stream")
     )
 
 
@@ -65,12 +66,12 @@ async def delete_job_data(job_id: str):
     Returns:
         Bestätigung
     """
-    job = get_job(job_id)
+    job = await get_job_async(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
 
-    delete_job_files(job_id)
+    await run_in_pool(delete_job_files, job_id)
 
     logger.info(f"User deleted job {job_id}")
 
@@ -1,10 +1,19 @@
 """
-Job-Status-Endpoint
+Job-Status-Endpoints (Abfrage und Server-Sent Events)
 """
+import json
 import logging
+import time
+from typing import AsyncIterator
+
+import redis
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.config import JOB_EVENTS_KEEPALIVE_SECONDS, JOB_EVENTS_MAX_SECONDS
 from api.models.job import JobResponse
-from api.services.database import get_job
+from api.services.database import get_job_async
+from api.services.job_events import FINAL_STATUSES, JobSubscription, job_events
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,9 +30,80 @@ async def get_job_status(job_id: str):
     Returns:
         JobResponse mit aktuellem Status
     """
-    job = get_job(job_id)
+    job = await get_job_async(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
 
     return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_status(job_id: str):
+    """
+    Status eines Jobs als Server-Sent Events: zuerst der aktuelle Stand,
+    danach jede Änderung (Event `status`, Daten wie bei `/jobs/{job_id}`).
+    Der Stream endet, sobald der Job fertig oder fehlgeschlagen ist.
+
+    Args:
+        job_id: UUID des Jobs
+
+    Returns:
+        StreamingResponse (text/event-stream); 503, wenn keine Events
+        verfügbar sind (der Client fragt dann per Polling nach)
+    """
+    if not job_events.enabled:
+        raise HTTPException(status_code=503, detail="Live-Status nicht verfügbar")
+
+    # Erst abonnieren, dann lesen: sonst gehen Events dazwischen verloren
+    try:
+        subscription = await job_events.subscribe(job_id)
+    except redis.RedisError as e:
+        logger.warning(f"Job events unavailable: {type(e).__name__}")
+        raise HTTPException(status_code=503, detail="Live-Status nicht verfügbar")
+
+    try:
+        job = await get_job_async(job_id)
+    except BaseException:
+        await subscription.close()
+        raise
+    if not job:
+        await subscription.close()
+        raise HTTPException(status_code=404, detail="Job nicht gefunden")
+
+    return StreamingResponse(
+        _status_events(job, subscription),
+        media_type="text/event-stream",
+        # Kein Puffern in Nginx & Co., sonst kommen Events erst am Ende an
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _status_events(job: JobResponse, subscription: JobSubscription) -> AsyncIterator[str]:
+    """Aktueller Stand, dann Events bis zum Endzustand, dazwischen Keepalives"""
+    async with subscription:
+        yield _event(job.model_dump_json())
+        if job.status.value in FINAL_STATUSES:
+            return
+
+        started = last_sent = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now - started >= JOB_EVENTS_MAX_SECONDS:
+                return
+            data = await subscription.next(
+                timeout=min(JOB_EVENTS_KEEPALIVE_SECONDS, started + JOB_EVENTS_MAX_SECONDS - now))
+            if data is None:
+                if time.monotonic() - last_sent >= JOB_EVENTS_KEEPALIVE_SECONDS:
+                    yield ": keepalive\n\n"
+                    last_sent = time.monotonic()
+                continue
+
+            yield _event(data)
+            last_sent = time.monotonic()
+            if json.loads(data).get("status") in FINAL_STATUSES:
+                return
+
+
+def _event(data: str) -> str:
+    return f"event: status\ndata: {data}\n\n"
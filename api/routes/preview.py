@@ -3,14 +3,16 @@ Preview and Update Endpoints
 Ermöglicht Vorschau und Bearbeitung von konvertierten Daten
 """
 import logging
-import json
-import pandas as pd
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from pathlib import Path
+from typing import List, Dict, Any, Optional
 
-from api.services.database import get_job, update_job
+from api.services.database import get_job_async
+from core.batch import (
+    AMOUNT_EUR, BOOKING_DATE, COUNTERPARTY, DESCRIPTION, REMARK, TRANSACTION_TYPE,
+    TransactionBatch, infer_schema,
+)
+from core.exporter import export_batches, read_batch
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -44,6 +46,47 @@ class UpdateRequest(BaseModel):
         extra = 'allow'
 
 
+def _column_text(batch: TransactionBatch, role: str) -> Optional[List[str]]:
+    column = batch.role(role)
+    if column is None:
+        return None
+    return ["" if value is None else str(value) for value in batch.values(column.name)]
+
+
+def _format_amount(value: float) -> str:
+    return f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def preview_transactions(batch: TransactionBatch) -> List[Transaction]:
+    """
+    Bildet die Spalten des Batches über ihre Rollen im gemeinsamen Schema
+    auf die Vorschau ab (spaltenweise, unabhängig von der Bank).
+    """
+    count = len(batch)
+    empty = [""] * count
+
+    dates = _column_text(batch, BOOKING_DATE) or empty
+    description = _column_text(batch, DESCRIPTION)
+    if description is None:
+        # ING: Buchungsart + Empfänger statt einer Beschreibungsspalte
+        parts = [_column_text(batch, role) for role in (TRANSACTION_TYPE, COUNTERPARTY)]
+        parts = [part for part in parts if part is not None]
+        description = [" ".join(filter(None, values)) for values in zip(*parts)] if parts else empty
+    references = _column_text(batch, REMARK) or empty
+
+    debit, credit = empty, empty
+    amount_column = batch.role(AMOUNT_EUR)
+    if amount_column is not None:
+        amounts = batch.typed(amount_column.name)
+        debit = [_format_amount(-a) if isinstance(a, float) and a < 0 else "" for a in amounts]
+        credit = [_format_amount(a) if isinstance(a, float) and a >= 0 else "" for a in amounts]
+
+    return [
+        Transaction(date=d, description=desc, reference=ref, debit=deb, credit=cred)
+        for d, desc, ref, deb, cred in zip(dates, description, references, debit, credit)
+    ]
+
+
 @router.get("/preview/{job_id}", response_model=PreviewResponse)
 async def get_preview(job_id: str):
     """
@@ -55,7 +98,7 @@ async def get_preview(job_id: str):
     Returns:
         PreviewResponse mit allen Transaktionsdaten
     """
-    job = get_job(job_id)
+    job = await get_job_async(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
@@ -63,50 +106,23 @@ async def get_preview(job_id: str):
     # Try to find result file even if job status is not completed yet
     from api.config import UPLOAD_DIR
     job_dir = UPLOAD_DIR / job_id
-    result_path = None
+    result_path = job_dir / f"output.{job.output_format}"
 
     logger.info(f"Looking for result file in: {job_dir}")
 
-    # Look for output file
-    if (job_dir / "output.xlsx").exists():
-        result_path = job_dir / "output.xlsx"
-        logger.info(f"Found output.xlsx")
-    elif (job_dir / "output.csv").exists():
-        result_path = job_dir / "output.csv"
-        logger.info(f"Found output.csv")
-    elif job.get('result_path'):
-        result_path = Path(job['result_path'])
-        logger.info(f"Using result_path from job: {result_path}")
-
-    if not result_path or not result_path.exists():
+    if not result_path.exists():
         logger.error(f"Result file not found. Job dir contents: {list(job_dir.iterdir()) if job_dir.exists() else 'dir not found'}")
         raise HTTPException(status_code=404, detail="Ergebnisdatei nicht gefunden")
 
     try:
-        # Lese Excel/CSV Datei
-        if job['output_format'] == 'xlsx':
-            df = pd.read_excel(result_path)
-        else:
-            df = pd.read_csv(result_path)
-
-        # Konvertiere zu JSON-kompatiblem Format
-        transactions = []
-        for _, row in df.iterrows():
-            transaction = Transaction(
-                date=str(row.get('Date', row.get('Datum', ''))),
-                description=str(row.get('Description', row.get('Beschreibung', ''))),
-                reference=str(row.get('Reference', row.get('Referenz', ''))),
-                debit=str(row.get('Debit', row.get('Soll', ''))),
-                credit=str(row.get('Credit', row.get('Haben', ''))),
-                balance=str(row.get('Balance', row.get('Saldo', '')))
-            )
-            transactions.append(transaction)
+        # Ergebnisdatei spaltenweise einlesen
+        batch = read_batch(result_path, job.output_format)
 
         return PreviewResponse(
             job_id=job_id,
-            bank=job['bank'],
-            output_format=job['output_format'],
-            transactions=transactions
+            bank=job.bank or "",
+            output_format=job.output_format,
+            transactions=preview_transactions(batch)
         )
 
     except Exception as e:
@@ -126,29 +142,24 @@ async def update_preview(job_id: str, request: UpdateRequest):
     Returns:
         Job-Informationen
     """
-    job = get_job(job_id)
+    job = await get_job_async(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail="Job nicht gefunden")
 
-    if job['status'] != 'completed':
+    if job.status != 'completed':
         raise HTTPException(
             status_code=400,
-            detail=f"Job ist noch nicht abgeschlossen (Status: {job['status']})"
+            detail=f"Job ist noch nicht abgeschlossen (Status: {job.status.value})"
         )
 
     # Find the output file
     from api.config import UPLOAD_DIR
     job_dir = UPLOAD_DIR / job_id
-    output_file = job_dir / f"output.{job['output_format']}"
+    output_file = job_dir / f"output.{job.output_format}"
 
     if not output_file.exists():
-        # Try alternative path
-        if job.get('result_path'):
-            output_file = Path(job['result_path'])
-
-        if not output_file.exists():
-            raise HTTPException(status_code=404, detail="Output-Datei nicht gefunden")
+        raise HTTPException(status_code=404, detail="Output-Datei nicht gefunden")
 
     try:
         logger.info(f"Updating job {job_id} with {len(request.transactions)} transactions")
@@ -156,36 +167,27 @@ async def update_preview(job_id: str, request: UpdateRequest):
         logger.info(f"Output file path: {output_file}")
         logger.info(f"Sample transaction: {request.transactions[0] if request.transactions else 'No transactions'}")
 
-        # Konvertiere Transaktionen zu DataFrame mit dynamischen Headers
-        data = []
+        # Transaktionen mit dynamischen Headers spaltenweise sammeln;
+        # Datums- und Betragsspalten werden anhand der Header wieder typisiert
+        batch = TransactionBatch(infer_schema(request.headers))
         for i, trans in enumerate(request.transactions):
             row = {}
             for header in request.headers:
                 # Get value from transaction dict, default to empty string
                 value = trans.get(header, '')
                 row[header] = str(value) if value is not None else ''
-            data.append(row)
+            batch.append(row)
 
             # Log first row for debugging
             if i == 0:
                 logger.info(f"First row data: {row}")
 
-        if not data:
+        if not len(batch):
             raise ValueError("Keine Transaktionsdaten zum Speichern vorhanden")
 
-        df = pd.DataFrame(data, columns=request.headers)
-
-        logger.info(f"Created DataFrame with shape: {df.shape}")
-        logger.info(f"DataFrame columns: {df.columns.tolist()}")
-        logger.info(f"DataFrame head:\n{df.head()}")
-
         # Speichere aktualisierte Datei
-        if job['output_format'] == 'xlsx':
-            df.to_excel(output_file, index=False, engine='openpyxl')
-            logger.info(f"Saved updated Excel file to: {output_file}")
-        else:
-            df.to_csv(output_file, index=False)
-            logger.info(f"Saved updated CSV file to: {output_file}")
+        export_batches([batch], output_file, job.output_format)
+        logger.info(f"Saved updated {job.output_format} file to: {output_file}")
 
         # Verify file was written
         if not output_file.exists():
@@ -200,8 +202,8 @@ async def update_preview(job_id: str, request: UpdateRequest):
             "job_id": job_id,
             "status": "completed",
             "message": f"{len(request.transactions)} Transaktionen aktualisiert",
-            "bank": job['bank'],
-            "output_format": job['output_format']
+            "bank": job.bank,
+            "output_format": job.output_format
         }
 
     except ValueError as e:
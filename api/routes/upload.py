@@ -3,14 +3,17 @@ Upload-Endpoint für PDF-Kontoauszüge
 """
 import hashlib
 import logging
+import os
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
-from api.config import UPLOAD_DIR, MAX_FILE_SIZE, ALLOWED_EXTENSIONS, MAX_JOBS_PER_IP_PER_HOUR
+from api.config import UPLOAD_DIR, INCOMING_DIR, MAX_FILE_SIZE, MAX_PDF_PAGES, MAX_JOBS_PER_IP_PER_HOUR
 from api.models.job import JobCreate, JobResponse
-from api.services.database import create_job, count_recent_jobs_by_ip
+from api.services.database import create_job_async, count_recent_jobs_by_ip_async
 from api.services.tasks import process_pdf_task
+from api.services.upload_stream import UploadRejected, receive_pdf_upload
+from core.exporter import WRITERS
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -26,26 +29,24 @@ def get_ip_hash(request: Request) -> str:
 
 
 @router.post("/upload", response_model=JobResponse)
-async def upload_pdf(
-    request: Request,
-    file: UploadFile = File(...),
-    bank: str = Form("auto"),
-    output_format: str = Form("xlsx")
-):
+async def upload_pdf(request: Request):
     """
     Upload-Endpoint für PDF-Kontoauszüge.
 
-    Args:
+    Erwartet multipart/form-data mit den Feldern:
         file: PDF-Datei
         bank: Bank-Name (sparkasse, ing, auto)
-        output_format: Ausgabeformat (xlsx, csv)
+        output_format: Ausgabeformat (xlsx, csv, jsonl)
+
+    Der Body wird gestreamt (siehe api/services/upload_stream.py): zu große
+    Dateien und Nicht-PDFs werden abgelehnt, sobald das erkennbar ist.
 
     Returns:
         JobResponse mit job_id und Status
     """
     # Rate-Limiting Check (DISABLED FOR TESTING)
     ip_hash = get_ip_hash(request)
-    # recent_jobs = count_recent_jobs_by_ip(ip_hash, hours=1)
+    # recent_jobs = await count_recent_jobs_by_ip_async(ip_hash, hours=1)
     #
     # if recent_jobs >= MAX_JOBS_PER_IP_PER_HOUR:
     #     raise HTTPException(
@@ -53,49 +54,50 @@ async def upload_pdf(
     #         detail=f"Rate limit exceeded. Max {MAX_JOBS_PER_IP_PER_HOUR} uploads per hour."
     #     )
 
-    # Datei-Validierung
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(
-            status_code=400,
-            detail="Nur PDF-Dateien sind erlaubt"
-        )
+    # Datei streamen und prüfen (Größe, PDF-Header, Seitenzahl)
+    try:
+        upload = await receive_pdf_upload(request, INCOMING_DIR, MAX_FILE_SIZE, MAX_PDF_PAGES)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    bank = upload.fields.get("bank", "auto")
 
-    # Dateigröße prüfen
-    file_content = await file.read()
-    if len(file_content) > MAX_FILE_SIZE:
+    # Ausgabeformat prüfen
+    output_format = upload.fields.get("output_format", "xlsx").strip().lower()
+    if output_format not in WRITERS:
+        await run_in_threadpool(upload.path.unlink)
         raise HTTPException(
             status_code=400,
-            detail=f"Datei zu groß. Max. {MAX_FILE_SIZE / 1024 / 1024} MB erlaubt."
+            detail=f"Ausgabeformat '{output_format}' wird nicht unterstützt ({', '.join(WRITERS)})"
         )
 
     # Job erstellen
     job_data = JobCreate(bank=bank, output_format=output_format)
-    job = create_job(job_data, ip_hash=ip_hash)
+    job = await create_job_async(job_data, ip_hash=ip_hash)
 
-    # Job-Verzeichnis erstellen
-    job_dir = UPLOAD_DIR / job.job_id
-    job_dir.mkdir(parents=True, exist_ok=True)
-
-    # PDF speichern
-    input_pdf = job_dir / "input.pdf"
-    with open(input_pdf, "wb") as f:
-        f.write(file_content)
+    # PDF ins Job-Verzeichnis verschieben
+    await run_in_threadpool(_move_to_job, upload.path, UPLOAD_DIR / job.job_id)
 
-    logger.info(f"Uploaded PDF for job {job.job_id} ({len(file_content)} bytes)")
+    logger.info(f"Uploaded PDF for job {job.job_id} ({upload.size} bytes, {upload.page_count} pages)")
 
     # Celery-Task starten
-    process_pdf_task.delay(job.job_id, bank)
+    process_pdf_task.delay(job.job_id, bank, upload.sha256)
 
     return job
 
 
+def _move_to_job(path: Path, job_dir: Path):
+    job_dir.mkdir(parents=True, exist_ok=True)
+    os.replace(path, job_dir / "input.pdf")
+
+
 @router.get("/upload/limits")
 async def get_upload_limits(request: Request):
     """
     Gibt die aktuellen Rate-Limits für die IP zurück.
     """
     ip_hash = get_ip_hash(request)
-    recent_jobs = count_recent_jobs_by_ip(ip_hash, hours=1)
+    recent_jobs = await count_recent_jobs_by_ip_async(ip_hash, hours=1)
 
     return {
         "max_uploads_per_hour": MAX_JOBS_PER_IP_PER_HOUR,
@@ -8,7 +8,8 @@ import logging
 from threading import Thread
 import time
 
-from api.config import UPLOAD_DIR
+from api.config import UPLOAD_DIR, INCOMING_DIR, JOB_RETENTION_MINUTES
+from api.services.conversion_cache import conversion_cache
 from api.services.database import get_expired_jobs, delete_job
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,31 @@ def cleanup_expired_jobs():
     else:
         logger.info("No expired jobs to clean up")
 
+    cleanup_incoming_uploads()
+
+    # Abgelaufene Cache-Einträge auch ohne neue Konvertierungen löschen
+    evicted = conversion_cache.evict()
+    if evicted:
+        logger.info(f"Evicted {evicted} conversion cache entries")
+
+
+def cleanup_incoming_uploads():
+    """
+    Löscht liegengebliebene Teil-Uploads (z.B. nach einem Absturz der API
+    mitten im Upload), die älter als die Job-Aufbewahrungszeit sind.
+    """
+    if not INCOMING_DIR.exists():
+        return
+
+    cutoff = time.time() - JOB_RETENTION_MINUTES * 60
+    for path in INCOMING_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                logger.info(f"Deleted stale upload {path.name}")
+        except OSError as e:
+            logger.error(f"Error deleting stale upload {path.name}: {e}")
+
 
 def cleanup_scheduler():
     """
@@ -0,0 +1,263 @@
+"""
+Ergebnis-Cache für Konvertierungen, adressiert über den Inhalt des PDFs
+
+Lädt jemand denselben Auszug erneut hoch (anderes Ausgabeformat, Reload im
+Browser), übernimmt der Worker die Transaktionen aus dem Cache, ohne das PDF
+zu öffnen. Der Schlüssel besteht aus:
+- SHA-256 des PDFs (beim Upload berechnet)
+- angefragter Bank ("auto" oder ein Parser)
+- Version der Konvertierung: Hash über den Code in core/ und parsers/, ein
+  Deployment mit geänderten Regeln verwirft alte Einträge automatisch
+Das Ausgabeformat gehört nicht dazu, es wird erst beim Export angewendet.
+
+DSGVO: Einträge sind mit AES-GCM verschlüsselt. Schlüssel und Dateiname
+sind HMACs über Version, Bank und PDF-Hash mit einem Server-Geheimnis
+(CONVERSION_CACHE_SECRET bzw. CONVERSION_CACHE_SECRET_FILE). Der PDF-Hash
+geht als Task-Argument über den Celery-Broker; ohne das Geheimnis lassen
+sich die Einträge damit aber weder finden noch entschlüsseln. Wer Cache-
+Verzeichnis und Geheimnis lesen kann (Zugriff auf den Worker-Host), kann
+Einträge zu bekannten PDF-Hashes entschlüsseln. Einträge leben höchstens
+JOB_RETENTION_MINUTES, die Gesamtgröße ist begrenzt (älteste Einträge
+zuerst verdrängt).
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from api.config import (
+    BASE_DIR, CONVERSION_CACHE_DIR, CONVERSION_CACHE_MAX_BYTES, CONVERSION_CACHE_SECRET,
+    CONVERSION_CACHE_SECRET_FILE, JOB_RETENTION_MINUTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bei Änderungen am Eintragsformat erhöhen
+CACHE_FORMAT = 1
+# Module, deren Code das Ergebnis einer Konvertierung bestimmt
+VERSIONED_PACKAGES = ("core", "parsers")
+
+ENTRY_SUFFIX = ".bin"
+NONCE_BYTES = 12
+SECRET_BYTES = 32
+
+HITS = "hits"
+MISSES = "misses"
+STORES = "stores"
+EVICTIONS = "evictions"
+_LABELS = (HITS, MISSES, STORES, EVICTIONS)
+
+
+@lru_cache(maxsize=1)
+def conversion_version() -> str:
+    """Hash über den Code, der Erkennung und Parsing bestimmt (einmal pro Prozess)"""
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT}".encode())
+    for package in VERSIONED_PACKAGES:
+        for path in sorted((BASE_DIR / package).glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class CacheCounts:
+    """Treffer, Fehlschläge, Speicherungen und Verdrängungen seit Prozessstart"""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, label: str):
+        with self._lock:
+            self._counts[label] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {label: self._counts[label] for label in _LABELS}
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+cache_counts = CacheCounts()
+
+
+class ConversionCache:
+    """
+    Verschlüsselte Einträge als Dateien in einem Verzeichnis (geteilt von
+    allen Worker-Prozessen eines Hosts).
+
+    Args:
+        directory: Cache-Verzeichnis (wird angelegt)
+        max_bytes: Obergrenze für alle Einträge zusammen (0 = Cache aus)
+        ttl_seconds: Lebensdauer eines Eintrags ab dem Speichern
+        secret: Server-Geheimnis für die Schlüssel (leer: aus `secret_file`)
+        secret_file: Datei mit dem Geheimnis, wird bei Bedarf zufällig
+            angelegt (Standard: neben dem Cache-Verzeichnis, nicht darin)
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, ttl_seconds: float,
+                 secret: Union[str, bytes, None] = None, secret_file: Optional[Path] = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+        self.secret_file = Path(secret_file) if secret_file else self.directory.with_name(self.directory.name + ".secret")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def secret(self) -> bytes:
+        if not self._secret:
+            self._secret = _load_secret(self.secret_file)
+        return self._secret
+
+    def _derive(self, content_hash: str, bank: str):
+        material = f"{conversion_version()}:{bank}:{content_hash}".encode()
+        entry_id = hmac.new(self.secret, b"k2e-cache-id:" + material, hashlib.sha256).hexdigest()
+        key = hmac.new(self.secret, b"k2e-cache-key:" + material, hashlib.sha256).digest()
+        return self.directory / f"{entry_id}{ENTRY_SUFFIX}", entry_id.encode(), key
+
+    def get(self, content_hash: str, bank: str) -> Optional[Dict[str, Any]]:
+        """
+        Holt das Ergebnis einer früheren Konvertierung.
+
+        Args:
+            content_hash: SHA-256 des PDFs (hex)
+            bank: Angefragte Bank ("auto" oder Parser-Name)
+
+        Returns:
+            Eintrag (wie bei `put` übergeben) oder None
+        """
+        if not self.enabled:
+            return None
+        path, entry_id, key = self._derive(content_hash, bank)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                self._remove(path)
+                cache_counts.add(MISSES)
+                return None
+            data = path.read_bytes()
+            plain = AESGCM(key).decrypt(data[:NONCE_BYTES], data[NONCE_BYTES:], entry_id)
+            entry = json.loads(zlib.decompress(plain))
+        except FileNotFoundError:
+            cache_counts.add(MISSES)
+            return None
+        except (InvalidTag, ValueError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable cache entry: {type(e).__name__}")
+            self._remove(path)
+            cache_counts.add(MISSES)
+            return None
+
+        cache_counts.add(HITS)
+        return entry
+
+    def put(self, content_hash: str, bank: str, entry: Dict[str, Any]):
+        """Speichert ein Ergebnis (JSON-fähig) und verdrängt bei Bedarf alte Einträge"""
+        if not self.enabled:
+            return
+        path, entry_id, key = self._derive(content_hash, bank)
+        plain = zlib.compress(json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        nonce = os.urandom(NONCE_BYTES)
+        data = nonce + AESGCM(key).encrypt(nonce, plain, entry_id)
+        if len(data) > self.max_bytes:
+            logger.info(f"Conversion too large for cache ({len(data)} bytes)")
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Atomar ersetzen: parallele Leser sehen nie einen halben Eintrag
+        partial = self.directory / f".{uuid.uuid4()}.tmp"
+        partial.write_bytes(data)
+        os.replace(partial, path)
+        cache_counts.add(STORES)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Löscht abgelaufene Einträge und, solange die Gesamtgröße über
+        `max_bytes` liegt, die ältesten.
+
+        Returns:
+            Anzahl gelöschter Einträge
+        """
+        if not self.directory.exists():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # Abgelaufen (auch liegengebliebene Teil-Dateien)
+            if now - stat.st_mtime > self.ttl_seconds:
+                removed += self._remove(path)
+            elif path.suffix == ENTRY_SUFFIX:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+
+        for _ in range(removed):
+            cache_counts.add(EVICTIONS)
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Zähler des Prozesses plus Anzahl und Größe der Einträge im Verzeichnis"""
+        sizes = [path.stat().st_size for path in self.directory.glob(f"*{ENTRY_SUFFIX}")] \
+            if self.directory.exists() else []
+        return {**cache_counts.snapshot(), "entries": len(sizes), "bytes": sum(sizes)}
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except FileNotFoundError:
+            return 0
+
+
+def _load_secret(path: Path) -> bytes:
+    """Liest das Geheimnis aus `path` oder legt es an (nur für den Besitzer lesbar)"""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{uuid.uuid4()}.tmp")
+    fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(os.urandom(SECRET_BYTES))
+    try:
+        # Atomar und ohne Überschreiben: legen zwei Worker gleichzeitig an, gewinnt einer
+        os.link(partial, path)
+    except FileExistsError:
+        pass
+    finally:
+        partial.unlink()
+    logger.info("Created conversion cache secret")
+    return path.read_bytes()
+
+
+# Geteilt von allen Worker-Prozessen des Hosts; der Cleanup der API löscht abgelaufene Einträge
+conversion_cache = ConversionCache(CONVERSION_CACHE_DIR, CONVERSION_CACHE_MAX_BYTES, JOB_RETENTION_MINUTES * 60,
+                                   secret=CONVERSION_CACHE_SECRET, secret_file=CONVERSION_CACHE_SECRET_FILE)
@@ -1,209 +1,161 @@
 """
 Datenbank-Service für Job-Management
-SQLite für MVP, später PostgreSQL
+
+Die Funktionen dieses Moduls leiten an den Job-Store weiter, den
+`DATABASE_URL` auswählt (SQLite, Redis, PostgreSQL; siehe
+api/services/job_store.py). Aufrufer bleiben unabhängig vom Backend.
+
+Die async-Routen der API rufen die `*_async`-Varianten auf: sie führen die
+synchronen Funktionen auf einem begrenzten Thread-Pool aus
+(`DATABASE_POOL_SIZE`), damit Datenbankzugriffe die Event-Loop nicht
+blockieren. Celery-Worker und Cleanup-Thread nutzen die synchronen Funktionen.
 """
-import sqlite3
-from datetime import datetime, timedelta
-from pathlib import Path
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 import logging
-import uuid
 
-from api.config import DATABASE_PATH, JOB_RETENTION_MINUTES
+from api.config import DATABASE_URL, DATABASE_POOL_SIZE
 from api.models.job import JobStatus, JobCreate, JobResponse
+from api.services.job_store import JobStore, create_store
 
 logger = logging.getLogger(__name__)
 
-DB_PATH = Path(DATABASE_PATH)
+# Job-Store des Prozesses, beim ersten Zugriff aus DATABASE_URL erstellt
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+# Thread-Pool für die async-Varianten, beim ersten Aufruf angelegt
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_store() -> JobStore:
+    """Job-Store des Prozesses (Backend nach DATABASE_URL)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store(DATABASE_URL)
+    return _store
+
+
+def set_store(store: Optional[JobStore]) -> Optional[JobStore]:
+    """
+    Ersetzt den Job-Store (Tests, Benchmarks); None erstellt ihn beim nächsten
+    Zugriff neu aus DATABASE_URL.
 
+    Args:
+        store: Neuer Job-Store oder None
 
-def get_connection():
-    """Erstellt eine Datenbankverbindung mit Fallback"""
-    global DB_PATH
+    Returns:
+        Bisheriger Job-Store (nicht geschlossen)
+    """
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    return previous
 
-    # Stelle sicher, dass Verzeichnis existiert
-    try:
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        logger.warning(f"Cannot create directory {DB_PATH.parent}: {e}")
 
-    # Versuche Verbindung
-    try:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        # Test write access
-        conn.execute("SELECT 1").fetchone()
-        return conn
-    except sqlite3.OperationalError as e:
-        logger.error(f"Cannot open database at {DB_PATH}: {e}")
+def close_connections():
+    """Schließt alle Verbindungen des Prozesses (Shutdown, Tests); Threads öffnen bei Bedarf neu"""
+    if _store is not None:
+        _store.close()
 
-        # Fallback auf /tmp (immer beschreibbar)
-        fallback_path = Path("/tmp/jobs.db")
-        logger.warning(f"Falling back to {fallback_path}")
-        DB_PATH = fallback_path
 
-        conn = sqlite3.connect(str(fallback_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+async def run_in_pool(function, *args, **kwargs):
+    """
+    Führt eine synchrone Datenbankfunktion auf dem Datenbank-Thread-Pool aus.
+
+    Args:
+        function: Funktion aus diesem Modul (oder eine, die sie aufruft)
+
+    Returns:
+        Rückgabewert der Funktion
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DATABASE_POOL_SIZE, thread_name_prefix="database")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(function, *args, **kwargs))
+
+
+def shutdown_pool():
+    """Beendet den Thread-Pool der async-Varianten und schließt alle Verbindungen"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+    close_connections()
 
 
 def init_db():
     """Initialisiert die Datenbank"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS jobs (
-            id TEXT PRIMARY KEY,
-            status TEXT NOT NULL,
-            bank TEXT,
-            output_format TEXT NOT NULL DEFAULT 'xlsx',
-            created_at TIMESTAMP NOT NULL,
-            completed_at TIMESTAMP,
-            expires_at TIMESTAMP,
-            error_message TEXT,
-            ip_hash TEXT
-        )
-    """)
-
-    # Index für schnellere Abfragen
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at)
-    """)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)
-    """)
-
-    conn.commit()
-    conn.close()
+    get_store().init()
     logger.info("✅ Database initialized")
 
 
 def create_job(job_data: JobCreate, ip_hash: Optional[str] = None) -> JobResponse:
     """Erstellt einen neuen Job"""
-    job_id = str(uuid.uuid4())
-    created_at = datetime.utcnow()
-    expires_at = created_at + timedelta(minutes=JOB_RETENTION_MINUTES)
-
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT INTO jobs (id, status, bank, output_format, created_at, expires_at, ip_hash)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        job_id,
-        JobStatus.PENDING.value,
-        job_data.bank,
-        job_data.output_format,
-        created_at,
-        expires_at,
-        ip_hash
-    ))
-
-    conn.commit()
-    conn.close()
-
-    logger.info(f"Created job {job_id}")
-
-    return JobResponse(
-        job_id=job_id,
-        status=JobStatus.PENDING,
-        bank=job_data.bank,
-        output_format=job_data.output_format,
-        created_at=created_at,
-        expires_at=expires_at
-    )
+    job = get_store().create_job(job_data, ip_hash=ip_hash)
+    logger.info(f"Created job {job.job_id}")
+    return job
 
 
 def get_job(job_id: str) -> Optional[JobResponse]:
     """Holt einen Job anhand der ID"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-    row = cursor.fetchone()
-    conn.close()
-
-    if not row:
-        return None
-
-    return JobResponse(
-        job_id=row["id"],
-        status=JobStatus(row["status"]),
-        bank=row["bank"],
-        output_format=row["output_format"],
-        created_at=datetime.fromisoformat(row["created_at"]),
-        completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-        expires_at=datetime.fromisoformat(row["expires_at"]) if row["expires_at"] else None,
-        error_message=row["error_message"],
-        download_url=f"/api/download/{row['id']}" if row["status"] == JobStatus.COMPLETED.value else None
-    )
-
-
-def update_job(job_id: str, status: JobStatus, error_message: Optional[str] = None, bank: Optional[str] = None):
-    """Updated einen Job-Status"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    completed_at = datetime.utcnow() if status in [JobStatus.COMPLETED, JobStatus.FAILED] else None
-
-    if bank:
-        cursor.execute("""
-            UPDATE jobs
-            SET status = ?, error_message = ?, completed_at = ?, bank = ?
-            WHERE id = ?
-        """, (status.value, error_message, completed_at, bank, job_id))
-    else:
-        cursor.execute("""
-            UPDATE jobs
-            SET status = ?, error_message = ?, completed_at = ?
-            WHERE id = ?
-        """, (status.value, error_message, completed_at, job_id))
-
-    conn.commit()
-    conn.close()
+    return get_store().get_job(job_id)
+
 
+def update_job(job_id: str, status: JobStatus, error_message: Optional[str] = None, bank: Optional[str] = None,
+               detection: Optional[str] = None, pages_total: Optional[int] = None,
+               pages_skipped: Optional[int] = None, pages_over_budget: Optional[int] = None,
+               warnings: Optional[List[str]] = None):
+    """Updated einen Job-Status"""
+    get_store().update_job(job_id, status, error_message=error_message, bank=bank, detection=detection,
+                           pages_total=pages_total, pages_skipped=pages_skipped,
+                           pages_over_budget=pages_over_budget, warnings=warnings)
     logger.info(f"Updated job {job_id} to status {status.value}")
 
 
 def get_expired_jobs() -> List[str]:
     """Holt alle abgelaufenen Jobs"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    now = datetime.utcnow()
-    cursor.execute("SELECT id FROM jobs WHERE expires_at < ?", (now,))
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [row["id"] for row in rows]
+    return get_store().get_expired_jobs()
 
 
 def delete_job(job_id: str):
     """Löscht einen Job aus der Datenbank"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
-    conn.commit()
-    conn.close()
-
+    get_store().delete_job(job_id)
     logger.info(f"Deleted job {job_id} from database")
 
 
 def count_recent_jobs_by_ip(ip_hash: str, hours: int = 1) -> int:
     """Zählt Jobs einer IP der letzten X Stunden (Rate-Limiting)"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    return get_store().count_recent_jobs_by_ip(ip_hash, hours=hours)
+
+
+# --- async-Varianten für die FastAPI-Routen ---
+
+async def create_job_async(job_data: JobCreate, ip_hash: Optional[str] = None) -> JobResponse:
+    return await run_in_pool(create_job, job_data, ip_hash=ip_hash)
+
+
+async def get_job_async(job_id: str) -> Optional[JobResponse]:
+    return await run_in_pool(get_job, job_id)
+
+
+async def update_job_async(job_id: str, status: JobStatus, **fields):
+    return await run_in_pool(update_job, job_id, status, **fields)
+
 
-    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-    cursor.execute("""
-        SELECT COUNT(*) as count
-        FROM jobs
-        WHERE ip_hash = ? AND created_at > ?
-    """, (ip_hash, cutoff_time))
+async def delete_job_async(job_id: str):
+    return await run_in_pool(delete_job, job_id)
 
-    result = cursor.fetchone()
-    conn.close()
 
-    return result["count"] if result else 0
+async def count_recent_jobs_by_ip_async(ip_hash: str, hours: int = 1) -> int:
+    return await run_in_pool(count_recent_jobs_by_ip, ip_hash, hours=hours)
@@ -0,0 +1,145 @@
+"""
+Status-Events für Jobs über Redis Pub/Sub
+
+Der Worker veröffentlicht nach jeder Statusänderung den kompletten Job
+(wie `/api/jobs/{id}`) auf dem Kanal `k2e:job-events:<id>`; der SSE-Endpoint
+`/api/jobs/{id}/events` reicht ihn an den Browser weiter. Damit fragt der
+Browser nicht mehr alle 2 Sekunden nach, und ein fertiger Job kommt sofort an.
+
+Pub/Sub speichert nichts: wer erst nach einem Event abonniert, verpasst es.
+Der Endpoint abonniert deshalb zuerst und liest danach den aktuellen Stand
+aus dem Job-Store. Fällt Redis aus, laufen Jobs normal weiter, der Browser
+fragt dann wieder per Polling nach.
+"""
+import logging
+from typing import Optional
+
+import redis
+import redis.asyncio
+
+from api.config import JOB_EVENTS_URL
+from api.models.job import JobResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "k2e"
+# Zustände, nach denen keine Events mehr kommen
+FINAL_STATUSES = ("completed", "failed")
+
+
+class JobEvents:
+    """
+    Veröffentlicht und abonniert Job-Events.
+
+    Args:
+        url: Redis-URL ("" = keine Events, der Browser pollt)
+        client: Synchroner Client für den Worker (sonst aus `url`)
+        async_client: Asynchroner Client für die API (sonst aus `url`)
+    """
+
+    def __init__(self, url: str, client: Optional[redis.Redis] = None,
+                 async_client: Optional[redis.asyncio.Redis] = None):
+        self.url = url
+        self._client = client
+        self._async_client = async_client
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url or self._client or self._async_client)
+
+    @staticmethod
+    def channel(job_id: str) -> str:
+        return f"{KEY_PREFIX}:job-events:{job_id}"
+
+    @property
+    def client(self) -> redis.Redis:
+        # Verbindungen erst beim ersten Zugriff, der Client hat einen eigenen Pool
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    @property
+    def async_client(self) -> redis.asyncio.Redis:
+        if self._async_client is None:
+            self._async_client = redis.asyncio.Redis.from_url(self.url, decode_responses=True)
+        return self._async_client
+
+    def publish(self, job: Optional[JobResponse]) -> int:
+        """
+        Veröffentlicht den aktuellen Stand eines Jobs. Fehler werden nur
+        geloggt: ein fehlendes Event darf den Job nicht scheitern lassen.
+
+        Args:
+            job: Job nach der Statusänderung (None wird ignoriert)
+
+        Returns:
+            Anzahl der Abonnenten, die das Event erhalten haben
+        """
+        if job is None or not self.enabled:
+            return 0
+        try:
+            return self.client.publish(self.channel(job.job_id), job.model_dump_json())
+        except redis.RedisError as e:
+            logger.warning(f"Could not publish job event: {type(e).__name__}")
+            return 0
+
+    async def subscribe(self, job_id: str) -> "JobSubscription":
+        """
+        Abonniert die Events eines Jobs. Das Abo steht, wenn die Methode
+        zurückkehrt; erst danach den aktuellen Stand lesen.
+
+        Raises:
+            redis.RedisError: Redis nicht erreichbar
+        """
+        pubsub = self.async_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel(job_id))
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return JobSubscription(pubsub)
+
+    async def close(self):
+        """Schließt die Verbindungen der API (beim Herunterfahren)"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+class JobSubscription:
+    """Abo auf die Events eines Jobs; mit `close()` oder `async with` beenden"""
+
+    def __init__(self, pubsub: redis.asyncio.client.PubSub):
+        self.pubsub = pubsub
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """
+        Wartet auf das nächste Event.
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden
+
+        Returns:
+            Job als JSON oder None, wenn in `timeout` nichts kam
+        """
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None or message["type"] != "message":
+            return None
+        return message["data"]
+
+    async def close(self):
+        try:
+            await self.pubsub.unsubscribe()
+        except redis.RedisError:
+            pass
+        finally:
+            await self.pubsub.aclose()
+
+    async def __aenter__(self) -> "JobSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+job_events = JobEvents(JOB_EVENTS_URL)
@@ -0,0 +1,199 @@
+"""
+Job-Store: gemeinsame Schnittstelle der Backends für Job-Metadaten
+
+Das Backend wählt `DATABASE_URL`:
+
+    sqlite:///pfad/jobs.db        SQLite-Datei (Standard, ein Host)
+    redis://host:6379/1           Redis-Hashes mit TTL (mehrere API-Replikas)
+    postgresql://user@host/db     PostgreSQL (mehrere API-Replikas)
+
+Redis und PostgreSQL werden erst bei Auswahl importiert.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Generic, List, Mapping, Optional, Protocol, TypeVar
+
+from api.config import JOB_RETENTION_MINUTES
+from api.models.job import JobStatus, JobCreate, JobResponse
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SCHEME = "sqlite"
+REDIS_SCHEMES = ("redis", "rediss")
+POSTGRES_SCHEMES = ("postgresql", "postgres")
+
+# Felder, die update_job zusammen mit der Bank setzt (Ergebnis eines Jobs)
+RESULT_FIELDS = ("detection", "pages_total", "pages_skipped", "pages_over_budget", "warnings")
+
+
+class JobStore(Protocol):
+    """Schnittstelle aller Job-Store-Backends (synchron, thread-sicher)"""
+
+    def init(self) -> None:
+        """Legt Tabellen/Indizes an bzw. migriert sie"""
+
+    def create_job(self, job_data: JobCreate, ip_hash: Optional[str] = None) -> JobResponse:
+        """Erstellt einen neuen Job"""
+
+    def get_job(self, job_id: str) -> Optional[JobResponse]:
+        """Holt einen Job anhand der ID"""
+
+    def update_job(self, job_id: str, status: JobStatus, error_message: Optional[str] = None,
+                   bank: Optional[str] = None, **result) -> None:
+        """Setzt den Status; mit `bank` auch das Ergebnis (RESULT_FIELDS)"""
+
+    def get_expired_jobs(self) -> List[str]:
+        """IDs aller abgelaufenen Jobs (deren Dateien der Cleanup löscht)"""
+
+    def delete_job(self, job_id: str) -> None:
+        """Löscht einen Job"""
+
+    def count_recent_jobs_by_ip(self, ip_hash: str, hours: int = 1) -> int:
+        """Zählt Jobs einer IP der letzten X Stunden (Rate-Limiting)"""
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen des Prozesses; danach wird bei Bedarf neu verbunden"""
+
+
+def create_store(url: str) -> JobStore:
+    """
+    Erstellt das Backend für eine DATABASE_URL.
+
+    Args:
+        url: z.B. "sqlite:////app/data/jobs.db", "redis://redis:6379/1"
+
+    Returns:
+        JobStore
+    """
+    scheme = url.split(":", 1)[0].split("+", 1)[0].lower()
+
+    if scheme == SQLITE_SCHEME:
+        from api.services.sqlite_store import SQLiteJobStore
+        return SQLiteJobStore(sqlite_path(url))
+    if scheme in REDIS_SCHEMES:
+        from api.services.redis_store import RedisJobStore
+        return RedisJobStore(url)
+    if scheme in POSTGRES_SCHEMES:
+        from api.services.postgres_store import PostgresJobStore
+        return PostgresJobStore(url)
+
+    raise ValueError(f"DATABASE_URL mit Schema '{scheme}' wird nicht unterstützt (sqlite, redis, postgresql)")
+
+
+def sqlite_path(url: str) -> str:
+    """Pfad aus einer SQLite-URL: sqlite:///relativ.db bzw. sqlite:////absolut.db"""
+    prefix = f"{SQLITE_SCHEME}:///"
+    if not url.startswith(prefix):
+        raise ValueError(f"Ungültige SQLite-URL: {url}")
+    return url[len(prefix):]
+
+
+def new_job(job_data: JobCreate) -> JobResponse:
+    """Neuer Job im Status PENDING mit ID und Ablaufzeit (JOB_RETENTION_MINUTES)"""
+    created_at = datetime.utcnow()
+    return JobResponse(
+        job_id=str(uuid.uuid4()),
+        status=JobStatus.PENDING,
+        bank=job_data.bank,
+        output_format=job_data.output_format,
+        created_at=created_at,
+        expires_at=created_at + timedelta(minutes=JOB_RETENTION_MINUTES)
+    )
+
+
+def completed_at(status: JobStatus) -> Optional[datetime]:
+    return datetime.utcnow() if status in [JobStatus.COMPLETED, JobStatus.FAILED] else None
+
+
+def _timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _integer(value) -> Optional[int]:
+    return None if value is None or value == "" else int(value)
+
+
+def job_response(row: Mapping[str, Any]) -> JobResponse:
+    """
+    Baut die JobResponse aus einer gespeicherten Zeile.
+
+    Args:
+        row: Spalten der Tabelle `jobs` (Zeitstempel als datetime oder ISO-String)
+
+    Returns:
+        JobResponse
+    """
+    status = JobStatus(row["status"])
+    return JobResponse(
+        job_id=row["id"],
+        status=status,
+        bank=row["bank"] or None,
+        output_format=row["output_format"],
+        created_at=_timestamp(row["created_at"]),
+        completed_at=_timestamp(row["completed_at"]),
+        expires_at=_timestamp(row["expires_at"]),
+        error_message=row["error_message"] or None,
+        detection=row["detection"] or None,
+        pages_total=_integer(row["pages_total"]),
+        pages_skipped=_integer(row["pages_skipped"]),
+        pages_over_budget=_integer(row["pages_over_budget"]),
+        warnings=json.loads(row["warnings"]) if row["warnings"] else [],
+        download_url=f"/api/download/{row['id']}" if status == JobStatus.COMPLETED else None
+    )
+
+
+def result_values(warnings: Optional[List[str]] = None, **result) -> dict:
+    """Ergebnis-Felder in Speicherform (warnings als JSON), fehlende als None"""
+    values = {field: result.get(field) for field in RESULT_FIELDS}
+    values["warnings"] = json.dumps(warnings) if warnings else None
+    return values
+
+
+C = TypeVar("C")
+
+
+class ThreadConnections(Generic[C]):
+    """
+    Eine Verbindung pro Thread (Pool pro Thread/Prozess).
+
+    `pid` erkennt geforkte Prozesse (Celery-Prefork), die die Verbindung des
+    Elternprozesses nicht weiterverwenden dürfen; nach `close_all` öffnet
+    jeder Thread beim nächsten Zugriff neu.
+    """
+
+    def __init__(self, connect: Callable[[], C]):
+        self._connect = connect
+        self._local = threading.local()
+        self._connections: List[C] = []
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self) -> C:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and local.pid == os.getpid() and local.generation == self._generation:
+            return conn
+
+        conn = self._connect()
+        local.conn, local.pid, local.generation = conn, os.getpid(), self._generation
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            self._generation += 1
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"Closing connection failed: {e}")
+            self._connections.clear()
@@ -0,0 +1,40 @@
+"""
+PostgreSQL-Backend für den Job-Store (DATABASE_URL=postgresql://...)
+
+Mehrere API-Replikas und Worker teilen sich eine Datenbank. Wie bei SQLite
+hält jeder Thread eine eigene Verbindung; psycopg bereitet häufig
+ausgeführte Statements selbst serverseitig vor.
+"""
+import logging
+from contextlib import contextmanager
+
+import psycopg
+from psycopg.rows import dict_row
+
+from api.services.sqlite_store import SQLJobStore
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresJobStore(SQLJobStore):
+    """Tabelle `jobs` in PostgreSQL (psycopg 3)"""
+
+    PARAM = "%s"
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def _connect(self) -> psycopg.Connection:
+        # autocommit: Lesezugriffe halten keine Transaktion offen,
+        # Schreibzugriffe laufen in _transaction
+        return psycopg.connect(self.url, autocommit=True, row_factory=dict_row)
+
+    @contextmanager
+    def _transaction(self, conn: psycopg.Connection):
+        with conn.transaction():
+            yield conn
+
+    def _migrate(self, conn: psycopg.Connection):
+        for column, column_type in self.ADDED_COLUMNS:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS {column} {column_type}")
@@ -0,0 +1,121 @@
+"""
+Redis-Backend für den Job-Store (DATABASE_URL=redis://...)
+
+Jeder Job ist ein Hash `k2e:job:<id>`, der per Key-TTL zur Ablaufzeit
+(JOB_RETENTION_MINUTES) von Redis selbst gelöscht wird. Für den Cleanup der
+Dateien merkt sich ein Sorted Set die Ablaufzeiten, für das Rate-Limiting
+ein Sorted Set pro IP-Hash die Erstellungszeiten.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import redis
+
+from api.models.job import JobStatus, JobCreate, JobResponse
+from api.services.job_store import completed_at, job_response, new_job, result_values
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "k2e"
+# Rate-Limiting zählt höchstens so weit zurück
+IP_WINDOW_HOURS = 24
+
+
+def _score(moment: datetime) -> float:
+    return (moment - datetime(1970, 1, 1)).total_seconds()
+
+
+def _value(value) -> str:
+    # Redis-Hashes kennen kein NULL: None wird als "" gespeichert
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class RedisJobStore:
+    """Jobs als Redis-Hashes mit nativer TTL"""
+
+    def __init__(self, url: str, client: Optional[redis.Redis] = None):
+        self.url = url
+        # Der Client hat einen eigenen, thread-sicheren Verbindungspool
+        self.client = client or redis.Redis.from_url(url, decode_responses=True)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{KEY_PREFIX}:job:{job_id}"
+
+    @property
+    def _expiry_key(self) -> str:
+        return f"{KEY_PREFIX}:jobs:expires"
+
+    def _ip_key(self, ip_hash: str) -> str:
+        return f"{KEY_PREFIX}:jobs:ip:{ip_hash}"
+
+    def init(self):
+        self.client.ping()
+
+    def close(self):
+        self.client.connection_pool.disconnect()
+
+    def create_job(self, job_data: JobCreate, ip_hash: Optional[str] = None) -> JobResponse:
+        job = new_job(job_data)
+        key = self._job_key(job.job_id)
+        row = {
+            "id": job.job_id,
+            "status": job.status.value,
+            "bank": job.bank,
+            "output_format": job.output_format,
+            "created_at": job.created_at,
+            "completed_at": None,
+            "expires_at": job.expires_at,
+            "error_message": None,
+            "ip_hash": ip_hash,
+            **result_values(),
+        }
+
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={field: _value(value) for field, value in row.items()})
+        pipe.expireat(key, int(_score(job.expires_at)) + 1)
+        pipe.zadd(self._expiry_key, {job.job_id: _score(job.expires_at)})
+        if ip_hash:
+            ip_key = self._ip_key(ip_hash)
+            pipe.zadd(ip_key, {job.job_id: _score(job.created_at)})
+            pipe.zremrangebyscore(ip_key, "-inf", _score(job.created_at - timedelta(hours=IP_WINDOW_HOURS)))
+            pipe.expire(ip_key, timedelta(hours=IP_WINDOW_HOURS))
+        pipe.execute()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[JobResponse]:
+        row = self.client.hgetall(self._job_key(job_id))
+        return job_response(row) if row else None
+
+    def update_job(self, job_id: str, status: JobStatus, error_message: Optional[str] = None,
+                   bank: Optional[str] = None, **result):
+        values = {"status": status.value, "error_message": error_message, "completed_at": completed_at(status)}
+        if bank:
+            values.update(bank=bank, **result_values(**result))
+        key = self._job_key(job_id)
+
+        def update(pipe):
+            # Abgelaufene oder gelöschte Jobs nicht ohne TTL neu anlegen
+            if not pipe.exists(key):
+                return
+            pipe.multi()
+            pipe.hset(key, mapping={field: _value(value) for field, value in values.items()})
+
+        self.client.transaction(update, key)
+
+    def get_expired_jobs(self) -> List[str]:
+        return self.client.zrangebyscore(self._expiry_key, "-inf", _score(datetime.utcnow()))
+
+    def delete_job(self, job_id: str):
+        pipe = self.client.pipeline()
+        pipe.delete(self._job_key(job_id))
+        pipe.zrem(self._expiry_key, job_id)
+        pipe.execute()
+
+    def count_recent_jobs_by_ip(self, ip_hash: str, hours: int = 1) -> int:
+        cutoff_time = datetime.utcnow() - timedelta(hours=min(hours, IP_WINDOW_HOURS))
+        return self.client.zcount(self._ip_key(ip_hash), f"({_score(cutoff_time)}", "+inf")
@@ -0,0 +1,227 @@
+"""
+SQL-Job-Store und SQLite-Backend
+
+Jeder Prozess (API, Celery-Worker) und jeder Thread darin hält eine eigene,
+einmal geöffnete und konfigurierte Verbindung (Pool pro Thread/Prozess).
+SQLite läuft im WAL-Modus: Status-Abfragen der API lesen parallel zu den
+Updates des Workers, statt auf dessen Schreibsperre zu warten. SQL steht in
+Konstanten, damit der Statement-Cache pro Verbindung greift.
+"""
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from api.config import DATABASE_BUSY_TIMEOUT_MS, DATABASE_SYNCHRONOUS, DATABASE_CACHED_STATEMENTS
+from api.models.job import JobStatus, JobCreate, JobResponse
+from api.services.job_store import ThreadConnections, completed_at, job_response, new_job, result_values
+
+logger = logging.getLogger(__name__)
+
+
+class SQLJobStore:
+    """
+    Tabelle `jobs` über DB-API-Verbindungen (SQLite, PostgreSQL).
+
+    Unterklassen öffnen die Verbindung (`_connect`), kapseln Schreibzugriffe
+    in eine Transaktion (`_transaction`), ergänzen fehlende Spalten
+    (`_migrate`) und setzen `PARAM` auf ihren Platzhalter.
+    """
+
+    PARAM = "?"
+
+    CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            bank TEXT,
+            output_format TEXT NOT NULL DEFAULT 'xlsx',
+            created_at TIMESTAMP NOT NULL,
+            completed_at TIMESTAMP,
+            expires_at TIMESTAMP,
+            error_message TEXT,
+            ip_hash TEXT,
+            detection TEXT,
+            pages_total INTEGER,
+            pages_skipped INTEGER,
+            pages_over_budget INTEGER,
+            warnings TEXT
+        )
+    """
+    # Spalten, die nach der ersten Version dazugekommen sind (Migration)
+    ADDED_COLUMNS = (("detection", "TEXT"), ("pages_total", "INTEGER"), ("pages_skipped", "INTEGER"),
+                     ("pages_over_budget", "INTEGER"), ("warnings", "TEXT"))
+    # Index für schnellere Abfragen (Cleanup über expires_at, Rate-Limiting über ip_hash)
+    CREATE_INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs(expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_ip_hash ON jobs(ip_hash, created_at)",
+    )
+
+    INSERT_JOB = """
+        INSERT INTO jobs (id, status, bank, output_format, created_at, expires_at, ip_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    SELECT_JOB = "SELECT * FROM jobs WHERE id = ?"
+    UPDATE_JOB_RESULT = """
+        UPDATE jobs
+        SET status = ?, error_message = ?, completed_at = ?, bank = ?, detection = ?,
+            pages_total = ?, pages_skipped = ?, pages_over_budget = ?, warnings = ?
+        WHERE id = ?
+    """
+    UPDATE_JOB_STATUS = """
+        UPDATE jobs
+        SET status = ?, error_message = ?, completed_at = ?
+        WHERE id = ?
+    """
+    SELECT_EXPIRED_JOBS = "SELECT id FROM jobs WHERE expires_at < ?"
+    DELETE_JOB = "DELETE FROM jobs WHERE id = ?"
+    COUNT_JOBS_BY_IP = """
+        SELECT COUNT(*) as count
+        FROM jobs
+        WHERE ip_hash = ? AND created_at > ?
+    """
+
+    def __init__(self):
+        self._connections = ThreadConnections(self._connect)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.PARAM != "?":
+            for name in ("INSERT_JOB", "SELECT_JOB", "UPDATE_JOB_RESULT", "UPDATE_JOB_STATUS",
+                         "SELECT_EXPIRED_JOBS", "DELETE_JOB", "COUNT_JOBS_BY_IP"):
+                setattr(cls, name, getattr(SQLJobStore, name).replace("?", cls.PARAM))
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _transaction(self, conn):
+        raise NotImplementedError
+
+    def _migrate(self, conn):
+        raise NotImplementedError
+
+    def connection(self):
+        """Verbindung des aktuellen Threads, beim ersten Aufruf geöffnet und konfiguriert"""
+        return self._connections.get()
+
+    def close(self):
+        self._connections.close_all()
+
+    def init(self):
+        with self._transaction(self.connection()) as conn:
+            conn.execute(self.CREATE_TABLE)
+            self._migrate(conn)
+            for statement in self.CREATE_INDEXES:
+                conn.execute(statement)
+
+    def create_job(self, job_data: JobCreate, ip_hash: Optional[str] = None) -> JobResponse:
+        job = new_job(job_data)
+        with self._transaction(self.connection()) as conn:
+            conn.execute(self.INSERT_JOB, (
+                job.job_id,
+                job.status.value,
+                job.bank,
+                job.output_format,
+                job.created_at,
+                job.expires_at,
+                ip_hash
+            ))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[JobResponse]:
+        row = self.connection().execute(self.SELECT_JOB, (job_id,)).fetchone()
+        return job_response(row) if row else None
+
+    def update_job(self, job_id: str, status: JobStatus, error_message: Optional[str] = None,
+                   bank: Optional[str] = None, **result):
+        with self._transaction(self.connection()) as conn:
+            if bank:
+                values = result_values(**result)
+                conn.execute(self.UPDATE_JOB_RESULT, (
+                    status.value, error_message, completed_at(status), bank, values["detection"],
+                    values["pages_total"], values["pages_skipped"], values["pages_over_budget"],
+                    values["warnings"], job_id
+                ))
+            else:
+                conn.execute(self.UPDATE_JOB_STATUS, (status.value, error_message, completed_at(status), job_id))
+
+    def get_expired_jobs(self) -> List[str]:
+        rows = self.connection().execute(self.SELECT_EXPIRED_JOBS, (datetime.utcnow(),)).fetchall()
+        return [row["id"] for row in rows]
+
+    def delete_job(self, job_id: str):
+        with self._transaction(self.connection()) as conn:
+            conn.execute(self.DELETE_JOB, (job_id,))
+
+    def count_recent_jobs_by_ip(self, ip_hash: str, hours: int = 1) -> int:
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        result = self.connection().execute(self.COUNT_JOBS_BY_IP, (ip_hash, cutoff_time)).fetchone()
+        return result["count"] if result else 0
+
+
+class SQLiteJobStore(SQLJobStore):
+    """SQLite-Datei im WAL-Modus, mit Fallback auf /tmp, falls der Pfad nicht beschreibbar ist"""
+
+    FALLBACK_PATH = Path("/tmp/jobs.db")
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Stelle sicher, dass Verzeichnis existiert
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.warning(f"Cannot create directory {self.path.parent}: {e}")
+
+        # Versuche Verbindung
+        try:
+            return self._configure(self._open(self.path))
+        except sqlite3.OperationalError as e:
+            logger.error(f"Cannot open database at {self.path}: {e}")
+
+            # Fallback auf /tmp (immer beschreibbar)
+            logger.warning(f"Falling back to {self.FALLBACK_PATH}")
+            self.path = self.FALLBACK_PATH
+
+            return self._configure(self._open(self.FALLBACK_PATH))
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        # Verbindungen werden nur von ihrem Thread benutzt, close()
+        # darf sie aber aus einem anderen Thread schließen
+        conn = sqlite3.connect(
+            str(path),
+            timeout=DATABASE_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=DATABASE_CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+        """WAL (bleibt in der Datei gespeichert), synchronous und busy_timeout pro Verbindung"""
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if journal_mode.lower() != "wal":
+            logger.warning(f"Database does not support WAL, using journal mode {journal_mode}")
+        conn.execute(f"PRAGMA synchronous={DATABASE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={int(DATABASE_BUSY_TIMEOUT_MS)}")
+        return conn
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        with conn:
+            yield conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        # Migration für bestehende Datenbanken ohne detection-/Seiten-/Warnungs-Spalten
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in self.ADDED_COLUMNS:
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
@@ -3,26 +3,43 @@ Celery-Tasks für PDF-Verarbeitung
 """
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from api.services.celery_app import celery_app
+from api.services.conversion_cache import conversion_cache
 from api.services.database import update_job, get_job
-from api.models.job import JobStatus
-from api.config import UPLOAD_DIR
-from core.dispatcher import get_parser
-from core.exporter import export_to_excel
+from api.services.job_events import job_events
+from api.models.job import JobResponse, JobStatus
+from api.config import (
+    UPLOAD_DIR, PARSE_WORKERS, PARSE_PARALLEL_MIN_PAGES, FONT_CACHE_SIZE,
+    PAGE_MAX_CHARS, PAGE_MAX_OBJECTS, PAGE_MAX_SECONDS, CONVERSION_CACHE_MAX_ROWS
+)
+from core.dispatcher import get_parser, detect_bank
+from core.exporter import export
+from core.font_cache import FontCache
+from core.page_budget import PageBudget, guard_counts
+from core.parallel import iter_document
+from core.pdf_extractor import ExtractedDocument
 
 logger = logging.getLogger(__name__)
 
+# Lebt so lange wie der Worker-Prozess: Auszüge derselben Bank bringen
+# dieselben Fonts mit, die dann nicht pro Job neu aufgebaut werden
+font_cache = FontCache(FONT_CACHE_SIZE)
+
+# Arbeitsbudget pro Seite: eine einzelne kaputte Seite blockiert den Worker nicht
+page_budget = PageBudget(PAGE_MAX_CHARS, PAGE_MAX_OBJECTS, PAGE_MAX_SECONDS)
+
 
 @celery_app.task(bind=True, name="api.services.tasks.process_pdf")
-def process_pdf_task(self, job_id: str, bank: str = "auto") -> Dict[str, Any]:
+def process_pdf_task(self, job_id: str, bank: str = "auto", content_hash: Optional[str] = None) -> Dict[str, Any]:
     """
     Celery-Task zum Verarbeiten eines PDFs.
 
     Args:
         job_id: UUID des Jobs
         bank: Bank-Name (oder "auto" für Auto-Detection)
+        content_hash: SHA-256 des PDFs (vom Upload) für den Ergebnis-Cache
 
     Returns:
         Dict mit Ergebnis-Informationen
@@ -31,58 +48,75 @@ def process_pdf_task(self, job_id: str, bank: str = "auto") -> Dict[str, Any]:
 
     try:
         # Update Status auf PROCESSING
-        update_job(job_id, JobStatus.PROCESSING)
+        job = _set_status(job_id, JobStatus.PROCESSING)
 
         # Dateipfade
+        output_format = job.output_format if job else "xlsx"
         job_dir = UPLOAD_DIR / job_id
         input_pdf = job_dir / "input.pdf"
-        output_excel = job_dir / "output.xlsx"
+        output_file = job_dir / f"output.{output_format}"
 
         if not input_pdf.exists():
             raise FileNotFoundError(f"Input PDF not found: {input_pdf}")
 
-        # Bank-Detection falls "auto"
-        detected_bank = bank
-        if bank == "auto":
-            detected_bank = detect_bank(input_pdf)
-            logger.info(f"Auto-detected bank: {detected_bank}")
-
-        # Parser holen
-        try:
-            parser = get_parser(detected_bank)
-        except ValueError as e:
-            raise ValueError(f"Unsupported bank: {detected_bank}")
-
-        # PDF parsen
-        logger.info(f"Parsing PDF with {detected_bank} parser...")
-        transactions = parser.parse(str(input_pdf))
-
-        if not transactions:
+        # Derselbe Auszug schon konvertiert: Ergebnis ohne PDF-Zugriff übernehmen
+        cached = conversion_cache.get(content_hash, bank) if content_hash else None
+        if cached:
+            logger.info(f"Conversion cache hit ({cached['bank']}), exporting to {output_format}...")
+            result = cached
+            transactions_count = export(cached["transactions"], output_file, output_format,
+                                        schema=get_parser(cached["bank"]).COLUMNS)
+        else:
+            result, transactions_count = _convert(input_pdf, bank, output_file, output_format,
+                                                  collect=bool(content_hash) and conversion_cache.enabled)
+
+        detected_bank = result["bank"]
+        detection_signal = result["detection"]
+        pages_total = result["pages_total"]
+        pages_skipped = result["pages_skipped"]
+        warnings = result["warnings"]
+
+        if not transactions_count:
+            if warnings:
+                raise ValueError(f"Keine Transaktionen gefunden im PDF ({'; '.join(warnings)})")
             raise ValueError("Keine Transaktionen gefunden im PDF")
 
-        # Excel exportieren
-        logger.info(f"Exporting {len(transactions)} transactions to Excel...")
-        export_to_excel(transactions, str(output_excel))
+        if not cached and result.get("transactions"):
+            conversion_cache.put(content_hash, bank, result)
+
+        logger.info(f"Exported {transactions_count} transactions ({pages_skipped}/{pages_total} pages skipped)")
+        if warnings and not cached:
+            logger.warning(f"{len(warnings)} pages over budget, page guards triggered so far: {guard_counts.snapshot()}")
 
         # Input-PDF löschen (Datenschutz)
         input_pdf.unlink()
         logger.info("Input PDF deleted for privacy")
 
         # Job als COMPLETED markieren
-        update_job(job_id, JobStatus.COMPLETED, bank=detected_bank)
+        _set_status(job_id, JobStatus.COMPLETED, bank=detected_bank, detection=detection_signal,
+                    pages_total=pages_total, pages_skipped=pages_skipped,
+                    pages_over_budget=len(warnings), warnings=warnings)
 
         logger.info(f"✅ Job {job_id} completed successfully")
 
         return {
             "job_id": job_id,
             "status": "completed",
-            "transactions_count": len(transactions),
-            "bank": detected_bank
+            "transactions_count": transactions_count,
+            "bank": detected_bank,
+            "detection": detection_signal,
+            "pages_total": pages_total,
+            "pages_skipped": pages_skipped,
+            "pages_over_budget": len(warnings),
+            "warnings": warnings,
+            "cached": bool(cached),
+            "page_guards": guard_counts.snapshot(),
+            "conversion_cache": conversion_cache.stats()
         }
 
     except Exception as e:
         logger.error(f"Error processing job {job_id}: {e}")
-        update_job(job_id, JobStatus.FAILED, error_message=str(e))
+        _set_status(job_id, JobStatus.FAILED, error_message=str(e))
 
         return {
             "job_id": job_id,
@@ -91,40 +125,91 @@ def process_pdf_task(self, job_id: str, bank: str = "auto") -> Dict[str, Any]:
         }
 
 
-def detect_bank(pdf_path: Path) -> str:
+def _set_status(job_id: str, status: JobStatus, **fields) -> Optional[JobResponse]:
     """
-    Erkennt automatisch die Bank anhand des PDFs.
-    Einfache Heuristik: Testet alle Parser und nimmt den mit den meisten Transaktionen.
+    Speichert den neuen Status und meldet ihn per Job-Event an wartende Browser.
 
     Args:
-        pdf_path: Pfad zum PDF
+        job_id: UUID des Jobs
+        status: Neuer Status
+        **fields: Weitere Felder für `update_job`
 
     Returns:
-        Bank-Name (z.B. "sparkasse", "ing")
+        Job nach dem Update (None, wenn er nicht mehr existiert)
     """
-    from parsers.sparkasse_parser import SparkasseParser
-    from parsers.ing_parser import INGParser
-    from parsers.db_parser import DBParser
+    update_job(job_id, status, **fields)
+    job = get_job(job_id)
+    job_events.publish(job)
+    return job
 
-    parsers = {
-        "sparkasse": SparkasseParser(),
-        "ing": INGParser(),
-        "deutsche_bank": DBParser()
-    }
 
-    best_bank = None
-    max_transactions = 0
+def _convert(input_pdf: Path, bank: str, output_file: Path, output_format: str,
+             collect: bool = False) -> Tuple[Dict[str, Any], int]:
+    """
+    Erkennt die Bank, parst das PDF und exportiert die Transaktionen als Stream.
 
-    for bank_name, parser in parsers.items():
-        try:
-            transactions = parser.parse(str(pdf_path))
-            if len(transactions) > max_transactions:
-                max_transactions = len(transactions)
-                best_bank = bank_name
-        except Exception as e:
-            logger.debug(f"Parser {bank_name} failed: {e}")
+    Args:
+        input_pdf: Hochgeladenes PDF
+        bank: Bank-Name (oder "auto")
+        output_file: Zieldatei
+        output_format: Ausgabeformat
+        collect: Transaktionen für den Cache mitsammeln (bis CONVERSION_CACHE_MAX_ROWS)
+
+    Returns:
+        (Ergebnis wie im Cache: bank, detection, pages_total, pages_skipped,
+        warnings, transactions; Anzahl exportierter Transaktionen)
+    """
+    # PDF einmal öffnen, Detection und Parser teilen sich die Seiten
+    with ExtractedDocument(input_pdf, font_cache=font_cache, budget=page_budget) as document:
+        # Bank-Detection falls "auto"
+        detected_bank = bank
+        detection_signal = None
+        if bank == "auto":
+            detection = detect_bank(document)
+            detected_bank = detection.bank
+            detection_signal = detection.signal
+            logger.info(f"Auto-detected bank: {detected_bank} (signal: {detection_signal})")
 
-    if not best_bank:
-        raise ValueError("Konnte Bank nicht automatisch erkennen")
+        # Parser holen
+        try:
+            parser = get_parser(detected_bank)
+        except ValueError as e:
+            raise ValueError(f"Unsupported bank: {detected_bank}")
 
-    return best_bank
+        # PDF parsen und direkt als Stream exportieren
+        logger.info(f"Parsing PDF with {detected_bank} parser and exporting to {output_format}...")
+        transactions = iter_document(
+            parser, document,
+            workers=PARSE_WORKERS,
+            min_pages=PARSE_PARALLEL_MIN_PAGES
+        )
+        collected: Optional[List[Dict[str, Any]]] = [] if collect else None
+        if collected is not None:
+            transactions = _collect(transactions, collected, CONVERSION_CACHE_MAX_ROWS)
+        transactions_count = export(transactions, output_file, output_format, schema=parser.COLUMNS)
+
+        # Seiten ohne Buchungen (Hinweise, AGB, ...), die die Triage übersprungen hat
+        pages_total = len(document.pages)
+        pages_skipped = len(document.skipped_pages.get(parser.bank_name, ()))
+        # Seiten über dem Arbeitsbudget, übersprungen statt den Job abzubrechen
+        over_budget = sorted(document.over_budget.get(parser.bank_name, {}).values())
+
+    return {
+        "bank": detected_bank,
+        "detection": detection_signal,
+        "pages_total": pages_total,
+        "pages_skipped": pages_skipped,
+        "warnings": [warning.message for warning in over_budget],
+        "transactions": collected or None,
+    }, transactions_count
+
+
+def _collect(transactions: Iterable[Dict[str, Any]], into: List[Dict[str, Any]], limit: int):
+    """Reicht Transaktionen durch und sammelt sie in `into`; über `limit` wird nicht mehr gesammelt"""
+    for transaction in transactions:
+        if into is not None:
+            into.append(transaction)
+            if len(into) > limit:
+                into.clear()
+                into = None
+        yield transaction
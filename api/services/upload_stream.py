@@ -0,0 +1,257 @@
+"""
+Streaming-Upload für PDF-Kontoauszüge
+
+Liest den Multipart-Body der Anfrage Stück für Stück und schreibt den
+Datei-Teil direkt auf die Platte, statt ihn vorher komplett zu puffern:
+- das Größenlimit greift, sobald es überschritten ist (Content-Length
+  vorab, danach pro Chunk), der Rest des Bodys wird nicht mehr gelesen
+- die ersten Bytes müssen den PDF-Header enthalten; ein linearisiertes PDF
+  nennt seine Seitenzahl schon im ersten Chunk
+- SHA-256 des Inhalts entsteht nebenbei
+Der Speicher pro Upload ist durch die Chunk-Größe des Servers begrenzt.
+Dateizugriffe laufen im Thread-Pool, nicht auf der Event-Loop.
+"""
+import hashlib
+import logging
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from api.config import ALLOWED_EXTENSIONS
+from core.pdf_extractor import count_pages
+
+logger = logging.getLogger(__name__)
+
+# Der PDF-Header darf laut Spezifikation in den ersten 1024 Bytes stehen
+HEADER_BYTES = 1024
+PDF_MAGIC = b"%PDF-"
+# Linearisierungs-Dictionary am Dateianfang: << /Linearized 1 ... /N <Seiten> ... >>
+LINEARIZED_PAGES = re.compile(rb"/Linearized\b[^>]*?/N\s+(\d+)", re.S)
+# Formularfelder neben der Datei (bank, output_format) sind kurz
+MAX_FIELD_BYTES = 1024
+# Spielraum für Multipart-Grenzen und Felder beim Vorab-Check der Content-Length
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+class UploadRejected(Exception):
+    """Upload abgelehnt; `status_code` und `detail` gehen unverändert an den Client"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class StoredUpload(NamedTuple):
+    """Geprüfte, vollständig geschriebene PDF-Datei"""
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+    page_count: int
+    fields: Dict[str, str]
+
+
+class _PDFWriter:
+    """Schreibt den Datei-Teil: Größenlimit, PDF-Header und SHA-256 pro Chunk"""
+
+    def __init__(self, path: Path, max_size: int, max_pages: int):
+        self.path = path
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.size = 0
+        self.hash = hashlib.sha256()
+        self.head = b""
+        self.file = None
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise UploadRejected(413, f"Datei zu groß. Max. {self.max_size / 1024 / 1024} MB erlaubt.")
+
+        if len(self.head) < HEADER_BYTES:
+            self.head += data[:HEADER_BYTES - len(self.head)]
+            if len(self.head) >= HEADER_BYTES:
+                self.check_head()
+
+        self.hash.update(data)
+        if self.file is None:
+            self.file = await run_in_threadpool(open, self.path, "wb")
+        await run_in_threadpool(self.file.write, data)
+
+    def check_head(self):
+        if PDF_MAGIC not in self.head:
+            raise UploadRejected(400, "Die Datei ist keine PDF-Datei")
+        match = LINEARIZED_PAGES.search(self.head)
+        if match and int(match.group(1)) > self.max_pages:
+            raise UploadRejected(413, f"Zu viele Seiten. Max. {self.max_pages} Seiten erlaubt.")
+
+    async def close(self):
+        if self.file is not None:
+            await run_in_threadpool(self.file.close)
+            self.file = None
+
+
+class _Part:
+    def __init__(self):
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.name = ""
+        self.filename: Optional[str] = None
+        self.data = b""
+
+
+async def receive_pdf_upload(request: Request, incoming_dir: Path, max_size: int, max_pages: int,
+                             file_field: str = "file") -> StoredUpload:
+    """
+    Nimmt einen Multipart-Upload mit genau einer PDF-Datei entgegen.
+
+    Args:
+        request: Anfrage mit multipart/form-data-Body
+        incoming_dir: Verzeichnis für die Datei (wird angelegt)
+        max_size: Maximale Dateigröße in Bytes
+        max_pages: Maximale Seitenzahl
+        file_field: Name des Datei-Felds
+
+    Returns:
+        StoredUpload; der Aufrufer verschiebt oder löscht die Datei
+
+    Raises:
+        UploadRejected: Datei zu groß, keine/ungültige PDF, fehlerhafter Body
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadRejected(400, "Erwarte multipart/form-data")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD:
+        raise UploadRejected(413, f"Datei zu groß. Max. {max_size / 1024 / 1024} MB erlaubt.")
+
+    await run_in_threadpool(incoming_dir.mkdir, parents=True, exist_ok=True)
+    writer = _PDFWriter(incoming_dir / f"{uuid.uuid4()}.pdf", max_size, max_pages)
+
+    # Die Callbacks des Parsers sind synchron: sie sammeln Ereignisse, die
+    # nach jedem Chunk asynchron abgearbeitet werden
+    events: List[Tuple[str, object]] = []
+    part = _Part()
+    header_name, header_value = b"", b""
+
+    def on_part_begin():
+        events.append(("begin", None))
+
+    def on_header_field(data, start, end):
+        nonlocal header_name
+        header_name += data[start:end]
+
+    def on_header_value(data, start, end):
+        nonlocal header_value
+        header_value += data[start:end]
+
+    def on_header_end():
+        nonlocal header_name, header_value
+        events.append(("header", (header_name.lower(), header_value)))
+        header_name, header_value = b"", b""
+
+    def on_headers_finished():
+        events.append(("headers_finished", None))
+
+    def on_part_data(data, start, end):
+        events.append(("data", data[start:end]))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(options[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    fields: Dict[str, str] = {}
+    filename: Optional[str] = None
+    file_done = False
+
+    try:
+        async for chunk in request.stream():
+            try:
+                parser.write(chunk)
+            except Exception as e:
+                raise UploadRejected(400, f"Fehlerhafter Upload: {e}") from e
+
+            for kind, payload in events:
+                if kind == "begin":
+                    part = _Part()
+                elif kind == "header":
+                    part.headers.append(payload)
+                elif kind == "headers_finished":
+                    part.name, part.filename = _disposition(part.headers)
+                    if part.filename is not None:
+                        if part.name != file_field or filename is not None:
+                            raise UploadRejected(400, "Genau eine PDF-Datei erwartet")
+                        if Path(part.filename).suffix.lower() not in ALLOWED_EXTENSIONS:
+                            raise UploadRejected(400, "Nur PDF-Dateien sind erlaubt")
+                        filename = part.filename
+                elif kind == "data":
+                    if part.filename is not None:
+                        await writer.write(payload)
+                    else:
+                        part.data += payload
+                        if len(part.data) > MAX_FIELD_BYTES:
+                            raise UploadRejected(400, f"Feld '{part.name}' ist zu lang")
+                elif kind == "end":
+                    if part.filename is not None:
+                        file_done = True
+                    else:
+                        fields[part.name] = part.data.decode("utf-8", errors="replace")
+            events.clear()
+
+        if not file_done:
+            raise UploadRejected(400, "Keine PDF-Datei im Upload")
+        if len(writer.head) < HEADER_BYTES:
+            writer.check_head()
+        await writer.close()
+
+        try:
+            page_count = await run_in_threadpool(count_pages, writer.path)
+        except ValueError:
+            raise UploadRejected(400, "Die PDF-Datei ist beschädigt oder verschlüsselt")
+        if page_count < 1:
+            raise UploadRejected(400, "Die PDF-Datei enthält keine Seiten")
+        if page_count > max_pages:
+            raise UploadRejected(413, f"Zu viele Seiten. Max. {max_pages} Seiten erlaubt.")
+
+    except BaseException:
+        # Abgelehnt, Client weg oder abgebrochen: keine halbe Datei zurücklassen
+        await writer.close()
+        await run_in_threadpool(_remove, writer.path)
+        raise
+
+    return StoredUpload(writer.path, filename, writer.size, writer.hash.hexdigest(), page_count, fields)
+
+
+def _disposition(headers: List[Tuple[bytes, bytes]]) -> Tuple[str, Optional[str]]:
+    """Feldname und (bei Dateien) Dateiname aus Content-Disposition"""
+    for name, value in headers:
+        if name == b"content-disposition":
+            _, options = parse_options_header(value)
+            if b"name" not in options:
+                break
+            filename = options.get(b"filename")
+            return (options[b"name"].decode("utf-8", errors="replace"),
+                    filename.decode("utf-8", errors="replace") if filename is not None else None)
+    raise UploadRejected(400, "Content-Disposition mit Feldname fehlt")
+
+
+def _remove(path: Path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
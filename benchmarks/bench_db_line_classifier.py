@@ -0,0 +1,206 @@
+"""
+Micro-Benchmark: Zeilenklassifikation im Deutsche Bank Parser
+
+Vergleicht das bisherige Seiten-Parsing (unkompilierte Regex, lineare
+Keyword-Suche, Doppelklassifikation in parse_full_transaction, ein
+str.replace pro Ersetzung) mit der vorkompilierten Engine auf einem großen
+synthetischen Zeilenstrom. Beide Pfade liefern identische Transaktionen.
+
+    python benchmarks/bench_db_line_classifier.py --lines 200000
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parsers.db_parser import DBParseContext, extract_transaction_blocks, parse_transaction_blocks  # noqa: E402
+
+# --- Referenz: bisherige Implementierung ---
+
+def legacy_is_transaction_start(line):
+    if not line:
+        return False
+    if not re.match(r'^\d{2}\.\d{2}\.', line):
+        return False
+    if not re.search(r'[+-]\s*\d{1,3}(?:\.\d{3})*,\d{2}$', line):
+        return False
+    return True
+
+
+def legacy_is_page_footer(line):
+    footer_keywords = [
+        'auszug', 'seite', 'iban de76', 'neuer saldo', 'alter saldo', 'wichtige hinweise',
+        'bitte erheben', 'filialnummer', 'kontonummer', 'bic (swift)'
+    ]
+    line_lower = line.lower()
+    if 'seite' in line_lower and ('von' in line_lower or 'iban' in line_lower):
+        return True
+    if line_lower.startswith('iban de'):
+        return True
+    return any(keyword in line_lower for keyword in footer_keywords)
+
+
+def legacy_is_technical_line(line):
+    technical_keywords = [
+        'Gläubiger-ID', 'Mand-ID', 'RCUR', 'OTHR', 'SALA', 'RINP', 'Wiederholungslastschrift',
+        'Dauerauftrag', 'BIC ', 'IBAN', 'Folgenr.', 'Verfalld.', 'Kartennr.'
+    ]
+    return any(keyword in line for keyword in technical_keywords)
+
+
+def legacy_clean_text(text):
+    text = re.sub(r'([a-zäöü])([A-ZÄÖÜ])', r'\1 \2', text)
+    replacements = {
+        'vonvon': 'von von', 'einzugvon': 'einzug von', 'überweisungvon': 'überweisung von',
+        'überweisungan': 'überweisung an', 'Einkaufbei': 'Einkauf bei', 'Ratefuer': 'Rate für',
+        'fuerMonat': 'für Monat', 'sagtDanke': 'sagt Danke', 'mangelsDeckung': 'mangels Deckung',
+        'oderwegen': 'oder wegen',
+    }
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    return ' '.join(text.split())
+
+
+def legacy_parse_full_transaction(lines, start_idx, state):
+    first_line = lines[start_idx].strip()
+    dates = re.findall(r'\d{2}\.\d{2}\.', first_line)
+    if not dates:
+        return None, 1
+    betrag_match = re.search(r'([+-])\s*(\d{1,3}(?:\.\d{3})*,\d{2})$', first_line)
+    if not betrag_match:
+        return None, 1
+    amount = float(betrag_match.group(2).replace('.', '').replace(',', '.'))
+    betrag = amount * (1 if betrag_match.group(1) == '+' else -1)
+    desc_start = first_line.find(dates[-1]) + len(dates[-1])
+    beschreibung = first_line[desc_start:betrag_match.start()].strip()
+    if re.match(r'^\d{2}\.\d{2}', beschreibung):
+        beschreibung = beschreibung[6:].strip()
+    beschreibung = legacy_clean_text(beschreibung)
+
+    year = datetime.now().year
+    if start_idx + 1 < len(lines):
+        year_match = re.search(r'(20\d{2})', lines[start_idx + 1].strip())
+        if year_match:
+            year = int(year_match.group(1))
+    month = int(re.match(r'(\d{2})\.(\d{2})\.', dates[0]).group(2))
+    if "last_month" not in state:
+        state.update(last_month=month, last_year=year)
+    if month < state["last_month"]:
+        state["last_year"] += 1
+    state["last_month"] = month
+    year = state["last_year"]
+
+    vorgang_lines = [beschreibung]
+    i = start_idx + 1
+    lines_consumed = 1
+    while i < len(lines):
+        line = lines[i].strip()
+        lines_consumed += 1
+        if legacy_is_transaction_start(line) or legacy_is_page_footer(line):
+            lines_consumed -= 1
+            break
+        if not line or legacy_is_technical_line(line) or re.match(r'^(20\d{2}\s*)+$', line):
+            i += 1
+            continue
+        line = re.sub(r'^(?:20\d{2}\s+)+', '', line)
+        if line:
+            vorgang_lines.append(line)
+        i += 1
+
+    vorgang = legacy_clean_text(' '.join(vorgang_lines))
+    return {
+        "Buchungstag": dates[0] + str(year),
+        "Valuta": (dates[1] if len(dates) > 1 else dates[0]) + str(year),
+        "Vorgang": vorgang[:750],
+        "Betrag EUR": betrag,
+    }, lines_consumed
+
+
+def legacy_parse_page(lines):
+    """Seitenschleife wie bisher: Folgezeilen werden doppelt klassifiziert"""
+    state = {}
+    transactions = []
+    i = 1
+    while i < len(lines):
+        line = lines[i].strip()
+        if legacy_is_page_footer(line):
+            break
+        if legacy_is_transaction_start(line):
+            transaction, consumed = legacy_parse_full_transaction(lines, i, state)
+            if transaction:
+                transactions.append(transaction)
+            i += consumed
+        else:
+            i += 1
+    return transactions
+
+
+# --- Synthetischer Zeilenstrom ---
+
+FOLLOW_LINES = [
+    "2024 2024", "2024 2024 PayPal Europe S.a.r.l. et Cie", "Gläubiger-ID DE98ZZZ09999999999",
+    "Mand-ID 1234567890 RCUR", "Verwendungszweck Rechnung 4711 Einkaufbei REWE",
+    "überweisungan Max Mustermann", "IBAN DE12500105170123456789 BIC INGDDEFFXXX",
+    "Kartennr. 1234 Folgenr. 01 Verfalld. 2027", "Ratefuer Vertrag 99 fuerMonat Januar",
+    # Überlappende Ersetzungen ("vonvon" vor "einzugvon")
+    "Lastschrifteinzugvonvon Stadtwerke", "überweisungvonvon Max Mustermann",
+]
+
+
+def synthetic_pages(total_lines: int, lines_per_page: int = 60, seed: int = 42):
+    rng = random.Random(seed)
+    pages = []
+    produced = 0
+    while produced < total_lines:
+        page = ["Buchung Valuta Vorgang Soll Haben"]
+        while len(page) < lines_per_page - 1:
+            month = rng.randint(1, 12)
+            day = rng.randint(1, 28)
+            amount = f"{rng.choice('+-')}{rng.randint(1, 999)}.{rng.randint(100, 999)},{rng.randint(10, 99)}"
+            page.append(f"{day:02d}.{month:02d}. {day:02d}.{month:02d}. SEPA Lastschrift von Händler {amount}")
+            page.extend(rng.sample(FOLLOW_LINES, rng.randint(1, 4)))
+        page.append("Auszug 1 Seite 1 von 9 IBAN DE76 1007 0024 0123 4567 00")
+        pages.append(page)
+        produced += len(page)
+    return pages, produced
+
+
+def run(label, fn, pages, line_count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    rate = line_count / best
+    print(f"{label:<10} {rate:>14,.0f} lines/s   ({best * 1000:.1f} ms)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages, line_count = synthetic_pages(args.lines)
+    print(f"{line_count:,} lines on {len(pages):,} pages")
+
+    def compiled(page):
+        return parse_transaction_blocks(extract_transaction_blocks(page), DBParseContext())
+
+    # Beide Pfade müssen dasselbe Ergebnis liefern
+    assert all(legacy_parse_page(page) == compiled(page) for page in pages[:50])
+
+    before = run("before", legacy_parse_page, pages, line_count, args.repeat)
+    after = run("after", compiled, pages, line_count, args.repeat)
+    print(f"speedup    {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: Export-Durchsatz und Spitzen-Speicher
+
+Vergleicht den bisherigen Export (Liste -> pandas.DataFrame -> to_excel) mit
+den Streaming-Writern (XLSX write-only, CSV, JSON-Lines). Jeder Lauf startet
+in einem eigenen Prozess, damit die Spitzen-RSS (ru_maxrss) nur diesen
+Export misst. Der Vergleichsfall benötigt pandas (nicht mehr in requirements.txt).
+
+    python benchmarks/bench_exporter.py --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+CASES = ["pandas-xlsx", "xlsx", "csv", "jsonl"]
+
+
+def synthetic_transactions(count):
+    """Erzeugt Transaktionen als Stream (wie iter_transactions eines Parsers)"""
+    for n in range(count):
+        day = n % 28 + 1
+        month = n % 12 + 1
+        yield {
+            "Datum": f"{day:02d}.{month:02d}.2024",
+            "Valuta": f"{day:02d}.{month:02d}.2024",
+            "Empfänger": f"Händler {n % 500}",
+            "Transaktion": "Lastschrift" if n % 3 else "Gutschrift",
+            "Betrag EUR": round((n % 10_000 - 5_000) / 7, 2),
+            "Verwendungszweck": f"Referenz {n} | Mandat M-{n % 997}",
+        }
+
+
+def legacy_export(transactions, file_path):
+    import pandas as pd
+    rows = list(transactions)
+    if rows:
+        pd.DataFrame(rows).to_excel(file_path, index=False)
+    return len(rows)
+
+
+def run_case(case, rows):
+    from core.exporter import export
+
+    suffix = "xlsx" if case == "pandas-xlsx" else case
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"out.{suffix}")
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        if case == "pandas-xlsx":
+            count = legacy_export(synthetic_transactions(rows), path)
+        else:
+            count = export(synthetic_transactions(rows), path, case)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "rows_per_sec": count / elapsed,
+        "seconds": elapsed,
+        # ru_maxrss ist unter Linux in KiB
+        "peak_rss_mb": peak / 1024,
+        "export_rss_mb": (peak - baseline) / 1024,
+        "file_mb": size / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, rows = args.child
+        # Bibliotheken vor der Messung laden, damit nur der Export zählt
+        import openpyxl  # noqa: F401
+        if case == "pandas-xlsx":
+            import pandas  # noqa: F401
+        print(json.dumps(run_case(case, int(rows))))
+        return
+
+    print(f"{'rows':>8} {'case':<12} {'rows/s':>10} {'time':>8} {'export RSS':>11} {'peak RSS':>9}")
+    for rows in args.rows:
+        for case in args.cases:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", case, str(rows)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{rows:>8,} {case:<12} {result['rows_per_sec']:>10,.0f} {result['seconds']:>7.2f}s "
+                  f"{result['export_rss_mb']:>8.1f} MB {result['peak_rss_mb']:>6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: Zeit pro Seite mit und ohne Font-Cache
+
+Liest die Zeichen (Backend "chars") eines synthetischen 100-seitigen
+Sparkasse-Auszugs mit eingebettetem Font-Subset (Type0, ToUnicode-CMap,
+Fontdatei), einmal mit einem Font-Objekt für alle Seiten und einmal mit
+eigenen, inhaltsgleichen Font-Objekten pro Seite (aus Einzelseiten
+zusammengefügter Auszug):
+
+- "pdfminer": Fonts nur nach Objekt-ID gecacht (PDFResourceManager)
+- "document": Fonts nach Inhalt, pro Dokument (SharedResourceManager)
+- "worker": zusätzlich FontCache über Dokumente, bereits gefüllt (wie im
+  Celery-Worker ab dem zweiten Auszug derselben Bank)
+
+    python benchmarks/bench_fonts.py --pages 100
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "tests"))
+sys.path.insert(0, str(ROOT_DIR / "benchmarks"))
+
+from pdfminer.pdfinterp import PDFResourceManager  # noqa: E402
+
+from bench_extraction import sparkasse_pages  # noqa: E402
+from core.font_cache import FontCache  # noqa: E402
+from core.pdf_extractor import ExtractedDocument  # noqa: E402
+from pdf_factory import CID, write_pdf  # noqa: E402
+
+
+def read_document(pdf_path, mode, font_cache):
+    """Liest alle Seiten, liefert (Zeit erste Seite, Zeit gesamt)"""
+    start = time.process_time()
+    with ExtractedDocument(pdf_path, font_cache=font_cache if mode == "worker" else None) as document:
+        if mode == "pdfminer":
+            document._open().rsrcmgr = PDFResourceManager()
+        first = None
+        for page in document.pages:
+            page.raw_chars
+            if first is None:
+                first = time.process_time() - start
+    return first, time.process_time() - start
+
+
+def run(pdf_path, mode, repeat):
+    font_cache = FontCache()
+    read_document(pdf_path, "worker", font_cache)  # füllt den Cache wie ein früherer Job
+    return min((read_document(pdf_path, mode, font_cache) for _ in range(repeat)), key=lambda times: times[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = sparkasse_pages(args.pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = {
+            "shared font": write_pdf(Path(tmp) / "shared.pdf", pages, font=CID),
+            "font per page": write_pdf(Path(tmp) / "per_page.pdf", pages, font=CID, font_per_page=True),
+        }
+        print(f"{'document':<15} {'cache':<10} {'first page':>11} {'ms/page':>9} {'speedup':>8}")
+        for name, pdf_path in documents.items():
+            baseline = None
+            for mode in ("pdfminer", "document", "worker"):
+                first, total = run(pdf_path, mode, args.repeat)
+                baseline = baseline or total
+                print(f"{name:<15} {mode:<10} {first * 1000:>9.1f}ms {total * 1000 / args.pages:>7.2f}ms "
+                      f"{baseline / total:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
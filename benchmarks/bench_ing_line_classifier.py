@@ -0,0 +1,205 @@
+"""
+Micro-Benchmark: Zeilenklassifikation im ING Parser
+
+Vergleicht die bisherige Seitenverarbeitung (bis zu drei Skip-Prüfungen pro
+Zeile mit lower() und linearer Keyword-Suche, mehrfaches split(), kw.lower()
+pro Wort und Transaktionstyp) mit dem vorkompilierten Klassifikator, jeweils
+mit wachsender Keyword-Liste. Die bisherige Variante wird mit der Listenlänge
+linear langsamer, die neue bleibt annähernd konstant.
+
+    python benchmarks/bench_ing_line_classifier.py --lines 50000
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from parsers.ing_parser import INGParser  # noqa: E402
+
+
+# --- Referenz: bisherige Implementierung ---
+
+class LegacyINGParser(INGParser):
+
+    def _process_page(self, page_lines, current_transaction, transactions, debug):
+        text = "\n".join(page_lines)
+        if not text:
+            return
+        lines = self._extract_table_lines(text, debug)
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if self._is_skip_line(line):
+                i += 1
+                continue
+            if self._is_booking_line(line):
+                self._save_transaction(current_transaction, transactions, debug)
+                current_transaction.reset()
+                self._parse_booking_line(line, current_transaction, debug)
+                if i + 1 < len(lines):
+                    next_line = lines[i + 1]
+                    if not self._is_skip_line(next_line):
+                        if self._try_parse_valuta(next_line, current_transaction):
+                            i += 2
+                            continue
+            else:
+                if current_transaction.datum and not self._is_skip_line(line):
+                    current_transaction.verwendungszweck.append(line)
+            i += 1
+
+    def _extract_table_lines(self, text, debug):
+        lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
+        in_table = False
+        table_lines = []
+        for line in lines:
+            lower_line = line.lower()
+            if any(start in lower_line for start in [
+                "buchung / verwendungszweck",
+                "betrag (eur)",
+            ]) or lower_line.startswith("valuta"):
+                in_table = True
+                continue
+            if in_table and any(end in lower_line for end in self.TABLE_END_KEYWORDS):
+                break
+            if in_table:
+                table_lines.append(line)
+        return table_lines
+
+    def _is_booking_line(self, line):
+        parts = line.split()
+        return len(parts) >= 3 and parts[0].count(".") == 2 and len(parts[0]) >= 8 and parts[0][2] == "."
+
+    def _is_skip_line(self, line):
+        line_lower = line.lower()
+        return any(keyword in line_lower for keyword in self.SKIP_KEYWORDS)
+
+    def _parse_booking_line(self, line, transaction, debug):
+        parts = line.split()
+        transaction.datum = parts[0]
+        transaction.betrag = parts[-1]
+        middle_text = " ".join(parts[1:-1])
+        transaction.erlaeuterung = middle_text
+        split_data = self._split_transaction_recipient(middle_text)
+        transaction.transaktion = split_data["transaktion"]
+        transaction.empfaenger = split_data["empfaenger"]
+
+    def _split_transaction_recipient(self, text):
+        words = text.split()
+        if not words:
+            return {"transaktion": "", "empfaenger": ""}
+        transaktion_words = []
+        empfaenger_words = []
+        in_transaction_type = False
+        for word in words:
+            clean_word = word.strip(" -").lower()
+            if any(kw.lower() == clean_word for kw in self.TRANSACTION_TYPES):
+                in_transaction_type = True
+                transaktion_words.append(word)
+                continue
+            if in_transaction_type and any(kw.lower() in clean_word for kw in self.TRANSACTION_TYPES):
+                transaktion_words.append(word)
+                continue
+            empfaenger_words.append(word)
+        transaktion = " ".join(transaktion_words).strip()
+        empfaenger = " ".join(empfaenger_words).strip()
+        if not transaktion and empfaenger:
+            transaktion, empfaenger = empfaenger, ""
+        return {"transaktion": transaktion, "empfaenger": empfaenger}
+
+    def _try_parse_valuta(self, line, transaction):
+        date_token = self._find_date_token(line)
+        if date_token:
+            transaction.valuta = date_token
+            rest = line.replace(date_token, "").strip()
+            if rest:
+                transaction.verwendungszweck.append(rest)
+            return True
+        return False
+
+    def _find_date_token(self, text):
+        for token in text.split():
+            clean_token = token.strip("(),;:")
+            parts = clean_token.split(".")
+            if len(parts) == 2 and all(p.isdigit() for p in parts) and len(parts[0]) == 2:
+                return clean_token
+            if len(parts) == 3 and all(p.isdigit() for p in parts[:2]):
+                return clean_token
+        return ""
+
+
+# --- Synthetische Daten ---
+
+RECIPIENTS = ["DOTT SCOOTER", "REWE SAGT DANKE", "Stadtwerke Koeln GmbH", "Max Mustermann", "AMAZON EU"]
+TYPES = ["Lastschrift", "Ueberweisung", "Gutschrift", "VISA", "Dauerauftrag", "Kartenzahlung"]
+PURPOSES = ["Mandat: M-4711", "Referenz: 2024-01-0815", "Verwendungszweck Miete Januar", "Kartenzahlung girocard"]
+
+
+def synthetic_pages(line_count, lines_per_page=45, seed=7):
+    rnd = random.Random(seed)
+    pages = []
+    total = 0
+    while total < line_count:
+        lines = ["Girokonto Nummer 1234567890", "Buchung / Verwendungszweck Betrag (EUR)", "Valuta"]
+        while len(lines) < lines_per_page:
+            day, month = rnd.randint(1, 28), rnd.randint(1, 12)
+            amount = f"{rnd.choice('-+')}{rnd.randint(1, 999)},{rnd.randint(0, 99):02d}".lstrip("+")
+            lines.append(f"{day:02d}.{month:02d}.2024 {rnd.choice(TYPES)} {rnd.choice(RECIPIENTS)} {amount}")
+            lines.append(f"{day:02d}.{month:02d}.2024")
+            lines.extend(rnd.sample(PURPOSES, rnd.randint(0, 2)))
+        lines.append("Neuer Saldo 1.234,56")
+        # Textzeilen pro Seite (parse_page_lines), damit nur die Klassifikation gemessen wird
+        pages.append(lines)
+        total += len(lines)
+    return pages, total
+
+
+def padded(parser_cls, keyword_count, seed=11):
+    """Unterklasse mit auf `keyword_count` verlängerter Skip- und Typ-Liste (nie treffende Keywords)"""
+    rnd = random.Random(seed)
+    filler = ["zq" + "".join(rnd.choices(string.ascii_lowercase, k=8)) for _ in range(keyword_count)]
+    skip = (INGParser.SKIP_KEYWORDS + filler)[:max(keyword_count, len(INGParser.SKIP_KEYWORDS))]
+    types = (INGParser.TRANSACTION_TYPES + filler)[:max(keyword_count, len(INGParser.TRANSACTION_TYPES))]
+    return type(f"{parser_cls.__name__}{keyword_count}", (parser_cls,), {
+        "SKIP_KEYWORDS": skip,
+        "TRANSACTION_TYPES": types,
+    })
+
+
+def run(parser, pages, line_count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            parser.parse_page_lines(page)
+        best = min(best, time.perf_counter() - start)
+    return line_count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keywords", type=int, nargs="+", default=[35, 350, 3500])
+    args = parser.parse_args()
+
+    pages, line_count = synthetic_pages(args.lines)
+    print(f"{line_count:,} lines on {len(pages):,} pages")
+    print(f"{'keywords':>8} {'before':>14} {'after':>14} {'speedup':>8}")
+
+    for keyword_count in args.keywords:
+        legacy = padded(LegacyINGParser, keyword_count)()
+        compiled = padded(INGParser, keyword_count)()
+        # Beide Pfade müssen dasselbe Ergebnis liefern
+        assert all(legacy.parse_page_lines(page) == compiled.parse_page_lines(page) for page in pages[:50])
+
+        before = run(legacy, pages, line_count, args.repeat)
+        after = run(compiled, pages, line_count, args.repeat)
+        print(f"{keyword_count:>8} {before:>12,.0f}/s {after:>12,.0f}/s {after / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: Job-Status-Abfragen pro Sekunde bei gleichzeitigen Worker-Updates
+
+Ein Prozess spielt den Celery-Worker und schreibt ununterbrochen Job-Updates,
+mehrere Threads spielen die API und lesen Job-Status (get_job). Verglichen
+wird die bisherige Anbindung (neue Verbindung pro Aufruf mit Testabfrage,
+Rollback-Journal) mit dem Job-Store aus api/services/database.py
+(Verbindung pro Thread, WAL, gecachte Statements). Jeder Modus nutzt eine
+eigene Datenbankdatei.
+
+    python benchmarks/bench_job_store.py --readers 4 --seconds 5
+"""
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.models.job import JobCreate, JobStatus  # noqa: E402
+from api.services import database  # noqa: E402
+from api.services.sqlite_store import SQLiteJobStore  # noqa: E402
+
+
+# --- Referenz: bisherige Anbindung ---
+
+def legacy_connection():
+    conn = sqlite3.connect(str(database.get_store().path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("SELECT 1").fetchone()
+    return conn
+
+
+def legacy_get_job(job_id):
+    conn = legacy_connection()
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def legacy_update_job(job_id, status):
+    conn = legacy_connection()
+    conn.execute("UPDATE jobs SET status = ?, error_message = ?, completed_at = ? WHERE id = ?",
+                 (status.value, None, None, job_id))
+    conn.commit()
+    conn.close()
+
+
+MODES = {
+    "legacy": (legacy_get_job, legacy_update_job),
+    "pooled": (database.get_job, database.update_job),
+}
+
+
+def setup(path, mode, job_count):
+    database.set_store(SQLiteJobStore(path))
+    database.init_db()
+    job_ids = [database.create_job(JobCreate(bank="ing")).job_id for _ in range(job_count)]
+    if mode == "legacy":
+        # Bisherige Datenbanken liefen im Standard-Journal
+        database.get_store().connection().execute("PRAGMA journal_mode=DELETE")
+    database.close_connections()
+    return job_ids
+
+
+def writer(path, mode, job_ids, stop, counter):
+    database.set_store(SQLiteJobStore(path))
+    update_job = MODES[mode][1]
+    statuses = [JobStatus.PENDING, JobStatus.PROCESSING]
+    rnd = random.Random(1)
+    writes = 0
+    while not stop.is_set():
+        update_job(rnd.choice(job_ids), statuses[writes % 2])
+        writes += 1
+    counter.value = writes
+
+
+def run(mode, job_count, readers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{mode}.db"
+        job_ids = setup(path, mode, job_count)
+        get_job = MODES[mode][0]
+
+        stop = multiprocessing.Event()
+        writes = multiprocessing.Value("q", 0)
+        process = multiprocessing.Process(target=writer, args=(path, mode, job_ids, stop, writes))
+        process.start()
+
+        reads = [0] * readers
+        errors = [0] * readers
+        deadline = time.perf_counter() + seconds
+
+        def reader(index):
+            rnd = random.Random(index)
+            while time.perf_counter() < deadline:
+                try:
+                    get_job(rnd.choice(job_ids))
+                    reads[index] += 1
+                except sqlite3.OperationalError:
+                    errors[index] += 1
+
+        threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stop.set()
+        process.join()
+        database.close_connections()
+
+    return sum(reads) / seconds, writes.value / seconds, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.readers} reader threads, 1 writer process, {args.jobs:,} jobs, {args.seconds:g}s")
+    print(f"{'mode':<8} {'reads/s':>12} {'writes/s':>12} {'errors':>8}")
+    for mode in MODES:
+        reads, writes, errors = run(mode, args.jobs, args.readers, args.seconds)
+        print(f"{mode:<8} {reads:>12,.0f} {writes:>12,.0f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
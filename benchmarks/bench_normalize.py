@@ -0,0 +1,114 @@
+"""
+Benchmark: Normalisierung von Beträgen und Datumsangaben
+
+Vergleicht den bisherigen Weg pro Zeile (float(amt.replace(...)),
+Jahreserkennung über DBParseContext.resolve_year, date(...)) mit der
+spaltenweisen Normalisierung in core.normalize (NumPy) und die Befüllung
+eines TransactionBatch per append gegenüber extend_rows.
+
+    python benchmarks/bench_normalize.py --rows 100000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.batch import TransactionBatch  # noqa: E402
+from core.normalize import parse_amounts, parse_dates  # noqa: E402
+from parsers.db_parser import DBParseContext  # noqa: E402
+from parsers.ing_parser import INGParser  # noqa: E402
+
+
+def synthetic_tokens(count: int, seed: int = 42):
+    """Roh-Tokens wie im Auszug: fortlaufende Buchungstage ohne Jahr (mit Jahreswechseln), deutsche Beträge"""
+    rng = random.Random(seed)
+    amounts, dates = [], []
+    for n in range(count):
+        cents = rng.randint(-500_000, 500_000)
+        text = f"{abs(cents) // 100:,}".replace(",", ".") + f",{abs(cents) % 100:02d}"
+        amounts.append(("-" if cents < 0 else "+") + text)
+        month = (n * 12 // max(count // 8, 1)) % 12 + 1
+        dates.append(f"{rng.randint(1, 28):02d}.{month:02d}.")
+    return amounts, dates
+
+
+def per_row(amounts, dates):
+    context = DBParseContext(last_month=1, last_year=2020)
+    euros, days = [], []
+    for amount, token in zip(amounts, dates):
+        sign = -1 if amount[0] == "-" else 1
+        euros.append(float(amount[1:].replace(".", "").replace(",", ".")) * sign)
+        day, month = int(token[:2]), int(token[3:5])
+        days.append(date(context.resolve_year(month), month, day).toordinal())
+    return euros, days
+
+
+def vectorized(amounts, dates):
+    cents, _ = parse_amounts(amounts)
+    return (cents / 100).tolist(), parse_dates(dates, last_month=1, last_year=2020).tolist()
+
+
+def ing_rows(amounts, dates):
+    return [
+        {
+            "Datum": token + "2024",
+            "Valuta": token + "2024",
+            "Empfänger": f"Händler {n % 500}",
+            "Transaktion": "Lastschrift",
+            "Betrag EUR": amount,
+            "Verwendungszweck": f"Referenz {n}",
+        }
+        for n, (amount, token) in enumerate(zip(amounts, dates))
+    ]
+
+
+def batch_append(rows):
+    batch = TransactionBatch(INGParser.COLUMNS)
+    for row in rows:
+        batch.append(row)
+    return batch
+
+
+def batch_extend(rows):
+    return TransactionBatch.from_rows(rows, INGParser.COLUMNS)
+
+
+def run(label, fn, args, count, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<20} {count / best:>12,.0f} rows/s   ({best * 1000:.1f} ms)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    amounts, dates = synthetic_tokens(args.rows)
+    assert per_row(amounts, dates) == vectorized(amounts, dates)
+
+    print(f"{args.rows:,} Beträge + Datumsangaben")
+    before = run("per row", per_row, (amounts, dates), args.rows, args.repeat)
+    after = run("vectorized", vectorized, (amounts, dates), args.rows, args.repeat)
+    print(f"speedup {before / after:.2f}x\n")
+
+    rows = ing_rows(amounts, dates)
+    assert list(batch_append(rows).rows()) == list(batch_extend(rows).rows())
+    print(f"{args.rows:,} Zeilen -> TransactionBatch (Beträge als Text)")
+    before = run("append per row", batch_append, (rows,), args.rows, args.repeat)
+    after = run("extend_rows", batch_extend, (rows,), args.rows, args.repeat)
+    print(f"speedup {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: reiner Parse-Schritt ohne PDF (parse_lines / parse_rows)
+
+Vervielfacht die Seiten der Golden-Fixtures (tests/golden/<bank>.json) auf
+die gewünschte Zeilenzahl und misst Zeilen pro Sekunde für jeden Parser.
+Die Extraktion (PDF öffnen, Zeichen lesen) ist nicht enthalten; das ist die
+Zeit, die ein erneutes Parsen von zwischengespeichertem Text kostet.
+
+    python benchmarks/bench_parse_lines.py --lines 1000000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from core.dispatcher import get_parser  # noqa: E402
+
+GOLDEN_DIR = ROOT_DIR / "tests" / "golden"
+
+
+def corpus(fixture, line_count):
+    """Seiten aller Fälle, so oft wiederholt, bis `line_count` Zeilen erreicht sind"""
+    pages = [page for case in fixture["cases"] for page in case["pages"]]
+    per_round = sum(len(page) for page in pages)
+    rounds = max(1, -(-line_count // per_round))
+    return pages * rounds, per_round * rounds
+
+
+def run(parser, fixture, pages, repeat):
+    parse = parser.parse_rows if fixture["format"] == "rows" else parser.parse_lines
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transactions = parse(pages)
+        best = min(best, time.perf_counter() - start)
+    return best, len(transactions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'bank':<15} {'format':<6} {'lines':>10} {'transactions':>13} {'lines/s':>12}")
+    for path in sorted(GOLDEN_DIR.glob("*.json")):
+        fixture = json.loads(path.read_text(encoding="utf-8"))
+        pages, line_count = corpus(fixture, args.lines)
+        seconds, transactions = run(get_parser(fixture["bank"]), fixture, pages, args.repeat)
+        print(f"{fixture['bank']:<15} {fixture['format']:<6} {line_count:>10,} {transactions:>13,} "
+              f"{line_count / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
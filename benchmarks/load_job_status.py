@@ -0,0 +1,175 @@
+"""
+Lasttest: Latenz von GET /api/jobs/{id} bei vielen gleichzeitigen Pollern
+
+Startet die API (uvicorn, eigener Prozess) zweimal gegen eine temporäre
+Datenbank, während ein Worker-Prozess Job-Updates schreibt (`--writes` pro Sekunde):
+einmal mit dem bisherigen Verhalten (get_job direkt auf der Event-Loop) und
+einmal mit get_job_async (Datenbank-Thread-Pool). Die Poller fragen im
+Abstand von `--interval` Sekunden zufällige Jobs ab, wie das Frontend.
+
+    python benchmarks/load_job_status.py --pollers 500 --seconds 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def serve(mode, port):
+    import uvicorn
+
+    from api.main import app
+    from api.routes import jobs
+    from api.services.database import get_job
+
+    if mode == "blocking":
+        # Referenz: synchroner SQLite-Zugriff innerhalb der async-Route
+        async def blocking_get_job(job_id):
+            return get_job(job_id)
+
+        jobs.get_job_async = blocking_get_job
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def writer(path, job_ids, stop, rate):
+    from api.models.job import JobStatus
+    from api.services import database
+    from api.services.database import update_job
+    from api.services.sqlite_store import SQLiteJobStore
+
+    database.set_store(SQLiteJobStore(path))
+    rnd = random.Random(1)
+    statuses = [JobStatus.PENDING, JobStatus.PROCESSING]
+    writes = 0
+    while not stop.is_set():
+        update_job(rnd.choice(job_ids), statuses[writes % 2])
+        writes += 1
+        stop.wait(1 / rate)
+
+
+def setup(path, job_count):
+    from api.models.job import JobCreate
+    from api.services import database
+    from api.services.sqlite_store import SQLiteJobStore
+
+    database.set_store(SQLiteJobStore(path))
+    database.init_db()
+    job_ids = [database.create_job(JobCreate(bank="ing")).job_id for _ in range(job_count)]
+    database.close_connections()
+    return job_ids
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("API startet nicht")
+
+
+async def poll(base_url, job_ids, pollers, seconds, interval):
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=pollers, max_keepalive_connections=pollers)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + seconds
+
+        async def poller(index):
+            nonlocal errors
+            rnd = random.Random(index)
+            # Poller starten versetzt, wie Nutzer, die nacheinander hochladen
+            await asyncio.sleep(rnd.uniform(0, interval))
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"/api/jobs/{rnd.choice(job_ids)}")
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    errors += 1
+                await asyncio.sleep(interval)
+
+        await asyncio.gather(*(poller(index) for index in range(pollers)))
+
+    return sorted(latencies), errors
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else float("nan")
+
+
+def run(mode, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "jobs.db"
+        job_ids = setup(path, args.jobs)
+
+        port = free_port()
+        server = subprocess.Popen([sys.executable, __file__, "--serve", mode, "--port", str(port)], cwd=ROOT_DIR,
+                                  env={**os.environ, "DATABASE_URL": f"sqlite:///{path}"})
+        stop = multiprocessing.Event()
+        process = multiprocessing.Process(target=writer, args=(path, job_ids, stop, args.writes))
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_ready(base_url))
+            process.start()
+            latencies, errors = asyncio.run(poll(base_url, job_ids, args.pollers, args.seconds, args.interval))
+        finally:
+            stop.set()
+            if process.is_alive() or process.exitcode is None:
+                process.join()
+            server.terminate()
+            server.wait()
+
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pollers", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--writes", type=float, default=50, help="Job-Updates pro Sekunde")
+    parser.add_argument("--serve", choices=["blocking", "async"])
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    print(f"{args.pollers} pollers every {args.interval:g}s, {args.writes:g} writes/s, {args.seconds:g}s")
+    print(f"{'mode':<9} {'requests/s':>11} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for mode in ("blocking", "async"):
+        latencies, errors = run(mode, args)
+        print(f"{mode:<9} {len(latencies) / args.seconds:>11,.0f} {percentile(latencies, 0.5):>9.1f} "
+              f"{percentile(latencies, 0.99):>9.1f} {percentile(latencies, 1.0):>9.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
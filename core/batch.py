@@ -0,0 +1,455 @@
+# core/batch.py
+"""
+Spaltenorientierte Transaktions-Batches
+Statt eines Dictionaries pro Zeile hält ein TransactionBatch jede Spalte als
+kompaktes Array: Datumsangaben als int32-Tagesordinal, Beträge als int64-Cent,
+wiederkehrende Texte (Empfänger, Buchungsart) dictionary-kodiert. Exporter und
+Vorschau arbeiten auf ganzen Spalten.
+
+Das Schema ist für alle Banken gleich aufgebaut: jede Spalte hat einen Namen
+(wie im Export), einen Typ und optional eine gemeinsame Rolle (Buchungstag,
+Betrag, ...). Spalten ohne Rolle sind bankspezifische Zusatzspalten.
+"""
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.normalize import amount_cents, parse_amounts, split_dates, to_ordinals
+
+# Spaltentypen
+DATE = "date"
+AMOUNT = "amount"
+CATEGORY = "category"
+TEXT = "text"
+
+# Rollen im gemeinsamen Schema
+BOOKING_DATE = "booking_date"
+VALUE_DATE = "value_date"
+AMOUNT_EUR = "amount"
+COUNTERPARTY = "counterparty"
+TRANSACTION_TYPE = "type"
+DESCRIPTION = "description"
+REMARK = "remark"
+
+# Zeilen pro Batch beim Streamen
+DEFAULT_BATCH_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class Column:
+    """Eine Spalte im Schema: Name im Export, Typ und Rolle im gemeinsamen Schema"""
+    name: str
+    kind: str = TEXT
+    role: Optional[str] = None
+
+
+Schema = Tuple[Column, ...]
+
+# Gemeinsames Schema: alle Spalten, die die Parser liefern. Jeder Parser
+# wählt daraus seine Spalten (in Export-Reihenfolge) per `schema(...)`.
+KNOWN_COLUMNS: Dict[str, Column] = {column.name: column for column in (
+    Column("Datum", DATE, BOOKING_DATE),
+    Column("Buchungstag", DATE, BOOKING_DATE),
+    Column("Valuta", DATE, VALUE_DATE),
+    Column("Betrag EUR", AMOUNT, AMOUNT_EUR),
+    Column("Empfänger", CATEGORY, COUNTERPARTY),
+    Column("Transaktion", CATEGORY, TRANSACTION_TYPE),
+    Column("Erläuterung", CATEGORY, DESCRIPTION),
+    Column("Vorgang", TEXT, DESCRIPTION),
+    Column("Verwendungszweck", TEXT, REMARK),
+    Column("Bemerkung", TEXT, REMARK),
+)}
+
+
+def schema(*names: str) -> Schema:
+    """Schema aus bekannten Spaltennamen; unbekannte Namen werden Textspalten ohne Rolle"""
+    return tuple(KNOWN_COLUMNS.get(name) or Column(name, TEXT) for name in names)
+
+
+def infer_schema(names: Iterable[str]) -> Schema:
+    """Schema für Zeilen ohne Parser-Schema (z.B. bearbeitete Vorschau), anhand der Spaltennamen"""
+    return schema(*names)
+
+
+# ---------------------------------------------------------------------------
+# Spalten-Speicher
+# ---------------------------------------------------------------------------
+
+class DateColumn:
+    """
+    Datumsangaben als int32-Tagesordinal (0 = fehlt).
+    Alles andere (z.B. ING-Valuta "05.01" oder "") landet unverändert in
+    einem dünn besetzten Fallback, damit die Werte exakt erhalten bleiben.
+    """
+
+    def __init__(self):
+        self.ordinals = array("i")
+        self.raw: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def append(self, value: Any):
+        ordinal = _date_ordinal(value) if isinstance(value, str) else 0
+        if isinstance(value, date):
+            ordinal = value.toordinal()
+        if not ordinal and value is not None:
+            self.raw[len(self.ordinals)] = value
+        self.ordinals.append(ordinal)
+
+    def extend_values(self, values: Sequence[Any]):
+        """Wie append für eine ganze Spalte; Text-Datumsangaben werden gesammelt normalisiert"""
+        # Nur vollständige Daten (10 Zeichen) werden Ordinale, alles andere bleibt exakt erhalten
+        tokens = [value if isinstance(value, str) and len(value) == 10 and value[-1].isdigit() else None
+                  for value in values]
+        ordinals = to_ordinals(*split_dates(tokens)).tolist()
+        offset = len(self.ordinals)
+        for index, value in enumerate(values):
+            if isinstance(value, date):
+                ordinals[index] = value.toordinal()
+            elif not ordinals[index] and value is not None:
+                self.raw[offset + index] = value
+        self.ordinals.extend(ordinals)
+
+    def extend(self, other: "DateColumn"):
+        offset = len(self.ordinals)
+        self.ordinals.extend(other.ordinals)
+        self.raw.update((offset + index, value) for index, value in other.raw.items())
+
+    def values(self) -> List[Any]:
+        """Originalwerte ("DD.MM.YYYY"-Text)"""
+        return self._materialize(_format_ordinal)
+
+    def typed(self) -> List[Any]:
+        """`date`-Objekte; nicht erkannte Werte bleiben wie sie sind"""
+        return self._materialize(date.fromordinal)
+
+    def _materialize(self, convert) -> List[Any]:
+        values = [convert(ordinal) if ordinal else None for ordinal in self.ordinals]
+        for index, value in self.raw.items():
+            values[index] = value
+        return values
+
+    def nbytes(self) -> int:
+        return self.ordinals.itemsize * len(self.ordinals) + sum(sys.getsizeof(value) for value in self.raw.values())
+
+
+# Kennzeichnet fehlende Beträge (None) im int64-Array
+MISSING_CENTS = -(2 ** 63)
+
+
+class AmountColumn:
+    """
+    Beträge als int64-Cent. Werte, die sich nicht verlustfrei in Cent
+    darstellen lassen, landen unverändert im dünn besetzten Fallback.
+    """
+
+    def __init__(self):
+        self.cents = array("q")
+        self.raw: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def append(self, value: Any):
+        cents = _to_cents(value)
+        if cents is None:
+            if value is not None:
+                self.raw[len(self.cents)] = value
+            cents = MISSING_CENTS
+        self.cents.append(cents)
+
+    def extend_values(self, values: Sequence[Any]):
+        """Wie append für eine ganze Spalte: Text- und Float-Beträge werden gesammelt in Cent umgerechnet"""
+        cents = [MISSING_CENTS] * len(values)
+        texts = [index for index, value in enumerate(values) if isinstance(value, str)]
+        floats = [index for index, value in enumerate(values) if type(value) is float]
+
+        if texts:
+            parsed, valid = parse_amounts([_strip_currency(values[index]) for index in texts], dot_decimal=True)
+            for index, value, ok in zip(texts, parsed.tolist(), valid.tolist()):
+                if ok:
+                    cents[index] = value
+        if floats:
+            euros = np.array([values[index] for index in floats], dtype=np.float64)
+            with np.errstate(invalid="ignore", over="ignore"):
+                scaled = np.rint(euros * 100)
+                ok = np.isfinite(scaled) & (np.abs(scaled) < 2.0 ** 63) & (scaled / 100 == euros)
+            for index, value, exact in zip(floats, scaled.tolist(), ok.tolist()):
+                if exact:
+                    cents[index] = int(value)
+        for index, value in enumerate(values):
+            if cents[index] == MISSING_CENTS and not isinstance(value, (str, float)):
+                converted = _to_cents(value)
+                if converted is not None:
+                    cents[index] = converted
+
+        offset = len(self.cents)
+        for index, value in enumerate(values):
+            if cents[index] == MISSING_CENTS and value is not None:
+                self.raw[offset + index] = value
+        self.cents.extend(cents)
+
+    def extend(self, other: "AmountColumn"):
+        offset = len(self.cents)
+        self.cents.extend(other.cents)
+        self.raw.update((offset + index, value) for index, value in other.raw.items())
+
+    def values(self) -> List[Any]:
+        values = [None if cents == MISSING_CENTS else cents / 100 for cents in self.cents]
+        for index, value in self.raw.items():
+            values[index] = value
+        return values
+
+    typed = values
+
+    def nbytes(self) -> int:
+        return self.cents.itemsize * len(self.cents) + sum(sys.getsizeof(value) for value in self.raw.values())
+
+
+class CategoryColumn:
+    """Wiederkehrende Texte dictionary-kodiert: int32-Codes plus eine Liste der verschiedenen Werte"""
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories: List[Any] = []
+        self._index: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def append(self, value: Any):
+        self.codes.append(self._code(value))
+
+    def extend_values(self, values: Sequence[Any]):
+        code = self._code
+        self.codes.extend(array("i", [code(value) for value in values]))
+
+    def extend(self, other: "CategoryColumn"):
+        recode = [self._code(value) for value in other.categories]
+        self.codes.extend(array("i", (recode[code] for code in other.codes)))
+
+    def _code(self, value: Any) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.categories)
+            self._index[value] = code
+            self.categories.append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+    def values(self) -> List[Any]:
+        categories = self.categories
+        return [categories[code] for code in self.codes]
+
+    typed = values
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(value) for value in self.categories)
+
+
+class TextColumn:
+    """Freitext (Verwendungszweck, Bemerkung), eine Python-Liste"""
+
+    def __init__(self):
+        self.items: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def append(self, value: Any):
+        self.items.append(value)
+
+    def extend_values(self, values: Sequence[Any]):
+        self.items.extend(values)
+
+    def extend(self, other: "TextColumn"):
+        self.items.extend(other.items)
+
+    def values(self) -> List[Any]:
+        return list(self.items)
+
+    typed = values
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.items) + sum(sys.getsizeof(value) for value in self.items)
+
+
+COLUMN_TYPES = {
+    DATE: DateColumn,
+    AMOUNT: AmountColumn,
+    CATEGORY: CategoryColumn,
+    TEXT: TextColumn,
+}
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+
+class TransactionBatch:
+    """
+    Transaktionen eines Auszugs (oder eines Ausschnitts davon) spaltenweise.
+
+    Args:
+        schema: Spalten in Export-Reihenfolge
+    """
+
+    def __init__(self, schema: Sequence[Column]):
+        self.schema: Schema = tuple(schema)
+        self.columns = {column.name: COLUMN_TYPES[column.kind]() for column in self.schema}
+        self._appenders = [(column.name, self.columns[column.name].append) for column in self.schema]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], schema: Optional[Sequence[Column]] = None) -> "TransactionBatch":
+        rows = iter(rows)
+        first = next(rows, None)
+        if not schema:
+            schema = infer_schema(first or ())
+        batch = cls(schema)
+        if first is not None:
+            batch.extend_rows([first])
+            while True:
+                chunk = list(islice(rows, DEFAULT_BATCH_SIZE))
+                if not chunk:
+                    break
+                batch.extend_rows(chunk)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Iterable["TransactionBatch"]) -> Optional["TransactionBatch"]:
+        """Fügt Batches spaltenweise zusammen (gleiches Schema vorausgesetzt)"""
+        result = None
+        for batch in batches:
+            if result is None:
+                result = cls(batch.schema)
+            result.extend(batch)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.columns[self.schema[0].name]) if self.schema else 0
+
+    @property
+    def names(self) -> List[str]:
+        return [column.name for column in self.schema]
+
+    def append(self, row: Dict[str, Any]):
+        get = row.get
+        for name, append in self._appenders:
+            append(get(name))
+
+    def extend_rows(self, rows: Sequence[Dict[str, Any]]):
+        """Hängt mehrere Zeilen an; jede Spalte wird als Ganzes normalisiert (siehe core.normalize)"""
+        for name, column in self.columns.items():
+            column.extend_values([row.get(name) for row in rows])
+
+    def extend(self, other: "TransactionBatch"):
+        if other.schema != self.schema:
+            raise ValueError("Batches mit unterschiedlichem Schema können nicht zusammengefügt werden")
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+
+    def role(self, role: str) -> Optional[Column]:
+        """Erste Spalte mit der gegebenen Rolle im gemeinsamen Schema"""
+        for column in self.schema:
+            if column.role == role:
+                return column
+        return None
+
+    def values(self, name: str) -> List[Any]:
+        """Werte einer Spalte so, wie der Parser sie geliefert hat"""
+        return self.columns[name].values()
+
+    def typed(self, name: str) -> List[Any]:
+        """Werte einer Spalte typisiert (date, float, str)"""
+        return self.columns[name].typed()
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Zurück in Zeilen-Dictionaries (wie parse() sie liefert)"""
+        names = self.names
+        for values in zip(*(self.values(name) for name in names)):
+            yield dict(zip(names, values))
+
+    def nbytes(self) -> int:
+        """Ungefährer Speicherbedarf der Spaltendaten"""
+        return sum(column.nbytes() for column in self.columns.values())
+
+
+def iter_batches(rows: Iterable[Dict[str, Any]], schema: Optional[Sequence[Column]] = None,
+                 size: int = DEFAULT_BATCH_SIZE) -> Iterator[TransactionBatch]:
+    """
+    Fasst einen Transaktions-Stream in Batches zu je `size` Zeilen zusammen.
+    Ohne Schema wird es aus den Spaltennamen der ersten Transaktion abgeleitet.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        schema = schema or infer_schema(chunk[0])
+        batch = TransactionBatch(schema)
+        batch.extend_rows(chunk)
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Konvertierung
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(value: str) -> int:
+    """
+    "DD.MM.YYYY" (Auszug) oder "YYYY-MM-DD" (CSV/JSON-Export) -> Tagesordinal,
+    0 wenn der Wert kein vollständiges Datum ist
+    """
+    if len(value) != 10:
+        return 0
+    if value[2] == "." and value[5] == ".":
+        day, month, year = value[:2], value[3:5], value[6:]
+    elif value[4] == "-" and value[7] == "-":
+        year, month, day = value[:4], value[5:7], value[8:]
+    else:
+        return 0
+    if not (day.isdigit() and month.isdigit() and year.isdigit()):
+        return 0
+    try:
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=4096)
+def _format_ordinal(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%d.%m.%Y")
+
+
+def _to_cents(value: Any) -> Optional[int]:
+    """Betrag -> Cent, None wenn der Wert nicht verlustfrei in Cent passt"""
+    if isinstance(value, str):
+        return amount_cents(_strip_currency(value), dot_decimal=True)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if value != value or value in (float("inf"), float("-inf")):
+        return None
+    cents = round(value * 100)
+    if cents / 100 != value or not MISSING_CENTS < cents < 2 ** 63:
+        return None
+    return cents
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """
+    Betrag aus Text: "-1.234,56", "-1234.56", "12,50 €".
+    Mit Komma gilt deutsches Format (Punkt = Tausender), sonst Dezimalpunkt.
+    """
+    cents = amount_cents(_strip_currency(text), dot_decimal=True)
+    return cents / 100 if cents is not None else None
+
+
+def _strip_currency(text: str) -> str:
+    return text.replace("€", "").replace("EUR", "").strip()
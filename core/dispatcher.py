@@ -1,15 +1,108 @@
 # core/dispatcher.py
-from parsers.sparkasse_parser import SparkasseParser
-from parsers.ing_parser import INGParser
-from parsers.db_parser import DBParser
+import logging
+from typing import Dict, List
+
+from parsers.base_parser import Detection
+from core.page_budget import BudgetWarning, PageBudgetExceeded
+from core.pdf_extractor import ExtractedDocument, PDFSource
+from core.registry import registry
+
+logger = logging.getLogger(__name__)
+
+# Auto-Detection: Fingerprint entscheidet allein, wenn der beste Score
+# hoch genug ist und klar vor dem zweitbesten liegt
+DETECTION_MIN_SCORE = 0.5
+DETECTION_MIN_MARGIN = 0.2
+# Liegt Seite 1 über dem Arbeitsbudget, wird der Fingerprint auf den
+# nächsten Seiten versucht, danach probeweise geparst
+DETECTION_MAX_PAGES = 3
+
 
 def get_parser(bank_name: str):
-    bank_name = bank_name.lower()
-    if bank_name == "sparkasse":
-        return SparkasseParser()
-    elif bank_name == "ing":
-        return INGParser()
-    elif bank_name in ["db", "deutschebank", "deutsche bank", "deutsche_bank"]:
-        return DBParser()
+    """Erzeugt den Parser für einen Bank-Namen oder Alias (Import erst hier)"""
+    return registry.get(bank_name).create()
+
+
+def detect_bank(source: PDFSource) -> Detection:
+    """
+    Erkennt die Bank anhand der ersten Seite.
+
+    Jeder registrierte Parser bewertet Seite 1 (Kopfzeilen, BLZ/BIC, Tabellenkopf).
+    Nur wenn die Scores nicht eindeutig sind, wird unter den Kandidaten
+    probeweise geparst und der Parser mit den meisten Transaktionen gewählt.
+    Überschreitet Seite 1 das Arbeitsbudget, bewertet der Fingerprint die
+    nächste Seite (bis DETECTION_MAX_PAGES); die übersprungenen Seiten landen
+    in `document.over_budget` der erkannten Bank.
+
+    Args:
+        source: Pfad zum PDF oder bereits geöffnetes ExtractedDocument
+
+    Returns:
+        Detection mit Bank-Name und entscheidendem Signal
+    """
+    if not isinstance(source, ExtractedDocument):
+        with ExtractedDocument(source) as document:
+            return detect_bank(document)
+
+    if not source.pages:
+        raise ValueError("Konnte Bank nicht automatisch erkennen")
+
+    over_budget: Dict[int, BudgetWarning] = {}
+    detection = _detect(source, over_budget)
+    if over_budget:
+        source.over_budget.setdefault(detection.bank, {}).update(over_budget)
+    return detection
+
+
+def _detect(document: ExtractedDocument, over_budget: Dict[int, BudgetWarning]) -> Detection:
+    for page in document.pages[:DETECTION_MAX_PAGES]:
+        try:
+            # Text einmal unter Budget lesen, die Fingerprints nutzen den Cache
+            page.text()
+        except PageBudgetExceeded as e:
+            logger.warning(str(e))
+            over_budget[page.page_number] = e.warning
+            continue
+        break
     else:
-        raise ValueError(f"Bank '{bank_name}' wird nicht unterstützt")
+        # Keine Seite im Budget: alle Parser probeweise (die überspringen solche Seiten selbst)
+        return _detect_by_trial_parse(document, [Detection(spec.name, 0.0) for spec in registry.detectable()])
+
+    detections = []
+    for spec in registry.detectable():
+        detection = spec.detect(page)
+        detection.bank = spec.name
+        detections.append(detection)
+    detections.sort(key=lambda detection: detection.score, reverse=True)
+    best = detections[0]
+    runner_up = detections[1].score if len(detections) > 1 else 0.0
+    logger.debug("Fingerprint scores: " + ", ".join(
+        f"{d.bank}={d.score:.2f}" for d in detections
+    ))
+
+    if best.score >= DETECTION_MIN_SCORE and best.score - runner_up >= DETECTION_MIN_MARGIN:
+        return best
+
+    # Mehrdeutig: nur Kandidaten mit Signal probeweise parsen (oder alle, wenn keiner passt)
+    candidates = [d for d in detections if d.score > 0] or detections
+    return _detect_by_trial_parse(document, candidates)
+
+
+def _detect_by_trial_parse(document: ExtractedDocument, candidates: List[Detection]) -> Detection:
+    best = None
+    max_transactions = 0
+
+    for candidate in candidates:
+        try:
+            transactions = get_parser(candidate.bank).parse(document)
+        except Exception as e:
+            logger.debug(f"Parser {candidate.bank} failed: {e}")
+            continue
+        if len(transactions) > max_transactions:
+            max_transactions = len(transactions)
+            best = Detection(candidate.bank, candidate.score, ["trial_parse"])
+
+    if not best:
+        raise ValueError("Konnte Bank nicht automatisch erkennen")
+
+    return best
@@ -1,8 +1,198 @@
 # core/exporter.py
-import pandas as pd
-from typing import List, Dict
+"""
+Export der Transaktionen als XLSX, CSV oder JSON-Lines
+Alle Writer konsumieren die Transaktionen als Stream von TransactionBatches;
+der Speicherbedarf ist unabhängig von der Länge des Auszugs. Typen werden
+spaltenweise aus dem Batch übernommen: Beträge als Zahlen, Datumswerte als
+echte Datumsangaben.
+"""
+import csv
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
-def export_to_excel(transactions: List[Dict], file_path: str):
-    if transactions:
-        df = pd.DataFrame(transactions)
-        df.to_excel(file_path, index=False)
+from core.batch import AMOUNT, DATE, Column, TransactionBatch, infer_schema, iter_batches
+
+XLSX_DATE_FORMAT = "DD.MM.YYYY"
+XLSX_EUR_FORMAT = '#,##0.00 "€"'
+
+Row = Dict[str, Any]
+FilePath = Union[str, Path]
+Batches = Iterable[TransactionBatch]
+
+
+def write_xlsx(batches: Batches, file_path: FilePath) -> int:
+    """XLSX über openpyxl im Write-Only-Modus (Zeilen werden direkt auf die Platte gestreamt)"""
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(first.names)
+
+    def styled(number_format: str, kinds: tuple) -> Callable[[Any], Any]:
+        def convert(value):
+            if not isinstance(value, kinds):
+                return value
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.number_format = number_format
+            return cell
+        return convert
+
+    converters = {
+        DATE: styled(XLSX_DATE_FORMAT, (date,)),
+        AMOUNT: styled(XLSX_EUR_FORMAT, (int, float)),
+    }
+
+    count = 0
+    for batch in _chain(first, batches):
+        for values in _typed_rows(batch, converters):
+            sheet.append(values)
+        count += len(batch)
+
+    workbook.save(str(file_path))
+    return count
+
+
+def write_csv(batches: Batches, file_path: FilePath) -> int:
+    """CSV (UTF-8 mit BOM für Excel), Beträge mit Dezimalpunkt, Datumsangaben als ISO 8601"""
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(first.names)
+        for batch in _chain(first, batches):
+            writer.writerows(_typed_rows(batch, {DATE: _iso_date}))
+            count += len(batch)
+    return count
+
+
+def write_jsonl(batches: Batches, file_path: FilePath) -> int:
+    """Ein JSON-Objekt pro Zeile, Datumsangaben als ISO 8601"""
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    count = 0
+    with open(file_path, "w", encoding="utf-8") as f:
+        for batch in _chain(first, batches):
+            names = batch.names
+            for values in _typed_rows(batch, {DATE: _iso_date}):
+                f.write(json.dumps(dict(zip(names, values)), ensure_ascii=False))
+                f.write("\n")
+            count += len(batch)
+    return count
+
+
+WRITERS: Dict[str, Callable[[Batches, FilePath], int]] = {
+    "xlsx": write_xlsx,
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
+
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def get_writer(output_format: str) -> Callable[[Batches, FilePath], int]:
+    writer = WRITERS.get(output_format.strip().lower())
+    if writer is None:
+        raise ValueError(f"Ausgabeformat '{output_format}' wird nicht unterstützt")
+    return writer
+
+
+def format_from_path(file_path: FilePath, default: str = "xlsx") -> str:
+    """Ausgabeformat aus der Dateiendung ("out.csv" -> "csv")"""
+    suffix = Path(file_path).suffix.lstrip(".").lower()
+    return suffix if suffix in WRITERS else default
+
+
+def export(transactions: Iterable[Row], file_path: FilePath, output_format: Optional[str] = None,
+           schema: Optional[Sequence[Column]] = None) -> int:
+    """
+    Schreibt Transaktionen im gewünschten Format. Ohne Transaktionen wird
+    keine Datei geschrieben.
+
+    Args:
+        transactions: Transaktionen (Liste oder Stream)
+        file_path: Zieldatei
+        output_format: "xlsx", "csv" oder "jsonl" (Standard: aus der Dateiendung)
+        schema: Spalten des Parsers (Standard: aus den Spaltennamen abgeleitet)
+
+    Returns:
+        Anzahl geschriebener Transaktionen
+    """
+    return export_batches(iter_batches(transactions, schema), file_path, output_format)
+
+
+def export_batches(batches: Batches, file_path: FilePath, output_format: Optional[str] = None) -> int:
+    """Wie export, nimmt aber bereits spaltenweise vorliegende TransactionBatches"""
+    return get_writer(output_format or format_from_path(file_path))(batches, file_path)
+
+
+def export_to_excel(transactions: Iterable[Row], file_path: str) -> int:
+    return export(transactions, file_path, "xlsx")
+
+
+def read_batch(file_path: FilePath, output_format: Optional[str] = None) -> TransactionBatch:
+    """
+    Liest eine exportierte Datei zurück in einen TransactionBatch (z.B. für
+    die Vorschau). Das Schema ergibt sich aus den Spaltennamen.
+    """
+    output_format = (output_format or format_from_path(file_path)).strip().lower()
+    if output_format == "xlsx":
+        from openpyxl import load_workbook
+        workbook = load_workbook(str(file_path), read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(name) for name in next(rows, ())]
+            batch = TransactionBatch(infer_schema(header))
+            for values in rows:
+                batch.append(dict(zip(header, values)))
+        finally:
+            workbook.close()
+        return batch
+    if output_format == "csv":
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            return TransactionBatch.from_rows(csv.DictReader(f))
+    if output_format == "jsonl":
+        with open(file_path, encoding="utf-8") as f:
+            return TransactionBatch.from_rows(json.loads(line) for line in f if line.strip())
+    raise ValueError(f"Ausgabeformat '{output_format}' wird nicht unterstützt")
+
+
+def _typed_rows(batch: TransactionBatch, converters: Dict[str, Callable[[Any], Any]]) -> Iterator[List[Any]]:
+    """Konvertiert spaltenweise (Ordinal -> date, Cent -> float, dann Format-Konverter) und liefert Zeilen"""
+    columns = []
+    for column in batch.schema:
+        values = batch.typed(column.name)
+        convert = converters.get(column.kind)
+        if convert is not None:
+            values = [convert(value) for value in values]
+        columns.append(values)
+    return map(list, zip(*columns))
+
+
+def _chain(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+def _iso_date(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
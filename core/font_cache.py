@@ -0,0 +1,196 @@
+# core/font_cache.py
+"""
+Font-Cache für die Extraktion
+pdfminer baut für jedes Font-Objekt eines PDFs einen PDFFont (Breiten,
+Encoding, ToUnicode-CMap, eingebettete Fontdatei) und für jedes Zeichen die
+Glyphen-Metriken neu auf. Kontoauszüge verwenden auf allen Seiten dieselben
+zwei, drei Fonts, oft als eigene, aber inhaltsgleiche Objekte pro Seite
+(aus Einzelseiten zusammengefügte PDFs).
+
+- SharedResourceManager: Fonts werden nach Inhalt geschlüsselt, nicht nach
+  Objekt-ID; inhaltsgleiche Fonts eines Dokuments werden nur einmal gebaut
+- FontCache: optionaler, begrenzter LRU-Cache über Dokumente hinweg (z.B. im
+  langlebigen Celery-Worker)
+- glyph_table: Text und Breite pro Zeichen-ID, einmal pro Font berechnet
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pdfminer.pdffont import PDFFont, PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.pdftypes import PDFObjRef, PDFStream
+from pdfminer.psparser import PSKeyword, PSLiteral
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FONT_CACHE_SIZE = 64
+
+# Type3-Fonts zeichnen Glyphen über eigene Ressourcen (Bilder, Formulare) und
+# werden nur über die Objekt-ID gecacht, wie von pdfminer
+UNCACHED_FONT_TYPES = ("Type3",)
+
+# Tiefe, ab der ein Font-Dictionary als zyklisch/ungewöhnlich gilt
+_MAX_DEPTH = 16
+
+
+class FontCache:
+    """
+    Fonts über Dokumente hinweg, nach Inhalt geschlüsselt (siehe font_key).
+    Begrenzt auf `size` Einträge, der am längsten ungenutzte fliegt zuerst.
+    """
+
+    def __init__(self, size: int = DEFAULT_FONT_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._fonts: "OrderedDict[bytes, PDFFont]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._fonts)
+
+    def get(self, key: bytes) -> Optional[PDFFont]:
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                self.misses += 1
+                return None
+            self._fonts.move_to_end(key)
+            self.hits += 1
+            return font
+
+    def put(self, key: bytes, font: PDFFont):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.size:
+                self._fonts.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._fonts.clear()
+            self.hits = self.misses = 0
+
+
+class SharedResourceManager(PDFResourceManager):
+    """
+    PDFResourceManager, der Fonts nach Inhalt statt nach Objekt-ID teilt:
+    innerhalb des Dokuments immer, über Dokumente hinweg über `font_cache`.
+    """
+
+    def __init__(self, font_cache: Optional[FontCache] = None):
+        super().__init__(caching=True)
+        self.font_cache = font_cache
+        self._fonts_by_content: Dict[bytes, PDFFont] = {}
+
+    def get_font(self, objid: object, spec: Any) -> PDFFont:
+        if objid and objid in self._cached_fonts:
+            return self._cached_fonts[objid]
+        try:
+            detached = _detach(spec)
+        except Exception as e:  # defekte Streams, Zyklen: pdfminer entscheidet wie bisher
+            logger.debug(f"Font {objid} not cached by content: {e}")
+            return super().get_font(objid, spec)
+        if _name(detached.get("Subtype")) in UNCACHED_FONT_TYPES:
+            return super().get_font(objid, spec)
+
+        key = font_key(detached)
+        font = self._fonts_by_content.get(key)
+        if font is None and self.font_cache is not None:
+            font = self.font_cache.get(key)
+        if font is None:
+            # Aus dem abgelösten Dictionary gebaut, damit der Font kein Dokument festhält
+            font = super().get_font(None, detached)
+            if self.font_cache is not None:
+                self.font_cache.put(key, font)
+        self._fonts_by_content[key] = font
+        if objid:
+            self._cached_fonts[objid] = font
+        return font
+
+
+def font_key(spec: Dict[str, Any]) -> bytes:
+    """Inhalts-Schlüssel eines (mit _detach abgelösten) Font-Dictionaries"""
+    digest = hashlib.blake2b(digest_size=20)
+    _feed(digest, spec)
+    return digest.digest()
+
+
+def _detach(obj: Any, depth: int = 0) -> Any:
+    """
+    Löst alle Objekt-Referenzen auf und dekodiert Streams, sodass das
+    Ergebnis nichts mehr vom Dokument referenziert (Parser, Verschlüsselung)
+    """
+    if depth > _MAX_DEPTH:
+        raise ValueError("Font-Dictionary zu tief verschachtelt")
+    if isinstance(obj, PDFObjRef):
+        obj = obj.resolve()
+    if isinstance(obj, dict):
+        return {key: _detach(value, depth + 1) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_detach(value, depth + 1) for value in obj]
+    if isinstance(obj, PDFStream):
+        attrs = {
+            key: _detach(value, depth + 1)
+            for key, value in obj.attrs.items()
+            if key not in ("Filter", "F", "DecodeParms", "DP", "Length")
+        }
+        return PDFStream(attrs, obj.get_data())
+    return obj
+
+
+def _feed(digest, obj: Any):
+    if isinstance(obj, dict):
+        digest.update(b"<<%d" % len(obj))
+        for key in sorted(obj):
+            digest.update(b"/" + str(key).encode("utf-8"))
+            _feed(digest, obj[key])
+    elif isinstance(obj, list):
+        digest.update(b"[%d" % len(obj))
+        for value in obj:
+            _feed(digest, value)
+    elif isinstance(obj, PDFStream):
+        _feed(digest, obj.attrs)
+        data = obj.get_data()
+        digest.update(b"stream%d:" % len(data) + data)
+    elif isinstance(obj, PSLiteral):
+        digest.update(b"/" + str(obj.name).encode("utf-8") + b" ")
+    elif isinstance(obj, PSKeyword):
+        digest.update(b"k" + obj.name + b" ")
+    elif isinstance(obj, bytes):
+        digest.update(b"(%d:" % len(obj) + obj)
+    else:
+        digest.update(b"%s:%r " % (type(obj).__name__.encode("ascii"), obj))
+
+
+def _name(value: Any) -> Optional[str]:
+    return value.name if isinstance(value, PSLiteral) else None
+
+
+class GlyphTable(dict):
+    """(Text, Breite in Textraum-Einheiten) pro Zeichen-ID eines Fonts"""
+
+    def __init__(self, font: PDFFont):
+        super().__init__()
+        self.descent = font.get_descent()
+
+    def glyph(self, font: PDFFont, cid: int) -> Tuple[str, float]:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"  # wie PDFLayoutAnalyzer.handle_undefined_char
+        glyph = self[cid] = (text, font.char_width(cid))
+        return glyph
+
+
+def glyph_table(font: PDFFont) -> GlyphTable:
+    """Glyphen-Metriken des Fonts, am Font-Objekt gecacht (über Seiten und Dokumente)"""
+    table = getattr(font, "_glyph_table", None)
+    if table is None:
+        table = font._glyph_table = GlyphTable(font)
+    return table
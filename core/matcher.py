@@ -0,0 +1,98 @@
+# core/matcher.py
+"""
+Vorkompilierte Keyword-Matcher für die Zeilenklassifikation
+Keyword-Listen werden einmal in einen Trie und daraus in eine einzige
+Regex-Alternation übersetzt. An jeder Textposition wird damit höchstens ein
+Zweig pro Buchstabe geprüft, statt jedes Keyword einzeln zu suchen.
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Baut eine Regex-Alternation mit gemeinsamen Präfixen, z.B.
+    ["saldo", "seite", "summe"] -> "s(?:aldo|eite|umme)".
+    Längere Treffer haben Vorrang (gierig), wie bei leftmost-longest.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        alternation = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + alternation + ")?" if is_end else alternation
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Prüft mit einem einzigen Regex-Durchlauf, ob eines von vielen Keywords vorkommt.
+
+    Args:
+        keywords: Teilstrings, die irgendwo in der Zeile vorkommen dürfen
+        prefixes: Teilstrings, die nur am Zeilenanfang zählen
+        ignore_case: Groß-/Kleinschreibung ignorieren (Text wird per lower() verglichen;
+            schneller als re.IGNORECASE, das die Regex-Vorfilter abschaltet)
+    """
+
+    def __init__(self, keywords: Iterable[str], prefixes: Iterable[str] = (), ignore_case: bool = False):
+        normalize = str.lower if ignore_case else str
+        self.keywords = tuple(normalize(keyword) for keyword in keywords)
+        self.prefixes = tuple(normalize(prefix) for prefix in prefixes)
+        self.ignore_case = ignore_case
+        # Leere Keyword-Liste: Muster, das nie trifft
+        self.pattern = re.compile(trie_pattern(self.keywords) or "(?!)")
+        self._search = self.pattern.search
+
+    def search(self, text: str) -> bool:
+        if self.ignore_case:
+            text = text.lower()
+        if self.prefixes and text.startswith(self.prefixes):
+            return True
+        return self._search(text) is not None
+
+    __call__ = search
+
+    def find(self, text: str) -> Optional[str]:
+        """Erstes gefundenes Keyword bzw. Präfix (oder None)"""
+        if self.ignore_case:
+            text = text.lower()
+        for prefix in self.prefixes:
+            if text.startswith(prefix):
+                return prefix
+        match = self._search(text)
+        return match.group(0) if match else None
+
+
+class Replacer:
+    """
+    Ersetzt die Schlüssel einer Tabelle nacheinander in Tabellenreihenfolge,
+    wie eine Folge von str.replace-Aufrufen (auch bei überlappenden
+    Schlüsseln, z.B. "vonvon" vor "einzugvon").
+
+    Eine vorkompilierte Suche über alle Schlüssel prüft zuerst, ob überhaupt
+    etwas zu ersetzen ist; die meisten Zeilen verlassen die Methode dort.
+    """
+
+    def __init__(self, replacements: Dict[str, str]):
+        self.replacements = dict(replacements)
+        self.pattern = re.compile(trie_pattern(self.replacements) or "(?!)")
+
+    def __call__(self, text: str) -> str:
+        # Kein Schlüssel im Text: dann ersetzt auch keiner der str.replace-Schritte etwas
+        if self.pattern.search(text) is None:
+            return text
+        for old, new in self.replacements.items():
+            text = text.replace(old, new)
+        return text
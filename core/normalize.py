@@ -0,0 +1,355 @@
+# core/normalize.py
+"""
+Normalisierung von Beträgen und Datumsangaben
+Parser sammeln nur die Roh-Tokens ("-1.234,56", "28.12.", "28.12.2024"); diese
+Stufe wandelt eine ganze Spalte auf einmal um: Beträge in exakte Cent
+(int64, keine Float-Rundung), Datumsangaben in Tagesordinale inklusive
+Jahreserkennung über Jahreswechsel (Dez -> Jan).
+
+Große Spalten werden mit NumPy vektorisiert verarbeitet; für kleine Spalten
+(eine Seite) ist der Aufruf-Overhead von NumPy größer als die Arbeit, dort
+läuft eine skalare Variante mit identischer Grammatik.
+"""
+import re
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Ab dieser Spaltenlänge lohnt sich NumPy
+VECTOR_MIN_SIZE = 64
+
+# Mehr Ziffern passen nicht sicher in int64-Cent
+MAX_DIGITS = 17
+
+# Ordinal von 1970-01-01 (datetime64-Epoche) im date.toordinal()-Format
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Häufigster Fall ("-1.234,56"), Teilmenge der vollständigen Grammatik
+_GERMAN_AMOUNT = re.compile(r'([+-]?)([0-9]{1,3}(?:\.[0-9]{3})*|[0-9]+),([0-9]{2})([+-]?)')
+
+_MINUS = (ord("-"), 0x2212)
+_PLUS = ord("+")
+_COMMA = ord(",")
+_DOT = ord(".")
+_SPACES = (0, ord(" "), 0xA0)
+
+
+# ---------------------------------------------------------------------------
+# Beträge
+# ---------------------------------------------------------------------------
+
+def parse_amounts(tokens: Sequence[Optional[str]], dot_decimal: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wandelt Betrags-Tokens in Cent um.
+
+    Grammatik: Vorzeichen (+, -, −) vorne oder hinten, Ziffern mit Punkt als
+    Tausendertrenner und Komma als Dezimaltrenner ("-1.234,56", "23,45-").
+
+    Args:
+        tokens: Roh-Tokens (None/leer -> ungültig)
+        dot_decimal: Ohne Komma gilt ein einzelner Punkt als Dezimalpunkt
+            ("-12.5" aus CSV/JSON). Für Tokens aus dem PDF aus, dort ist der
+            Punkt immer Tausendertrenner.
+
+    Returns:
+        (cents, valid): int64-Cent und Gültigkeitsmaske
+    """
+    if len(tokens) < VECTOR_MIN_SIZE:
+        cents = [amount_cents(token, dot_decimal) for token in tokens]
+        return (
+            np.array([c if c is not None else 0 for c in cents], dtype=np.int64),
+            np.array([c is not None for c in cents], dtype=bool),
+        )
+    return _parse_amounts_vectorized(tokens, dot_decimal)
+
+
+def amounts_to_floats(tokens: Sequence[Optional[str]], dot_decimal: bool = False) -> List[Optional[float]]:
+    """Beträge als Euro-Float (aus exakten Cent, also ohne Rundungsdrift); ungültig -> None"""
+    if len(tokens) < VECTOR_MIN_SIZE:
+        result = []
+        for token in tokens:
+            cents = amount_cents(token, dot_decimal)
+            result.append(cents / 100 if cents is not None else None)
+        return result
+    cents, valid = _parse_amounts_vectorized(tokens, dot_decimal)
+    euros = (cents / 100).tolist()
+    return [euro if ok else None for euro, ok in zip(euros, valid.tolist())]
+
+
+def amount_cents(token: Optional[str], dot_decimal: bool = False) -> Optional[int]:
+    """Ein einzelnes Token -> Cent (None wenn ungültig), gleiche Grammatik wie parse_amounts"""
+    if not isinstance(token, str):
+        return None
+    match = _GERMAN_AMOUNT.fullmatch(token)
+    if match:
+        leading, integer, fraction, trailing = match.groups()
+        if not (leading and trailing):
+            cents = int(integer.replace(".", "") + fraction)
+            return -cents if "-" in (leading, trailing) else cents
+    text = token.replace("−", "-").replace("\xa0", "").replace(" ", "")
+    if not text:
+        return None
+
+    negative = False
+    if text[0] in "+-":
+        negative = text[0] == "-"
+        text = text[1:]
+    elif text[-1] in "+-":
+        negative = text[-1] == "-"
+        text = text[:-1]
+    if not text or not text[0].isdigit() or not text[-1].isdigit():
+        return None
+
+    if text.count(",") > 1:
+        return None
+    if "," in text:
+        integer, _, fraction = text.partition(",")
+    elif dot_decimal and text.count(".") == 1:
+        integer, _, fraction = text.partition(".")
+    else:
+        integer, fraction = text, ""
+    integer = integer.replace(".", "")
+
+    if len(fraction) > 2 or not (integer + fraction).isascii():
+        return None
+    if not integer.isdigit() or (fraction and not fraction.isdigit()):
+        return None
+    if len(integer) + len(fraction) > MAX_DIGITS:
+        return None
+
+    cents = int(integer + fraction) * 10 ** (2 - len(fraction))
+    return -cents if negative else cents
+
+
+def _code_matrix(tokens: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Tokens als (n, Breite)-Matrix von Unicode-Codepoints (0 = Auffüllung).
+    None wird zu "None" und ist damit in beiden Grammatiken ungültig.
+    """
+    array = np.array(tokens, dtype=str)
+    if array.dtype.itemsize == 0:
+        return np.zeros((len(array), 1), dtype=np.uint32)
+    return array.view(np.uint32).reshape(len(array), array.dtype.itemsize // 4)
+
+
+def _parse_amounts_vectorized(tokens: Sequence[Optional[str]],
+                              dot_decimal: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liest alle Tokens Zeichen für Zeichen gleichzeitig (eine Spalte der
+    Codepoint-Matrix pro Schritt) und baut den Wert nach Horner auf.
+    """
+    codes = _code_matrix(tokens)
+    n = len(codes)
+    value = np.zeros(n, dtype=np.int64)
+    digits = np.zeros(n, dtype=np.int32)
+    valid = np.ones(n, dtype=bool)
+    negative = np.zeros(n, dtype=bool)
+    signs = np.zeros(n, dtype=np.int32)
+    commas = np.zeros(n, dtype=np.int32)
+    dots = np.zeros(n, dtype=np.int32)
+    after_comma = np.zeros(n, dtype=np.int32)  # Ziffern nach dem Komma
+    after_dot = np.zeros(n, dtype=np.int32)  # Ziffern nach dem letzten Punkt
+    open_separator = np.zeros(n, dtype=bool)  # Trenner ohne folgende Ziffer
+    trailing_sign = np.zeros(n, dtype=bool)
+
+    for column in np.ascontiguousarray(codes.T):
+        digit = (column >= 48) & (column <= 57)
+        minus = (column == _MINUS[0]) | (column == _MINUS[1])
+        sign = minus | (column == _PLUS)
+        comma = column == _COMMA
+        dot = column == _DOT
+        separator = comma | dot
+        space = (column == _SPACES[0]) | (column == _SPACES[1]) | (column == _SPACES[2])
+        valid &= digit | sign | separator | space
+
+        # Ziffern nach einem nachgestellten Vorzeichen sind ungültig
+        valid &= ~(digit & trailing_sign)
+        value = np.where(digit, value * 10 + (column.astype(np.int64) - 48), value)
+        digits += digit
+        after_comma += digit & (commas > 0)
+        after_dot = np.where(dot, 0, after_dot + digit)
+        open_separator = np.where(digit, False, open_separator | separator)
+
+        # Trenner nur zwischen Ziffern, Punkte nur vor dem Komma
+        valid &= ~(separator & ((digits == 0) | trailing_sign))
+        valid &= ~(dot & (commas > 0))
+        commas += comma
+        dots += dot
+
+        trailing_sign |= sign & (digits > 0)
+        negative |= minus
+        signs += sign
+
+    valid &= (digits > 0) & (digits <= MAX_DIGITS) & (signs <= 1) & (commas <= 1) & ~open_separator
+    dot_is_decimal = dot_decimal & (commas == 0) & (dots == 1)
+    decimals = np.where(commas > 0, after_comma, np.where(dot_is_decimal, after_dot, 0))
+    valid &= decimals <= 2
+
+    cents = value * np.array([100, 10, 1], dtype=np.int64)[np.clip(decimals, 0, 2)]
+    cents = np.where(negative, -cents, cents)
+    return np.where(valid, cents, 0), valid
+
+
+# ---------------------------------------------------------------------------
+# Datumsangaben
+# ---------------------------------------------------------------------------
+
+def split_dates(tokens: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Zerlegt Datums-Tokens in Tag, Monat, Jahr (int32; 0 = fehlt/ungültig).
+
+    Formate: "DD.MM.YYYY", "DD.MM.YY" (-> 20YY), "DD.MM." und "DD.MM" (ohne
+    Jahr) sowie "YYYY-MM-DD" (Export).
+    """
+    if len(tokens) < VECTOR_MIN_SIZE:
+        parts = [_date_parts(token) for token in tokens]
+        return tuple(np.array(column, dtype=np.int32).reshape(len(parts)) for column in zip(*parts)) \
+            if parts else tuple(np.zeros(0, dtype=np.int32) for _ in range(3))
+    return _split_dates_vectorized(tokens)
+
+
+def _date_parts(token: Optional[str]) -> Tuple[int, int, int]:
+    if not isinstance(token, str):
+        return 0, 0, 0
+    text = token
+    length = len(text)
+    if length == 10 and text[4] == "-" and text[7] == "-":
+        year, month, day = text[:4], text[5:7], text[8:]
+    elif length in (5, 6, 8, 10) and text[2] == "." and (length == 5 or text[5] == "."):
+        day, month, year = text[:2], text[3:5], text[6:]
+    else:
+        return 0, 0, 0
+    if not (day.isascii() and day.isdigit() and month.isascii() and month.isdigit()):
+        return 0, 0, 0
+    if year and not (year.isascii() and year.isdigit()):
+        return 0, 0, 0
+    year_value = int(year) if year else 0
+    if len(year) == 2:
+        year_value += 2000
+    day_value, month_value = int(day), int(month)
+    if not (1 <= month_value <= 12 and 1 <= day_value <= 31):
+        return 0, 0, 0
+    return day_value, month_value, year_value
+
+
+def _split_dates_vectorized(tokens: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    codes = _code_matrix(tokens)
+    n, width = codes.shape
+    if width < 11:
+        codes = np.pad(codes, ((0, 0), (0, 11 - width)))
+    length = np.count_nonzero(codes, axis=1)
+    # Spaltenweise zusammenhängend, jede Zeichenposition ist ein eigenes Array
+    codes = np.ascontiguousarray(codes[:, :10].T)
+    digit = codes.astype(np.int32) - 48
+    is_digit = (digit >= 0) & (digit <= 9)
+
+    def number(*columns):
+        value = digit[columns[0]].copy()
+        ok = is_digit[columns[0]].copy()
+        for column in columns[1:]:
+            value = value * 10 + digit[column]
+            ok &= is_digit[column]
+        return value, ok
+
+    dot2, dot5 = codes[2] == _DOT, codes[5] == _DOT
+    german = dot2 & ((length == 5) | (dot5 & ((length == 6) | (length == 8) | (length == 10))))
+    iso = (length == 10) & (codes[4] == ord("-")) & (codes[7] == ord("-"))
+
+    day_de, ok_day = number(0, 1)
+    month_de, ok_month = number(3, 4)
+    year4, ok_year4 = number(6, 7, 8, 9)
+    year2, ok_year2 = number(6, 7)
+    long_year, short_year = length == 10, length == 8
+    year_de = np.where(long_year, year4, np.where(short_year, year2 + 2000, 0))
+    ok_year = np.where(long_year, ok_year4, np.where(short_year, ok_year2, True))
+    ok_de = german & ok_day & ok_month & ok_year
+
+    year_iso, ok_year_iso = number(0, 1, 2, 3)
+    month_iso, ok_month_iso = number(5, 6)
+    day_iso, ok_day_iso = number(8, 9)
+    ok_iso = iso & ok_year_iso & ok_month_iso & ok_day_iso
+
+    day = np.where(ok_iso, day_iso, day_de)
+    month = np.where(ok_iso, month_iso, month_de)
+    year = np.where(ok_iso, year_iso, year_de)
+    ok = (ok_de | ok_iso) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    return tuple(np.where(ok, part, 0).astype(np.int32) for part in (day, month, year))
+
+
+def infer_years(months: np.ndarray, years: Optional[np.ndarray] = None,
+                last_month: Optional[int] = None, last_year: Optional[int] = None) -> np.ndarray:
+    """
+    Ergänzt fehlende Jahre (0) anhand der Buchungsreihenfolge: fällt der
+    Monat gegenüber der Vorbuchung (Dez -> Jan), beginnt ein neues Jahr.
+    Explizite Jahre setzen den Zähler neu; vor dem ersten expliziten Jahr
+    wird von `last_year`/`last_month` (Zustand der vorigen Seite) aus gezählt.
+
+    Returns:
+        int32-Jahre (0, wo sich kein Jahr ableiten lässt)
+    """
+    if len(months) < VECTOR_MIN_SIZE:
+        return np.array(_infer_years_scalar(months, years, last_month, last_year), dtype=np.int32)
+
+    months = np.asarray(months, dtype=np.int32)
+    n = len(months)
+    if years is None:
+        years = np.zeros(n, dtype=np.int32)
+    years = np.asarray(years, dtype=np.int32)
+
+    previous = np.empty(n, dtype=np.int32)
+    previous[0] = last_month if last_month is not None else months[0]
+    previous[1:] = months[:-1]
+    rollovers = np.cumsum(months < previous, dtype=np.int32)
+
+    known = years > 0
+    last_known = np.maximum.accumulate(np.where(known, np.arange(n), -1))
+    has_anchor = last_known >= 0
+    anchor = np.maximum(last_known, 0)
+    base_year = np.where(has_anchor, years[anchor], last_year or 0)
+    base_rollovers = np.where(has_anchor, rollovers[anchor], 0)
+    inferred = np.where(base_year > 0, base_year + rollovers - base_rollovers, 0)
+    return np.where(known, years, inferred).astype(np.int32)
+
+
+def _infer_years_scalar(months: Sequence[int], years: Optional[Sequence[int]],
+                        last_month: Optional[int], last_year: Optional[int]) -> List[int]:
+    """Skalare Variante von infer_years für kurze Spalten"""
+    result = []
+    previous = last_month
+    current = last_year or 0
+    for index, month in enumerate(months):
+        month = int(month)
+        explicit = int(years[index]) if years is not None else 0
+        if explicit > 0:
+            current = explicit
+        elif current > 0 and previous is not None and month < previous:
+            current += 1
+        result.append(current)
+        previous = month
+    return result
+
+
+def to_ordinals(day: np.ndarray, month: np.ndarray, year: np.ndarray) -> np.ndarray:
+    """Tag/Monat/Jahr -> int32-Tagesordinal (date.toordinal()); ungültige Daten (31.02.) -> 0"""
+    day, month, year = (np.asarray(a, dtype=np.int64) for a in (day, month, year))
+    ok = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    months_since_epoch = np.where(ok, (year - 1970) * 12 + month - 1, 0)
+    first_of_month = months_since_epoch.astype("datetime64[M]").astype("datetime64[D]")
+    days = first_of_month + np.where(ok, day - 1, 0).astype("timedelta64[D]")
+    # Tag über Monatsende hinaus (z.B. 31.02.) landet im Folgemonat
+    ok &= days.astype("datetime64[M]") == first_of_month.astype("datetime64[M]")
+    ordinals = days.astype(np.int64) + EPOCH_ORDINAL
+    return np.where(ok, ordinals, 0).astype(np.int32)
+
+
+def parse_dates(tokens: Sequence[Optional[str]], last_month: Optional[int] = None,
+                last_year: Optional[int] = None) -> np.ndarray:
+    """
+    Datums-Tokens -> int32-Tagesordinale; fehlende Jahre werden über
+    infer_years ergänzt (siehe dort). Ungültig -> 0.
+    """
+    day, month, year = split_dates(tokens)
+    if (year == 0).any():
+        year = infer_years(month, year, last_month, last_year)
+    return to_ordinals(day, month, year)
@@ -0,0 +1,119 @@
+# core/page_budget.py
+"""
+Arbeitsbudget pro Seite
+Eine einzelne kaputte oder bösartige Seite (tausende Vektor-Glyphen oder
+Pfade, eingebettete Scans mit Zeichensalat) kann einen Worker sonst bis zum
+Task-Timeout blockieren. Beim Interpretieren einer Seite werden Zeichen,
+übrige Objekte (Pfade, Bilder) und die Laufzeit gezählt; wird ein Limit
+überschritten, bricht die Seite mit PageBudgetExceeded ab.
+BaseParser.iter_pages überspringt sie dann mit einer Warnung, der Rest des
+Auszugs wird normal konvertiert.
+"""
+import threading
+import time
+from collections import Counter
+from typing import Dict, NamedTuple
+
+CHARS_LIMIT = "chars"
+OBJECTS_LIMIT = "objects"
+SECONDS_LIMIT = "seconds"
+
+_LABELS = {
+    CHARS_LIMIT: "Zeichen",
+    OBJECTS_LIMIT: "Objekte",
+    SECONDS_LIMIT: "Sekunden",
+}
+
+
+class PageBudget(NamedTuple):
+    """Limits pro Seite; 0 = unbegrenzt"""
+    max_chars: int = 0
+    max_objects: int = 0
+    max_seconds: float = 0
+
+    def meter(self, page_number: int) -> "BudgetMeter":
+        return BudgetMeter(self, page_number)
+
+
+class BudgetWarning(NamedTuple):
+    """Eine wegen Budget-Überschreitung übersprungene Seite (picklebar, für Worker-Prozesse)"""
+    page_number: int
+    limit: str
+    maximum: float
+
+    @property
+    def message(self) -> str:
+        return f"Seite {self.page_number} übersprungen: mehr als {self.maximum:g} {_LABELS[self.limit]}"
+
+
+class PageBudgetExceeded(Exception):
+    """Eine Seite hat ihr Arbeitsbudget überschritten"""
+
+    def __init__(self, warning: BudgetWarning):
+        super().__init__(warning.message)
+        self.warning = warning
+
+    def __reduce__(self):
+        return type(self), (self.warning,)
+
+
+class BudgetMeter:
+    """Zähler für eine Interpretation einer Seite"""
+
+    __slots__ = ("budget", "page_number", "chars", "objects", "_deadline")
+
+    def __init__(self, budget: PageBudget, page_number: int):
+        self.budget = budget
+        self.page_number = page_number
+        self.chars = 0
+        self.objects = 0
+        self._deadline = time.monotonic() + budget.max_seconds if budget.max_seconds else None
+
+    def char(self):
+        self.chars += 1
+        if self.budget.max_chars and self.chars > self.budget.max_chars:
+            self._exceeded(CHARS_LIMIT, self.budget.max_chars)
+        self._check_time()
+
+    def object(self):
+        self.objects += 1
+        if self.budget.max_objects and self.objects > self.budget.max_objects:
+            self._exceeded(OBJECTS_LIMIT, self.budget.max_objects)
+        self._check_time()
+
+    def _check_time(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            self._exceeded(SECONDS_LIMIT, self.budget.max_seconds)
+
+    def _exceeded(self, limit: str, maximum: float):
+        guard_counts.add(limit)
+        raise PageBudgetExceeded(BudgetWarning(self.page_number, limit, maximum))
+
+
+class GuardCounts:
+    """Ausgelöste Limits seit Prozessstart (z.B. im Celery-Worker), pro Limit"""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, limit: str, count: int = 1):
+        with self._lock:
+            self._counts[limit] += count
+
+    def merge(self, counts: Dict[str, int]):
+        """Übernimmt Zähler aus einem anderen Prozess (z.B. Worker von core.parallel)"""
+        with self._lock:
+            self._counts.update(counts)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {limit: self._counts[limit] for limit in _LABELS}
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+guard_counts = GuardCounts()
+
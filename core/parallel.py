@@ -0,0 +1,151 @@
+# core/parallel.py
+"""
+Seitenparalleles Parsen langer Kontoauszüge
+Die seitenlokale Arbeit (Layout + Zeilen) läuft in einem ProcessPoolExecutor
+über zusammenhängende Seitenbereiche; der seitenübergreifende Zustand wird
+danach im aufrufenden Prozess in Seitenreihenfolge zusammengesetzt. Das
+Ergebnis ist damit identisch zum seriellen Modus. Layout-Templates
+(z.B. die Sparkasse-Tabelle) lernt der Parser vorab im aufrufenden Prozess
+von der ersten passenden Seite; alle Worker starten mit diesen Templates.
+Von der Seiten-Triage übersprungene Seiten, Seiten über dem Budget und die
+ausgelösten Limits melden die Worker zurück (`document.skipped_pages`,
+`document.over_budget`, `guard_counts`).
+"""
+import logging
+import math
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from core.font_cache import FontCache
+from core.page_budget import BudgetWarning, PageBudget, guard_counts
+from core.pdf_extractor import ExtractedDocument, PDFSource, open_document
+
+logger = logging.getLogger(__name__)
+
+# Unterhalb dieser Seitenzahl lohnt sich der Prozess-Start nicht
+DEFAULT_MIN_PAGES = 8
+
+# Bereiche pro Worker, damit ungleich teure Seiten sich ausgleichen
+CHUNKS_PER_WORKER = 2
+
+# Pro Worker-Prozess: jeder Bereich öffnet das PDF neu, die Fonts bleiben
+_worker_font_cache = FontCache()
+
+
+def parse_document(parser, source: PDFSource, workers: int = 1,
+                   min_pages: int = DEFAULT_MIN_PAGES) -> List[Dict[str, Any]]:
+    """
+    Parst ein PDF seriell oder seitenparallel.
+
+    Args:
+        parser: Parser-Instanz (muss extract_page/merge_pages unterstützen für parallel)
+        source: Pfad zum PDF oder bereits geöffnetes ExtractedDocument
+        workers: Anzahl Worker-Prozesse (<= 1 = seriell)
+        min_pages: Ab dieser Seitenzahl wird parallelisiert
+
+    Returns:
+        Liste von Transaktions-Dictionaries
+    """
+    return list(iter_document(parser, source, workers, min_pages))
+
+
+def iter_document(parser, source: PDFSource, workers: int = 1,
+                  min_pages: int = DEFAULT_MIN_PAGES) -> Iterator[Dict[str, Any]]:
+    """
+    Wie parse_document, liefert die Transaktionen aber als Stream in
+    Dokumentreihenfolge, sobald die jeweilige Seite verarbeitet ist.
+    """
+    if workers <= 1 or not parser.supports_page_parallel():
+        yield from parser.iter_transactions(source)
+        return
+
+    with open_document(source) as document:
+        page_count = len(document.pages)
+        if page_count < min_pages or not _can_fork_workers():
+            yield from parser.iter_transactions(document)
+            return
+
+        try:
+            fragments = _extract_pages_parallel(parser, document, page_count, workers)
+        except (OSError, AssertionError) as e:
+            logger.warning(f"Parallel parsing not available ({e}), falling back to serial")
+            yield from parser.iter_transactions(document)
+            return
+
+        yield from parser.merge_pages(fragments)
+
+
+def page_ranges(page_count: int, chunks: int) -> List[Tuple[int, int]]:
+    """Teilt Seiten in zusammenhängende, geordnete Bereiche [start, stop)"""
+    chunks = max(1, min(chunks, page_count))
+    size = math.ceil(page_count / chunks)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _extract_pages_parallel(parser, document: ExtractedDocument, page_count: int, workers: int) -> Iterator[Any]:
+    """
+    Verteilt die Seitenbereiche sofort auf den Pool (Startfehler fallen hier auf)
+    und liefert die Fragmente danach lazy in Seitenreihenfolge.
+    """
+    ranges = page_ranges(page_count, workers * CHUNKS_PER_WORKER)
+    # Templates wie im seriellen Modus von der ersten passenden Seite
+    parser.learn_templates(document)
+    templates = dict(document.templates)
+    logger.info(f"Parsing {page_count} pages in {len(ranges)} ranges with {workers} workers")
+
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    try:
+        futures = deque(
+            pool.submit(_extract_range, parser, str(document.path), start, stop, document.budget, templates)
+            for start, stop in ranges
+        )
+    except BaseException:
+        pool.shutdown(cancel_futures=True)
+        raise
+    skipped = document.skipped_pages.setdefault(parser.bank_name, set())
+    over_budget = document.over_budget.setdefault(parser.bank_name, {})
+    return _ordered_fragments(pool, futures, skipped, over_budget)
+
+
+def _ordered_fragments(pool: ProcessPoolExecutor, futures: Deque[Future], skipped: Set[int],
+                       over_budget: Dict[int, BudgetWarning]) -> Iterator[Any]:
+    # Ergebnisse in Seitenreihenfolge einsammeln, nicht in Fertigstellungsreihenfolge;
+    # abgeholte Bereiche werden sofort freigegeben
+    try:
+        while futures:
+            fragments, skipped_pages, warnings, guards = futures.popleft().result()
+            skipped.update(skipped_pages)
+            over_budget.update((warning.page_number, warning) for warning in warnings)
+            guard_counts.merge(guards)
+            yield from fragments
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _extract_range(parser, pdf_path: str, start: int, stop: int, budget: Optional[PageBudget] = None,
+                   templates: Optional[Dict[str, Any]] = None
+                   ) -> Tuple[List[Any], List[int], List[BudgetWarning], Dict[str, int]]:
+    """
+    Läuft im Worker-Prozess: öffnet das PDF und extrahiert einen Seitenbereich,
+    ausgehend von den Templates des aufrufenden Prozesses.
+    Liefert die Fragmente der akzeptierten Seiten, die übersprungenen
+    Seitennummern, die Warnungen zu Seiten über dem Budget und die dabei
+    ausgelösten Limits (guard_counts des Bereichs).
+    """
+    before = guard_counts.snapshot()
+    with ExtractedDocument(pdf_path, font_cache=_worker_font_cache, budget=budget) as document:
+        document.templates.update(templates or {})
+        fragments = [parser.extract_page(page) for page in parser.iter_pages(document, start, stop)]
+        over_budget = document.over_budget.get(parser.bank_name, {})
+        guards = {limit: count - before[limit] for limit, count in guard_counts.snapshot().items()}
+        return fragments, sorted(document.skipped_pages.get(parser.bank_name, ())), list(over_budget.values()), guards
+
+
+def _can_fork_workers() -> bool:
+    # Celery-Prefork-Worker sind Daemon-Prozesse und dürfen keine Kinder starten
+    if multiprocessing.current_process().daemon:
+        logger.warning("Running in a daemon process, parallel parsing disabled")
+        return False
+    return True
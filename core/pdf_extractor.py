@@ -0,0 +1,727 @@
+# core/pdf_extractor.py
+"""
+PDF-Extraktion
+Öffnet ein PDF genau einmal pro Job und stellt Zeichen, Wörter, Zeilen,
+Text und Tabellen jeder Seite lazy und gecacht für alle Parser bereit.
+
+Text und Zeilen gibt es über zwei Backends:
+- "pdfplumber": generische Layout-Analyse (alle Zeichen, Linien, Rechtecke
+  und Kurven werden zu Objekten aufbereitet), Standard
+- "chars": liest nur die Textzeichen (und senkrechte Tabellenlinien) über
+  den Interpreter von pdfminer, alle übrigen Pfade und Bilder werden
+  verworfen; Zeilen entstehen in einem einfachen Durchlauf über die
+  y-Position. Für Banken mit bekanntem, festem Layout (Parser wählen es
+  über `EXTRACTION_BACKEND`).
+
+Tabellen entstehen ohne Layout-Analyse aus `raw_chars` und `raw_rules`
+(senkrechte Linien) mit core.table_engine. Parser legen die Spaltengrenzen
+der ersten Tabelle als TableTemplate im Dokument ab; auf Folgeseiten prüft
+`ruled_bbox` nur, ob an diesen Grenzen wieder Linien liegen.
+`crop`, `find_table` und `table` (pdfplumber-Tabellen) nutzen nur noch
+Tests und Benchmarks als Vergleich.
+
+Mit einem PageBudget (siehe core.page_budget) werden Zeichen, Objekte und
+Laufzeit beim Interpretieren jeder Seite begrenzt, für beide Backends.
+"""
+import re
+from contextlib import contextmanager
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from core.font_cache import FontCache, SharedResourceManager, glyph_table
+from core.page_budget import BudgetMeter, BudgetWarning, PageBudget
+
+# Standardwerte von pdfplumber.Page.extract_text, damit `text()` und
+# `text(x_tolerance=3)` denselben Cache-Eintrag treffen
+DEFAULT_TEXT_SETTINGS = {"x_tolerance": 3, "y_tolerance": 3}
+
+PDFPLUMBER_BACKEND = "pdfplumber"
+CHARS_BACKEND = "chars"
+BACKENDS = (PDFPLUMBER_BACKEND, CHARS_BACKEND)
+
+# Ligaturen werden wie bei pdfplumber (expand_ligatures=True) aufgelöst
+LIGATURES = {
+    "ﬀ": "ff",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬆ": "st",
+    "ﬅ": "st",
+}
+
+
+# Encodings einfacher Fonts, deren Bytes im Content-Stream direkt dem Text entsprechen
+SIMPLE_FONT_ENCODINGS = {
+    "WinAnsiEncoding": "cp1252",
+    "MacRomanEncoding": "mac_roman",
+    "StandardEncoding": "ascii",
+}
+SIMPLE_FONT_TYPES = ("Type1", "MMType1", "TrueType")
+
+# Literal-Strings (bis zu einer Ebene geschachtelter Klammern) und Hex-Strings
+_STRING_PATTERN = re.compile(
+    rb"\(((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*)\)|(?<!<)<([0-9A-Fa-f\s]*)>(?!>)",
+    re.DOTALL,
+)
+_ESCAPE_PATTERN = re.compile(rb"\\([0-7]{1,3}|\r\n|[\s\S])")
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_INLINE_IMAGE = re.compile(rb"(?<![^\s])BI(?![^\s])")
+
+
+class RawChar(NamedTuple):
+    """Ein Textzeichen mit Position in pdfplumber-Koordinaten (top von oben gemessen)"""
+    text: str
+    x0: float
+    x1: float
+    top: float
+    bottom: float
+    upright: bool
+
+
+class RawRule(NamedTuple):
+    """Senkrechte Linie (Tabellenlinie oder Rechteckkante) in pdfplumber-Koordinaten"""
+    x: float
+    top: float
+    bottom: float
+
+
+BBox = Tuple[float, float, float, float]
+
+
+class TableTemplate(NamedTuple):
+    """
+    Gelernte Lage einer Transaktionstabelle: Bounding Box und Spaltengrenzen
+    (x, von links nach rechts) auf der Seite, auf der sie erkannt wurde
+    """
+    bbox: BBox
+    columns: Tuple[float, ...]
+    page_number: int
+
+
+class ExtractedPage:
+    """Eine PDF-Seite, deren Layout-Ergebnisse nur einmal berechnet werden"""
+
+    def __init__(self, page, page_number: int, templates: Optional[Dict[str, Any]] = None,
+                 parent: Optional["ExtractedPage"] = None, budget: Optional[PageBudget] = None):
+        self._page = page
+        self.page_number = page_number
+        # Layout-Templates des Dokuments (pro Parser), von allen Seiten geteilt
+        self.templates: Dict[str, Any] = templates if templates is not None else {}
+        self.budget = budget
+        self._parent = parent
+        self._words: Optional[List[Dict[str, Any]]] = None
+        self._raw_chars: Optional[List[RawChar]] = None
+        self._raw_rules: Optional[List[RawRule]] = None
+        self._search_text: Optional[str] = None
+        self._text_cache: Dict[tuple, str] = {}
+        self._lines_cache: Dict[tuple, List[str]] = {}
+        self._table_cache: Dict[tuple, Optional[List[List[Optional[str]]]]] = {}
+        self._found_tables: Dict[tuple, Any] = {}
+
+    @property
+    def page(self):
+        """Das zugrundeliegende pdfplumber-Page-Objekt"""
+        return self._page
+
+    @property
+    def chars(self) -> List[Dict[str, Any]]:
+        """Alle Zeichen der Seite (von pdfplumber intern gecacht)"""
+        self._layout()
+        return self._page.chars
+
+    @property
+    def words(self) -> List[Dict[str, Any]]:
+        """Wörter der Seite"""
+        if self._words is None:
+            self._layout()
+            self._words = self._page.extract_words()
+        return self._words
+
+    @property
+    def raw_chars(self) -> List[RawChar]:
+        """
+        Nur die Textzeichen der Seite (Backend "chars"). Wurde die Seite
+        bereits von pdfplumber layoutet (z.B. bei der Bank-Erkennung), werden
+        dessen Zeichen übernommen statt die Seite erneut zu interpretieren.
+        """
+        if self._raw_chars is None:
+            self._read_raw()
+        return self._raw_chars
+
+    @property
+    def raw_rules(self) -> List[RawRule]:
+        """Senkrechte Linien der Seite, im selben Durchlauf wie `raw_chars` gelesen"""
+        if self._raw_rules is None:
+            self._read_raw()
+        return self._raw_rules
+
+    def _read_raw(self):
+        if self._parent is not None:
+            bbox = self._page.bbox
+            self._raw_chars = _crop_chars(self._parent.raw_chars, bbox)
+            self._raw_rules = _crop_rules(self._parent.raw_rules, bbox)
+        elif hasattr(self._page, "_layout"):
+            self._raw_chars = [
+                RawChar(char["text"], char["x0"], char["x1"], char["top"], char["bottom"], char["upright"])
+                for char in self._page.chars
+            ]
+            self._raw_rules = [RawRule(edge["x0"], edge["top"], edge["bottom"]) for edge in self._page.vertical_edges]
+        else:
+            self._raw_chars, self._raw_rules = _interpret_page(self._page, self._meter())
+
+    def _layout(self):
+        """Layout von pdfplumber berechnen (mit Budget über einen zählenden Interpreter)"""
+        if self._parent is not None:
+            self._parent._layout()
+        elif not hasattr(self._page, "_layout"):
+            if self.budget is None:
+                self._page.layout
+            else:
+                self._page._layout = _analyze_layout(self._page, self._meter())
+
+    def _meter(self) -> Optional[BudgetMeter]:
+        return self.budget.meter(self.page_number) if self.budget is not None else None
+
+    def load(self, backend: str = PDFPLUMBER_BACKEND):
+        """
+        Liest die Seite für `backend` (Zeichen bzw. Layout) vorab ein, damit
+        Budget-Überschreitungen (PageBudgetExceeded) vor dem Parsen auffallen.
+        """
+        if backend == CHARS_BACKEND:
+            self.raw_chars
+        else:
+            self._layout()
+
+    def contains_words(self, words: Iterable[str]) -> bool:
+        """
+        Prüft ohne Layout-Analyse, ob alle `words` auf der Seite vorkommen
+        (Groß-/Kleinschreibung und Leerraum werden ignoriert).
+
+        Zuerst werden nur die Strings im Content-Stream gelesen. Nur wenn
+        deren Kodierung nicht sicher bekannt ist (eingebettete CID-Fonts,
+        eigene Encodings, Form-XObjects), werden die Textzeichen interpretiert;
+        die landen in `raw_chars` und werden vom Parser wiederverwendet.
+        """
+        if self._search_text is None:
+            text = _content_text(self._page)
+            if text is None:
+                text = "".join(LIGATURES.get(char.text, char.text) for char in self.raw_chars)
+            self._search_text = _squeeze(text)
+        return all(_squeeze(word) in self._search_text for word in words)
+
+    def text(self, backend: str = PDFPLUMBER_BACKEND, **settings) -> str:
+        """Text der Seite, gecacht pro Backend und Extraktions-Einstellung"""
+        settings = {**DEFAULT_TEXT_SETTINGS, **settings}
+        key = (backend,) + _settings_key(settings)
+        if key not in self._text_cache:
+            if backend == PDFPLUMBER_BACKEND:
+                self._layout()
+                self._text_cache[key] = self._page.extract_text(**settings) or ""
+            else:
+                self._text_cache[key] = "\n".join(self.lines(backend, **settings))
+        return self._text_cache[key]
+
+    def lines(self, backend: str = PDFPLUMBER_BACKEND, **settings) -> List[str]:
+        """Textzeilen der Seite (ungefiltert, wie `text().split('\\n')`)"""
+        settings = {**DEFAULT_TEXT_SETTINGS, **settings}
+        key = (backend,) + _settings_key(settings)
+        if key not in self._lines_cache:
+            if backend == PDFPLUMBER_BACKEND:
+                text = self.text(backend, **settings)
+                self._lines_cache[key] = text.split("\n") if text else []
+            elif backend == CHARS_BACKEND:
+                unsupported = set(settings) - set(DEFAULT_TEXT_SETTINGS)
+                if unsupported:
+                    raise ValueError(
+                        f"Einstellung(en) {', '.join(sorted(unsupported))} vom Backend '{backend}' nicht unterstützt"
+                    )
+                self._lines_cache[key] = chars_to_lines(self.raw_chars, **settings)
+            else:
+                raise ValueError(f"Unbekanntes Extraktions-Backend '{backend}'")
+        return self._lines_cache[key]
+
+    def find_table(self, table_settings: Dict[str, Any]):
+        """Größte Tabelle der Seite als pdfplumber-Table (mit Zellen), gecacht pro Einstellung (Tests/Benchmarks)"""
+        key = _settings_key(table_settings)
+        if key not in self._found_tables:
+            self._layout()
+            self._found_tables[key] = self._page.find_table(table_settings)
+        return self._found_tables[key]
+
+    def table(self, table_settings: Dict[str, Any]) -> Optional[List[List[Optional[str]]]]:
+        """Größte Tabelle der Seite, gecacht pro Tabellen-Einstellung (Referenz für Tests/Benchmarks)"""
+        key = _settings_key(table_settings)
+        if key not in self._table_cache:
+            from pdfplumber.table import TableSettings
+            table = self.find_table(table_settings)
+            text_settings = TableSettings.resolve(table_settings).text_settings or {}
+            self._table_cache[key] = table.extract(**text_settings) if table is not None else None
+        return self._table_cache[key]
+
+    def release(self):
+        """
+        Gibt alle Layout-Ergebnisse der Seite frei: die eigenen Caches, die
+        von pdfplumber (Objekte, Layout, Textmap) und den dekodierten
+        Content-Stream. Ein späterer Zugriff berechnet sie neu; Templates
+        des Dokuments bleiben erhalten.
+        """
+        self._words = None
+        self._raw_chars = None
+        self._raw_rules = None
+        self._search_text = None
+        self._text_cache.clear()
+        self._lines_cache.clear()
+        self._table_cache.clear()
+        self._found_tables.clear()
+        if self._parent is None:
+            self._page.close()
+            if hasattr(self._page, "get_textmap"):
+                self._page.get_textmap.cache_clear()
+            _release_contents(self._page.page_obj)
+
+    def crop(self, bbox: BBox) -> "ExtractedPage":
+        """
+        Ausschnitt der Seite (wie pdfplumber.Page.crop) mit eigenem Cache.
+        Das Layout bzw. die Zeichen der ganzen Seite werden dabei nur einmal
+        berechnet und für den Ausschnitt gefiltert (Tests/Benchmarks).
+        """
+        return ExtractedPage(self._page.crop(bbox), self.page_number, self.templates, parent=self, budget=self.budget)
+
+    def ruled_bbox(self, columns: Sequence[float], tolerance: float = 3) -> Optional[BBox]:
+        """
+        Bereich, den senkrechte Linien an allen Spaltengrenzen `columns`
+        aufspannen (Linien oder Rechteckkanten, Abweichung bis `tolerance`).
+        None, wenn an einer Grenze keine Linie liegt, die Tabelle also anders
+        aussieht als erwartet.
+        """
+        rules = self.raw_rules
+        tops, bottoms = [], []
+        for x in columns:
+            matching = [rule for rule in rules if abs(rule.x - x) <= tolerance]
+            if not matching:
+                return None
+            tops.extend(rule.top for rule in matching)
+            bottoms.extend(rule.bottom for rule in matching)
+        return (columns[0], min(tops), columns[-1], max(bottoms))
+
+
+class ExtractedDocument:
+    """
+    Ein geöffnetes PDF, das zwischen Auto-Detection und Parser geteilt wird.
+
+    Das PDF wird beim ersten Zugriff geöffnet; jede Seite wird höchstens
+    einmal layoutet, egal wie viele Parser sie lesen. Alle Seiten teilen sich
+    einen Resource-Manager, der Fonts nach Inhalt cacht; mit `font_cache`
+    werden Fonts zusätzlich über Dokumente hinweg wiederverwendet. Mit
+    `budget` wird die Arbeit pro Seite begrenzt (siehe core.page_budget).
+    """
+
+    def __init__(self, pdf_path: Union[str, Path], font_cache: Optional[FontCache] = None,
+                 budget: Optional[PageBudget] = None):
+        self.path = Path(pdf_path)
+        self.font_cache = font_cache
+        self.budget = budget
+        self._pdf = None
+        self._pages: Optional[List[ExtractedPage]] = None
+        # Von Parsern gelernte Layout-Templates (z.B. TableTemplate), pro Parser-Name
+        self.templates: Dict[str, Any] = {}
+        # Seitennummern, die ein Parser per Triage übersprungen hat, pro Parser-Name
+        self.skipped_pages: Dict[str, Set[int]] = {}
+        # Seiten über dem Budget (Seitennummer -> Warnung), pro Parser-Name
+        self.over_budget: Dict[str, Dict[int, BudgetWarning]] = {}
+
+    def _open(self):
+        if self._pdf is None:
+            import pdfplumber
+            self._pdf = pdfplumber.open(str(self.path))
+            # pdfplumber liest Seiten über pdf.rsrcmgr, das Backend "chars" ebenso
+            self._pdf.rsrcmgr = SharedResourceManager(self.font_cache)
+        return self._pdf
+
+    @property
+    def pages(self) -> List[ExtractedPage]:
+        if self._pages is None:
+            # Wie pdfplumber.PDF.pages, aber ohne die Content-Streams aller
+            # Seiten im Speicher zu halten: geladen wird erst beim Lesen der Seite
+            from pdfminer.pdfpage import PDFPage
+            from pdfplumber.page import Page
+
+            pdf = self._open()
+            pages: List[ExtractedPage] = []
+            doctop = 0
+            for page_number, page_obj in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+                page = Page(pdf, page_obj, page_number=page_number, initial_doctop=doctop)
+                doctop += page.height
+                _release_contents(page_obj)
+                pages.append(ExtractedPage(page, page_number, self.templates, budget=self.budget))
+            self._pages = pages
+        return self._pages
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __iter__(self) -> Iterator[ExtractedPage]:
+        return iter(self.pages)
+
+    def close(self):
+        if self._pdf is not None:
+            # Nur die Datei schließen: pdfplumber.PDF.close() würde dafür erst
+            # alle Seiten neu aufbauen
+            if not self._pdf.stream_is_external:
+                self._pdf.stream.close()
+            self._pdf = None
+            self._pages = None
+
+    def __enter__(self) -> "ExtractedDocument":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+PDFSource = Union[str, Path, ExtractedDocument]
+
+
+@contextmanager
+def open_document(source: PDFSource) -> Iterator[ExtractedDocument]:
+    """
+    Liefert ein ExtractedDocument für einen Pfad oder ein bereits geöffnetes Dokument.
+
+    Nur selbst geöffnete Dokumente werden am Ende wieder geschlossen, damit
+    ein geteiltes Dokument für den nächsten Parser erhalten bleibt.
+    """
+    if isinstance(source, ExtractedDocument):
+        yield source
+        return
+
+    document = ExtractedDocument(source)
+    try:
+        yield document
+    finally:
+        document.close()
+
+
+def count_pages(path: Union[str, Path]) -> int:
+    """
+    Seitenzahl aus dem Seitenbaum (/Pages /Count), ohne Seiten oder
+    Content-Streams zu laden (z.B. zur Prüfung beim Upload).
+
+    Raises:
+        ValueError: Datei ist kein lesbares PDF
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    try:
+        with open(path, "rb") as fp:
+            document = PDFDocument(PDFParser(fp))
+            return int(resolve1(resolve1(document.catalog["Pages"])["Count"]))
+    except Exception as e:
+        raise ValueError(f"Keine lesbare PDF-Datei: {e}") from e
+
+
+def _interpret_page(page, meter: Optional[BudgetMeter] = None) -> Tuple[List[RawChar], List[RawRule]]:
+    """
+    Interpretiert den Content-Stream einer Seite mit pdfminer und sammelt nur
+    die Textzeichen und senkrechten Geraden. Alle übrigen Pfade und Bilder
+    werden verworfen, und es gibt keine Layout-Analyse oder
+    Objekt-Aufbereitung wie bei pdfplumber. Gezählt wird trotzdem jedes
+    Objekt (`meter`).
+    """
+    from pdfminer.converter import PDFLayoutAnalyzer
+    from pdfminer.layout import LTChar
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+    from pdfminer.pdfinterp import PDFPageInterpreter
+    from pdfminer.utils import apply_matrix_pt
+
+    height = page.height
+    chars: List[RawChar] = []
+    rules: List[RawRule] = []
+
+    class TextCharDevice(PDFLayoutAnalyzer):
+        def paint_path(self, gstate, stroke, fill, evenodd, path):
+            if meter is not None:
+                meter.object()
+            # Rechtecke ("re") kommen von pdfminer bereits als m/l/h-Folge an
+            start = last = None
+            for operation in path:
+                if operation[0] == "h":
+                    point = start
+                elif len(operation) >= 3:
+                    point = apply_matrix_pt(self.ctm, operation[-2:])
+                else:
+                    continue
+                if operation[0] == "m":
+                    start = point
+                elif operation[0] in ("l", "h") and last is not None and point[0] == last[0] and point[1] != last[1]:
+                    rules.append(RawRule(point[0], height - max(point[1], last[1]), height - min(point[1], last[1])))
+                last = point
+
+        def render_image(self, name, stream):
+            if meter is not None:
+                meter.object()
+
+        def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+            if meter is not None:
+                meter.char()
+            if font.is_vertical():
+                return self.render_vertical_char(matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate)
+            # Bounding Box wie LTChar (identisch zu pdfplumber), Text und Breite aus dem Glyphen-Cache
+            glyphs = glyph_table(font)
+            text, width = glyphs.get(cid) or glyphs.glyph(font, cid)
+            adv = width * fontsize * scaling
+            a, b, c, d, e, f = matrix
+            lower = glyphs.descent * fontsize + rise
+            upper = lower + fontsize
+            x0, y0 = c * lower + e, d * lower + f
+            x1, y1 = a * adv + c * upper + e, b * adv + d * upper + f
+            if x1 < x0:
+                x0, x1 = x1, x0
+            if y1 < y0:
+                y0, y1 = y1, y0
+            chars.append(RawChar(text, x0, x1, height - y1, height - y0, 0 < a * d * scaling and b * c <= 0))
+            return adv
+
+        def render_vertical_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+            try:
+                text = font.to_unichr(cid)
+            except PDFUnicodeNotDefined:
+                text = self.handle_undefined_char(font, cid)
+            # LTChar nur für die Bounding Box (identisch zu pdfplumber), nicht im Layout-Baum
+            char = LTChar(matrix, font, fontsize, scaling, rise, text,
+                          font.char_width(cid), font.char_disp(cid), ncs, graphicstate)
+            chars.append(RawChar(text, char.x0, char.x1, height - char.y1, height - char.y0, char.upright))
+            return char.adv
+
+    rsrcmgr = page.pdf.rsrcmgr
+    device = TextCharDevice(rsrcmgr, pageno=page.page_number, laparams=None)
+    PDFPageInterpreter(rsrcmgr, device).process_page(page.page_obj)
+    return chars, rules
+
+
+def _analyze_layout(page, meter: BudgetMeter):
+    """Wie pdfplumber.Page.layout, zählt aber jedes Zeichen und Objekt (`meter`)"""
+    from pdfminer.pdfinterp import PDFPageInterpreter
+    from pdfplumber.page import PDFPageAggregatorWithMarkedContent
+
+    class MeteredAggregator(PDFPageAggregatorWithMarkedContent):
+        def render_char(self, *args, **kwargs):
+            meter.char()
+            return super().render_char(*args, **kwargs)
+
+        def paint_path(self, *args, **kwargs):
+            meter.object()
+            return super().paint_path(*args, **kwargs)
+
+        def render_image(self, *args, **kwargs):
+            meter.object()
+            return super().render_image(*args, **kwargs)
+
+    device = MeteredAggregator(page.pdf.rsrcmgr, pageno=page.page_number, laparams=page.pdf.laparams)
+    PDFPageInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+    return device.get_result()
+
+
+def _content_text(page) -> Optional[str]:
+    """
+    Text aller Strings im Content-Stream der Seite, in Stream-Reihenfolge und
+    ohne Interpretation (keine Positionen, keine Glyphen-Metriken).
+
+    Returns:
+        Den Text oder None, wenn die Bytes nicht sicher dem Text entsprechen:
+        nicht-einfache Fonts oder unbekanntes Encoding, Form-XObjects
+        (Text außerhalb des Seiten-Streams) oder Inline-Bilder
+    """
+    from pdfminer.pdftypes import resolve1, stream_value
+    from pdfminer.psparser import PSLiteral
+
+    def name(value) -> Optional[str]:
+        value = resolve1(value)
+        return value.name if isinstance(value, PSLiteral) else None
+
+    page_obj = page.page_obj
+    resources = resolve1(page_obj.resources) or {}
+    for xobject in (resolve1(resources.get("XObject")) or {}).values():
+        if name(resolve1(xobject).get("Subtype")) == "Form":
+            return None
+
+    codecs = set()
+    for font in (resolve1(resources.get("Font")) or {}).values():
+        font = resolve1(font)
+        encoding = name(font.get("Encoding"))
+        if name(font.get("Subtype")) not in SIMPLE_FONT_TYPES or encoding not in SIMPLE_FONT_ENCODINGS:
+            return None
+        codecs.add(SIMPLE_FONT_ENCODINGS[encoding])
+    if len(codecs) > 1:
+        return None
+    codec = codecs.pop() if codecs else "ascii"
+
+    data = b"\n".join(stream_value(stream).get_data() for stream in page_obj.contents)
+    if _INLINE_IMAGE.search(data):
+        return None
+    parts = []
+    for literal, hexadecimal in _STRING_PATTERN.findall(data):
+        if hexadecimal:
+            digits = b"".join(hexadecimal.split()).decode("ascii")
+            parts.append(bytes.fromhex(digits + "0" * (len(digits) % 2)))
+        else:
+            parts.append(_ESCAPE_PATTERN.sub(_unescape, literal))
+    return b"".join(parts).decode(codec, errors="replace")
+
+
+def _release_contents(page_obj):
+    """
+    Ersetzt die Content-Streams der Seite durch Objekt-Referenzen und nimmt
+    sie aus dem Objekt-Cache von pdfminer; bei Bedarf werden sie neu aus der
+    Datei geladen (die nur über ein Datei-Handle gelesen wird).
+    """
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+    cached_objects = getattr(page_obj.doc, "_cached_objs", None)
+    contents = []
+    for stream in page_obj.contents:
+        # Mehrere Streams stehen als Referenzen im Array, ein einzelner aufgelöst
+        if isinstance(stream, PDFStream) and stream.objid is not None:
+            stream = PDFObjRef(page_obj.doc, stream.objid, stream.genno)
+        if isinstance(stream, PDFObjRef) and cached_objects is not None:
+            cached_objects.pop(stream.objid, None)
+        contents.append(stream)
+    page_obj.contents = contents
+
+
+def _unescape(match) -> bytes:
+    escaped = match.group(1)
+    if escaped[:1].isdigit():
+        return bytes([int(escaped, 8) & 0xFF])
+    if escaped in (b"\n", b"\r", b"\r\n"):
+        return b""  # Zeilenfortsetzung
+    return _ESCAPES.get(escaped, escaped)
+
+
+def _squeeze(text: str) -> str:
+    """Kleinbuchstaben ohne Leerraum, für tolerante Textsuche"""
+    return "".join(text.split()).lower()
+
+
+def _crop_chars(chars: Iterable[RawChar], bbox: BBox) -> List[RawChar]:
+    """Zeichen, die `bbox` berühren, auf `bbox` zugeschnitten (wie pdfplumber crop_to_bbox)"""
+    x0, top, x1, bottom = bbox
+    cropped = []
+    for char in chars:
+        left, right = max(char.x0, x0), min(char.x1, x1)
+        upper, lower = max(char.top, top), min(char.bottom, bottom)
+        width, height = right - left, lower - upper
+        if width >= 0 and height >= 0 and width + height > 0:
+            cropped.append(char._replace(x0=left, x1=right, top=upper, bottom=lower))
+    return cropped
+
+
+def _crop_rules(rules: Iterable[RawRule], bbox: BBox) -> List[RawRule]:
+    """Linien, die `bbox` berühren, auf `bbox` zugeschnitten"""
+    x0, top, x1, bottom = bbox
+    return [
+        rule._replace(top=max(rule.top, top), bottom=min(rule.bottom, bottom))
+        for rule in rules
+        if x0 <= rule.x <= x1 and rule.top <= bottom and rule.bottom >= top
+    ]
+
+
+def chars_to_lines(chars: Iterable[RawChar], x_tolerance: float = 3, y_tolerance: float = 3) -> List[str]:
+    """
+    Gruppiert Zeichen zu Textzeilen (wie pdfplumber.extract_text ohne layout):
+    Zeichen gleicher Ausrichtung werden nach y-Position in Zeilen eingeteilt,
+    innerhalb der Zeile nach x sortiert und an Leerzeichen bzw. Lücken größer
+    `x_tolerance` in Wörter getrennt. Aufeinanderfolgende Wörter auf gleicher
+    Höhe bilden eine Textzeile und werden mit einem Leerzeichen verbunden.
+    """
+    words = []  # (top, text)
+    for upright, group in groupby(chars, key=lambda char: char.upright):
+        group = list(group)
+        if upright:
+            lines = _cluster(group, lambda char: char.top, y_tolerance)
+            for line in lines:
+                line.sort(key=lambda char: char.x0)
+                words.extend(_split_words(line, x_tolerance, y_tolerance, upright=True))
+        else:
+            # Gedrehter Text (z.B. am Seitenrand): Spalten nach x, Zeichen von oben nach unten
+            lines = _cluster(group, lambda char: char.x0, x_tolerance)
+            for line in lines:
+                line.sort(key=lambda char: (char.top, char.bottom))
+                words.extend(_split_words(line, x_tolerance, y_tolerance, upright=False))
+
+    if not words:
+        return []
+    line_of = _cluster_ids([top for top, _ in words], y_tolerance)
+    return [
+        " ".join(text for _, text in line)
+        for _, line in groupby(words, key=lambda word: line_of[word[0]])
+    ]
+
+
+def _split_words(line: List[RawChar], x_tolerance: float, y_tolerance: float, upright: bool) -> List[tuple]:
+    """Trennt eine sortierte Zeile in Wörter; liefert (top, text) pro Wort"""
+    words = []
+    current: List[RawChar] = []
+    for char in line:
+        if char.text.isspace():
+            if current:
+                words.append(current)
+            current = []
+            continue
+        if current:
+            prev = current[-1]
+            if upright:
+                new_word = (char.x0 < prev.x0 or char.x0 > prev.x1 + x_tolerance
+                            or char.top > prev.top + y_tolerance)
+            else:
+                new_word = (char.top < prev.top or char.top > prev.bottom + y_tolerance
+                            or char.x0 > prev.x0 + x_tolerance)
+            if new_word:
+                words.append(current)
+                current = []
+        current.append(char)
+    if current:
+        words.append(current)
+
+    return [
+        (min(char.top for char in word), "".join(LIGATURES.get(char.text, char.text) for char in word))
+        for word in words
+    ]
+
+
+def _cluster(items: List[Any], key, tolerance: float) -> List[List[Any]]:
+    """
+    Einteilung nach einem Wert mit Toleranz (wie pdfplumber.cluster_objects):
+    sortierte Werte gehören zusammen, solange der Abstand zum Vorgänger
+    höchstens `tolerance` ist. Innerhalb einer Gruppe bleibt die Reihenfolge erhalten.
+    """
+    if not items:
+        return []
+    cluster_of = _cluster_ids(map(key, items), tolerance)
+    clusters: List[List[Any]] = [[] for _ in range(max(cluster_of.values()) + 1)]
+    for item in items:
+        clusters[cluster_of[key(item)]].append(item)
+    return clusters
+
+
+def _cluster_ids(values: Iterable[float], tolerance: float) -> Dict[float, int]:
+    """Wert -> Gruppennummer; sortierte Werte mit Abstand <= tolerance zum Vorgänger teilen eine Gruppe"""
+    cluster_of: Dict[float, int] = {}
+    index = 0
+    last = None
+    for value in sorted(set(values)):
+        if last is not None and value > last + tolerance:
+            index += 1
+        cluster_of[value] = index
+        last = value
+    return cluster_of
+
+
+def _settings_key(settings: Dict[str, Any]) -> tuple:
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in settings.items()
+    ))
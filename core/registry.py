@@ -0,0 +1,172 @@
+# core/registry.py
+"""
+Parser-Registry
+Parser werden über Name, Aliase, Fähigkeiten und Erkennungs-Hook registriert
+und erst beim ersten Zugriff importiert. Externe Bank-Parser können über den
+Entry-Point "kontoauszug2excel.parsers" eingebunden werden.
+"""
+import logging
+from dataclasses import dataclass, field
+from importlib import import_module
+from importlib.metadata import entry_points
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "kontoauszug2excel.parsers"
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """Was ein Parser kann (ohne das Parser-Modul zu importieren)"""
+    # Nimmt an der Auto-Detection teil
+    detectable: bool = True
+    # Spalten, die der Parser pro Transaktion liefert
+    columns: Tuple[str, ...] = ()
+    description: str = ""
+
+
+@dataclass
+class ParserSpec:
+    """
+    Registrierungseintrag eines Parsers.
+
+    `target` und `detector` sind Import-Pfade im Format "modul:Attribut";
+    ohne eigenen `detector` wird `<target>.detect` verwendet.
+    """
+    name: str
+    target: str
+    aliases: Tuple[str, ...] = ()
+    capabilities: Capabilities = field(default_factory=Capabilities)
+    detector: Optional[str] = None
+    _parser_cls: Optional[type] = field(default=None, init=False, repr=False)
+    _detect_fn: Optional[Callable] = field(default=None, init=False, repr=False)
+
+    @property
+    def parser_class(self) -> type:
+        if self._parser_cls is None:
+            self._parser_cls = _resolve(self.target)
+        return self._parser_cls
+
+    @property
+    def detect(self) -> Callable:
+        """Erkennungs-Hook: nimmt die erste Seite, liefert eine Detection"""
+        if self._detect_fn is None:
+            if self.detector:
+                self._detect_fn = _resolve(self.detector)
+            else:
+                self._detect_fn = self.parser_class.detect
+        return self._detect_fn
+
+    def create(self):
+        return self.parser_class()
+
+
+class ParserRegistry:
+    """Ordnet Bank-Namen und Aliase den registrierten Parsern zu"""
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self._specs: Dict[str, ParserSpec] = {}
+        self._aliases: Dict[str, str] = {}
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = Lock()
+
+    def register(self, spec: ParserSpec) -> ParserSpec:
+        name = _normalize(spec.name)
+        if name in self._specs:
+            raise ValueError(f"Parser '{spec.name}' ist bereits registriert")
+        self._specs[name] = spec
+        for alias in (spec.name, *spec.aliases):
+            self._aliases[_normalize(alias)] = name
+        return spec
+
+    def get(self, bank_name: str) -> ParserSpec:
+        self._load_entry_points()
+        name = self._aliases.get(_normalize(bank_name))
+        if name is None:
+            raise ValueError(f"Bank '{bank_name}' wird nicht unterstützt")
+        return self._specs[name]
+
+    def specs(self) -> List[ParserSpec]:
+        """Alle Parser in Registrierungsreihenfolge"""
+        self._load_entry_points()
+        return list(self._specs.values())
+
+    def detectable(self) -> List[ParserSpec]:
+        return [spec for spec in self.specs() if spec.capabilities.detectable]
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            for entry_point in entry_points(group=self._entry_point_group):
+                try:
+                    self.register(_spec_from_entry_point(entry_point))
+                except Exception as e:
+                    logger.warning(f"Parser entry point '{entry_point.name}' ignoriert: {e}")
+            self._entry_points_loaded = True
+
+
+def _spec_from_entry_point(entry_point) -> ParserSpec:
+    """
+    Ein Entry-Point zeigt entweder auf eine ParserSpec (bleibt lazy) oder
+    direkt auf eine Parser-Klasse.
+    """
+    loaded = entry_point.load()
+    if isinstance(loaded, ParserSpec):
+        return loaded
+    if isinstance(loaded, type):
+        spec = ParserSpec(
+            name=getattr(loaded, "bank_name", "") or entry_point.name,
+            target=f"{loaded.__module__}:{loaded.__qualname__}",
+            aliases=tuple(getattr(loaded, "aliases", ())),
+        )
+        spec._parser_cls = loaded
+        return spec
+    raise TypeError(f"Erwartet ParserSpec oder Parser-Klasse, erhalten: {type(loaded).__name__}")
+
+
+def _resolve(path: str):
+    module_name, _, attribute = path.partition(":")
+    obj = import_module(module_name)
+    for part in attribute.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _normalize(name: str) -> str:
+    return name.strip().lower()
+
+
+registry = ParserRegistry()
+
+registry.register(ParserSpec(
+    name="sparkasse",
+    target="parsers.sparkasse_parser:SparkasseParser",
+    capabilities=Capabilities(
+        columns=("Datum", "Erläuterung", "Betrag EUR", "Bemerkung"),
+        description="Sparkasse (Tabellen-Extraktion)",
+    ),
+))
+registry.register(ParserSpec(
+    name="ing",
+    target="parsers.ing_parser:INGParser",
+    aliases=("ing-diba", "ing diba"),
+    capabilities=Capabilities(
+        columns=("Datum", "Valuta", "Empfänger", "Transaktion", "Betrag EUR", "Verwendungszweck"),
+        description="ING (Textzeilen)",
+    ),
+))
+registry.register(ParserSpec(
+    name="deutsche_bank",
+    target="parsers.db_parser:DBParser",
+    aliases=("db", "deutschebank", "deutsche bank"),
+    capabilities=Capabilities(
+        columns=("Buchungstag", "Valuta", "Vorgang", "Betrag EUR"),
+        description="Deutsche Bank (Textzeilen)",
+    ),
+))
@@ -0,0 +1,220 @@
+# core/table_engine.py
+"""
+Tabellen aus Zeichen-Koordinaten
+Statt Text zu extrahieren und danach wieder aufzuteilen, werden Zeichen
+bzw. Wörter einer Seite als NumPy-Arrays (x0, x1, top, bottom) direkt
+Zeilen und Spalten zugeordnet:
+
+- Zeilen: Cluster über die y-Position (sortierte `top`-Werte, neue Zeile
+  wo `np.diff` die Toleranz überschreitet), wie pdfplumber.extract_text
+- Spalten: `np.searchsorted` der Wortmitte gegen die Spaltengrenzen
+- Wörter: Trennung an Leerzeichen oder Lücken größer `x_tolerance`
+
+Die Spaltengrenzen kommen von den senkrechten Tabellenlinien der Seite
+(`find_ruled_table`) oder aus einem gelernten Template.
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.pdf_extractor import LIGATURES, BBox, RawChar, RawRule
+
+DEFAULT_X_TOLERANCE = 3
+DEFAULT_Y_TOLERANCE = 3
+
+
+class Boxes(NamedTuple):
+    """Zeichen oder Wörter einer Seite als Spalten-Arrays (pdfplumber-Koordinaten)"""
+    x0: np.ndarray
+    x1: np.ndarray
+    top: np.ndarray
+    bottom: np.ndarray
+    text: List[str]
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @classmethod
+    def from_chars(cls, chars: Iterable[RawChar]) -> "Boxes":
+        """Waagerechte Zeichen (gedrehte Randtexte gehören zu keiner Tabelle)"""
+        upright = [char for char in chars if char.upright]
+        return cls._build(upright, [LIGATURES.get(char.text, char.text) for char in upright])
+
+    @classmethod
+    def from_words(cls, words: Iterable[Dict[str, Any]]) -> "Boxes":
+        """Wörter im Format von pdfplumber.extract_words"""
+        words = list(words)
+        coords = np.array([(w["x0"], w["x1"], w["top"], w["bottom"]) for w in words], dtype=np.float64)
+        coords = coords.reshape(-1, 4)
+        return cls(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3], [w["text"] for w in words])
+
+    @classmethod
+    def _build(cls, chars: Sequence[RawChar], text: List[str]) -> "Boxes":
+        coords = np.array([(c.x0, c.x1, c.top, c.bottom) for c in chars], dtype=np.float64).reshape(-1, 4)
+        return cls(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3], text)
+
+    def take(self, mask: np.ndarray) -> "Boxes":
+        """Teilmenge über eine boolesche Maske"""
+        text = self.text
+        return Boxes(self.x0[mask], self.x1[mask], self.top[mask], self.bottom[mask],
+                     [text[i] for i in np.flatnonzero(mask).tolist()])
+
+    def within(self, bbox: BBox) -> "Boxes":
+        """Boxen, deren Mitte in `bbox` liegt (wie die Zellzuordnung von pdfplumber)"""
+        x0, top, x1, bottom = bbox
+        mid_x = (self.x0 + self.x1) / 2
+        mid_y = (self.top + self.bottom) / 2
+        return self.take((mid_x >= x0) & (mid_x < x1) & (mid_y >= top) & (mid_y < bottom))
+
+
+def cluster_rows(top: np.ndarray, tolerance: float = DEFAULT_Y_TOLERANCE) -> np.ndarray:
+    """
+    Zeilennummer pro Box: sortierte `top`-Werte gehören zusammen, solange der
+    Abstand zum Vorgänger höchstens `tolerance` ist (wie pdfplumber.cluster_objects).
+    Die Nummern steigen von oben nach unten.
+    """
+    if not len(top):
+        return np.zeros(0, dtype=np.intp)
+    values = np.unique(top)
+    cluster_of_value = np.concatenate(([0], np.cumsum(np.diff(values) > tolerance)))
+    return cluster_of_value[np.searchsorted(values, top)]
+
+
+def assign_columns(x0: np.ndarray, x1: np.ndarray, edges: Sequence[float]) -> np.ndarray:
+    """Spaltennummer pro Box über die Mitte gegen die Grenzen `edges`; -1 außerhalb"""
+    edges = np.asarray(edges, dtype=np.float64)
+    column = np.searchsorted(edges, (x0 + x1) / 2, side="right") - 1
+    column[column >= len(edges) - 1] = -1
+    return column
+
+
+def chars_to_words(chars: Boxes, x_tolerance: float = DEFAULT_X_TOLERANCE,
+                   y_tolerance: float = DEFAULT_Y_TOLERANCE) -> Boxes:
+    """
+    Fasst Zeichen zu Wörtern zusammen (Regeln wie pdfplumber.extract_words):
+    innerhalb einer Zeile nach x sortiert, neues Wort nach einem Leerzeichen,
+    bei einer Lücke größer `x_tolerance` oder einem Sprung nach oben/unten.
+    """
+    if not len(chars):
+        return chars
+    row = cluster_rows(chars.top, y_tolerance)
+    order = np.lexsort((chars.x0, row))
+    x0, x1, top, bottom = chars.x0[order], chars.x1[order], chars.top[order], chars.bottom[order]
+    text = [chars.text[i] for i in order.tolist()]
+    space = np.fromiter((t.isspace() for t in text), dtype=bool, count=len(text))
+
+    new_word = np.ones(len(text), dtype=bool)
+    new_word[1:] = (
+        (row[order][1:] != row[order][:-1])
+        | space[:-1]
+        | (x0[1:] < x0[:-1])
+        | (x0[1:] > x1[:-1] + x_tolerance)
+        | (top[1:] > top[:-1] + y_tolerance)
+    )
+    keep = ~space
+    word = np.cumsum(new_word)[keep]
+    x0, x1, top, bottom = x0[keep], x1[keep], top[keep], bottom[keep]
+    text = [t for t, k in zip(text, keep.tolist()) if k]
+    if not text:
+        return Boxes(x0, x1, top, bottom, text)
+
+    starts = np.flatnonzero(np.concatenate(([True], word[1:] != word[:-1])))
+    stops = np.append(starts[1:], len(word))
+    return Boxes(
+        x0[starts],
+        np.maximum.reduceat(x1, starts),
+        np.minimum.reduceat(top, starts),
+        np.maximum.reduceat(bottom, starts),
+        ["".join(text[start:stop]) for start, stop in zip(starts.tolist(), stops.tolist())],
+    )
+
+
+def table_rows(words: Boxes, columns: Sequence[float],
+               y_tolerance: float = DEFAULT_Y_TOLERANCE) -> List[List[str]]:
+    """
+    Ordnet Wörter Zeilen und Spalten zu.
+
+    Args:
+        words: Wörter der Tabelle (siehe chars_to_words / Boxes.from_words)
+        columns: Spaltengrenzen von links nach rechts (n+1 Werte für n Spalten)
+        y_tolerance: Höchstabstand zweier Wörter derselben Zeile
+
+    Returns:
+        Zeilen von oben nach unten, je eine Zelle pro Spalte ("" wenn leer);
+        Wörter einer Zelle sind mit Leerzeichen verbunden
+    """
+    column = assign_columns(words.x0, words.x1, columns)
+    index = np.flatnonzero(column >= 0)
+    if not len(index):
+        return []
+
+    row = cluster_rows(words.top[index], y_tolerance)
+    column = column[index]
+    order = np.lexsort((words.x0[index], column, row))
+    rows: List[List[List[str]]] = [[[] for _ in range(len(columns) - 1)] for _ in range(int(row.max()) + 1)]
+    text = words.text
+    for r, c, i in zip(row[order].tolist(), column[order].tolist(), index[order].tolist()):
+        rows[r][c].append(text[i])
+    return [[" ".join(cell) for cell in cells] for cells in rows if any(cells)]
+
+
+def extract_table(chars: Iterable[RawChar], columns: Sequence[float], bbox: BBox,
+                  x_tolerance: float = DEFAULT_X_TOLERANCE,
+                  y_tolerance: float = DEFAULT_Y_TOLERANCE) -> List[List[str]]:
+    """Zeilen der Tabelle in `bbox` mit den Spaltengrenzen `columns` (siehe table_rows)"""
+    words = chars_to_words(Boxes.from_chars(chars).within(bbox), x_tolerance, y_tolerance)
+    return table_rows(words, columns, y_tolerance)
+
+
+def merge_rules(rules: Sequence[RawRule], tolerance: float = DEFAULT_X_TOLERANCE) -> List[RawRule]:
+    """
+    Fügt Linienstücke auf derselben x-Position (bis `tolerance`) zusammen,
+    deren Lücke höchstens `tolerance` ist (wie pdfplumber merge_edges/
+    join_edge_group). Viele Auszüge zeichnen Spaltenlinien als ein Stück pro
+    Tabellenzeile.
+    """
+    if not rules:
+        return []
+    x = np.array([rule.x for rule in rules], dtype=np.float64)
+    merged: List[RawRule] = []
+    column = cluster_rows(x, tolerance)
+    for key in np.unique(column):
+        segments = sorted((rules[i] for i in np.flatnonzero(column == key)), key=lambda rule: rule.top)
+        current = segments[0]
+        for segment in segments[1:]:
+            if segment.top - current.bottom <= tolerance:
+                current = current._replace(bottom=max(current.bottom, segment.bottom))
+            else:
+                merged.append(current)
+                current = segment
+        merged.append(current)
+    return merged
+
+
+def find_ruled_table(rules: Sequence[RawRule], tolerance: float = DEFAULT_X_TOLERANCE) -> Optional[Tuple[BBox, Tuple[float, ...]]]:
+    """
+    Sucht die Tabelle, die senkrechte Linien aufspannen: Linienstücke werden
+    zuerst zusammengefügt (merge_rules), dann bilden Linien mit gleichem
+    oberen und unteren Ende (bis `tolerance`) eine Gruppe, die Gruppe
+    mit den meisten Spaltengrenzen gewinnt.
+
+    Returns:
+        (bbox, Spaltengrenzen) oder None ohne mindestens zwei Linien
+    """
+    rules = merge_rules(rules, tolerance)
+    if len(rules) < 2:
+        return None
+    x = np.array([rule.x for rule in rules], dtype=np.float64)
+    top = np.array([rule.top for rule in rules], dtype=np.float64)
+    bottom = np.array([rule.bottom for rule in rules], dtype=np.float64)
+
+    group = cluster_rows(top, tolerance) * (len(rules) + 1) + cluster_rows(bottom, tolerance)
+    best = None
+    for key in np.unique(group):
+        members = group == key
+        values = np.unique(x[members])
+        edges = values[np.concatenate(([True], np.diff(values) > tolerance))]
+        if len(edges) >= 2 and (best is None or len(edges) > len(best[1])):
+            bbox = (float(edges[0]), float(top[members].min()), float(edges[-1]), float(bottom[members].max()))
+            best = (bbox, tuple(float(edge) for edge in edges))
+    return best
@@ -0,0 +1,23 @@
+# core/utils.py
+"""
+Hilfsfunktionen für die Bank-Erkennung
+"""
+import re
+from typing import List
+
+# Deutsche IBAN, mit oder ohne Leerzeichen-Gruppierung
+IBAN_PATTERN = re.compile(r"\bDE\d{2}(?:\s?\d){18}\b")
+
+
+def find_blz(text: str) -> List[str]:
+    """Liefert die Bankleitzahlen aller deutschen IBANs im Text"""
+    result = []
+    for match in IBAN_PATTERN.finditer(text):
+        iban = match.group(0).replace(" ", "")
+        result.append(iban[4:12])
+    return result
+
+
+def has_line_with(text: str, *tokens: str) -> bool:
+    """Prüft ob eine Textzeile alle Tokens enthält (z.B. Tabellenkopf)"""
+    return any(all(token in line for token in tokens) for line in text.split("\n"))
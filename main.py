@@ -1,22 +1,38 @@
 # main.py
 import argparse
-from core.dispatcher import get_parser
-from core.exporter import export_to_excel
+from core.dispatcher import get_parser, detect_bank
+from core.exporter import WRITERS, export
+from core.parallel import iter_document
+from core.pdf_extractor import ExtractedDocument
 
 def main():
     parser = argparse.ArgumentParser(description="PDF Kontoauszug Parser")
-    parser.add_argument("--bank", required=True)
+    parser.add_argument("--bank", default="auto", help="Bank-Name oder 'auto' (Standard)")
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
+    parser.add_argument("--format", choices=sorted(WRITERS), default=None,
+                        help="Ausgabeformat (Standard: aus der Dateiendung, sonst xlsx)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker-Prozesse für seitenparalleles Parsen langer Auszüge (Standard: 1 = seriell)")
     args = parser.parse_args()
 
-    # Get the appropriate parser based on the bank
-    parser_instance = get_parser(args.bank)
-    # Parses based on the bank selected
-    transactions = parser_instance.parse(args.input)
-    # Exports to Excel
-    export_to_excel(transactions, args.output)
-    print(f"✅ Exported {len(transactions)} transactions to {args.output}")
+    with ExtractedDocument(args.input) as document:
+        bank = args.bank
+        if bank == "auto":
+            # Detects the bank from the first page
+            detection = detect_bank(document)
+            bank = detection.bank
+            print(f"🔎 Detected bank: {bank} (signal: {detection.signal}, score: {detection.score:.2f})")
+
+        # Get the appropriate parser based on the bank
+        parser_instance = get_parser(bank)
+        # Parses based on the bank selected and streams the rows into the output file
+        transactions = iter_document(parser_instance, document, workers=args.workers)
+        count = export(transactions, args.output, args.format, schema=parser_instance.COLUMNS)
+        skipped = len(document.skipped_pages.get(parser_instance.bank_name, ()))
+        if skipped:
+            print(f"⏭️  Skipped {skipped} of {len(document.pages)} pages without transactions")
+    print(f"✅ Exported {count} transactions to {args.output}")
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,176 @@
 # parsers/base_parser.py
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+import logging
+from abc import ABC
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
+
+from core.batch import DEFAULT_BATCH_SIZE, Schema, TransactionBatch, iter_batches
+from core.page_budget import PageBudgetExceeded
+from core.pdf_extractor import PDFPLUMBER_BACKEND, ExtractedDocument, ExtractedPage, PDFSource, open_document
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Detection:
+    """Ergebnis der Bank-Erkennung: Konfidenz und die Signale, die entschieden haben"""
+    bank: str
+    score: float
+    signals: List[str] = field(default_factory=list)
+
+    @property
+    def signal(self) -> str:
+        return "+".join(self.signals) if self.signals else "none"
+
 
 class BaseParser(ABC):
-    @abstractmethod
-    def parse(self, pdf_path: str) -> List[Dict[str, Any]]:
+    # Name der Bank, wie er in Jobs und Auto-Detection verwendet wird
+    bank_name: str = ""
+
+    # Spalten der Transaktionen (aus dem gemeinsamen Schema, siehe core.batch)
+    COLUMNS: Schema = ()
+
+    # Backend für page.text()/page.lines() (siehe core.pdf_extractor); Parser mit
+    # festem, textbasiertem Layout können "chars" wählen und sparen die Layout-Analyse
+    EXTRACTION_BACKEND: str = PDFPLUMBER_BACKEND
+
+    # Seiten-Triage vor der Extraktion: eine Seite wird nur geparst, wenn sie alle
+    # Wörter mindestens eines Eintrags enthält (z.B. den Tabellenkopf); leer = alle Seiten
+    TRIAGE_TOKENS: Tuple[str, ...] = ()
+
+    # Erkennungsmerkmale der ersten Seite: (Signal-Name, Gewicht, Prüfung auf dem Seitentext)
+    FINGERPRINTS: List[Tuple[str, float, Callable[[str], bool]]] = []
+
+    def parse(self, source: PDFSource) -> List[Dict[str, Any]]:
+        """
+        Nimmt einen PDF-Pfad oder ein bereits geöffnetes ExtractedDocument,
+        extrahiert Transaktionen und gibt sie als Liste von Dictionaries zurück.
+        """
+        return list(self.iter_transactions(source))
+
+    def iter_transactions(self, source: PDFSource) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert die Transaktionen als Stream, sobald die jeweilige Seite
+        verarbeitet ist. Der Speicherbedarf hängt damit von der Seitengröße ab,
+        nicht von der Länge des Auszugs.
+
+        Standard: extract_page pro Seite, merge_pages darüber. Parser ohne
+        diese Aufteilung überschreiben diese Methode.
+        """
+        if not self.supports_page_parallel():
+            raise NotImplementedError(f"{type(self).__name__} muss iter_transactions oder parse_page_lines/merge_pages implementieren")
+        with open_document(source) as document:
+            yield from self.merge_pages(self.extract_page(page) for page in self.iter_pages(document))
+
+    def learn_templates(self, document: ExtractedDocument):
+        """
+        Lernt seitenübergreifende Layout-Templates (`document.templates`)
+        vorab, bevor core.parallel die Seitenbereiche an Worker verteilt; die
+        Worker starten mit diesen Templates statt sie auf der ersten Seite
+        ihres Bereichs neu zu lernen. Standard: keine Templates.
+        """
+
+    def iter_pages(self, document: ExtractedDocument, start: int = 0, stop: Optional[int] = None) -> Iterator[ExtractedPage]:
+        """
+        Seiten `start:stop`, die die Triage bestehen. Übersprungene Seiten
+        (Hinweise, AGB, Zusammenfassungen) werden nie layoutet und in
+        `document.skipped_pages[bank_name]` vermerkt.
+
+        Akzeptierte Seiten werden vorab für EXTRACTION_BACKEND gelesen. Seiten,
+        die dabei das Budget des Dokuments überschreiten, werden mit Warnung
+        übersprungen (`document.over_budget[bank_name]`).
+
+        Jede Seite wird freigegeben (ExtractedPage.release), sobald der
+        Aufrufer die nächste anfordert; der Speicherbedarf hängt damit nicht
+        von der Seitenzahl ab.
+        """
+        skipped = document.skipped_pages.setdefault(self.bank_name, set())
+        over_budget = document.over_budget.setdefault(self.bank_name, {})
+        for page in document.pages[start:stop]:
+            try:
+                accepted = self.accepts_page(page)
+                if accepted:
+                    page.load(self.EXTRACTION_BACKEND)
+            except PageBudgetExceeded as e:
+                logger.warning(str(e))
+                over_budget[page.page_number] = e.warning
+            else:
+                if accepted:
+                    yield page
+                else:
+                    skipped.add(page.page_number)
+            page.release()
+
+    def accepts_page(self, page: ExtractedPage) -> bool:
+        """Günstige Vorprüfung über TRIAGE_TOKENS (siehe ExtractedPage.contains_words)"""
+        if not self.TRIAGE_TOKENS:
+            return True
+        return any(page.contains_words(tokens.split()) for tokens in self.TRIAGE_TOKENS)
+
+    def iter_batches(self, source: PDFSource, size: int = DEFAULT_BATCH_SIZE) -> Iterator[TransactionBatch]:
+        """Transaktionen als Stream spaltenweiser Batches (je `size` Zeilen)"""
+        return iter_batches(self.iter_transactions(source), self.COLUMNS, size)
+
+    def extract_page(self, page: ExtractedPage) -> Any:
+        """
+        Seitenlokaler Teil des Parsens (Layout, Tabellenbereich, Zeilen).
+        Darf keinen Zustand über Seiten hinweg halten; das Ergebnis muss
+        picklebar sein, damit es aus einem Worker-Prozess zurückkommen kann.
+
+        Standard: extract_lines (Extraktion) und parse_page_lines (reines Parsen).
+        """
+        return self.parse_page_lines(self.extract_lines(page))
+
+    def extract_lines(self, page: ExtractedPage) -> List[str]:
+        """Extraktionsschritt: Textzeilen der Seite über EXTRACTION_BACKEND"""
+        return page.lines(backend=self.EXTRACTION_BACKEND)
+
+    def parse_page_lines(self, lines: List[str]) -> Any:
+        """
+        Parse-Schritt einer Seite auf ihren Textzeilen, ohne PDF. Liefert
+        dasselbe Fragment wie extract_page (Eingabe für merge_pages).
+        """
+        raise NotImplementedError
+
+    def parse_lines(self, pages: Iterable[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Parst bereits extrahierte Textzeilen (eine Liste pro Seite, wie von
+        dump_lines geliefert) ohne PDF, z.B. für Golden-Tests, Benchmarks
+        oder um zwischengespeicherten Text mit geänderten Regeln neu zu parsen.
+        """
+        return list(self.merge_pages(self.parse_page_lines(lines) for lines in pages))
+
+    def dump_lines(self, source: PDFSource) -> List[List[str]]:
+        """Textzeilen aller Seiten, die die Triage bestehen (Eingabe für parse_lines)"""
+        with open_document(source) as document:
+            return [self.extract_lines(page) for page in self.iter_pages(document)]
+
+    def merge_pages(self, fragments: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Setzt die Seiten-Fragmente in Seitenreihenfolge zu Transaktionen
+        zusammen (hier liegt der seitenübergreifende Zustand). Als Generator
+        implementiert, der `fragments` lazy konsumiert.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def supports_page_parallel(cls) -> bool:
+        return (
+            (cls.extract_page is not BaseParser.extract_page or cls.parse_page_lines is not BaseParser.parse_page_lines)
+            and cls.merge_pages is not BaseParser.merge_pages
+        )
+
+    @classmethod
+    def detect(cls, first_page: ExtractedPage) -> Detection:
         """
-        Nimmt einen PDF-Pfad, extrahiert Transaktionen und gibt sie
-        als Liste von Dictionaries zurück.
+        Bewertet nur die erste Seite (Kopfzeilen, BLZ/BIC, Tabellenkopf).
+        Die Laufzeit ist damit unabhängig von der Seitenzahl.
         """
-        pass
+        text = first_page.text()
+        signals = []
+        score = 0.0
+        for name, weight, check in cls.FINGERPRINTS:
+            if check(text):
+                signals.append(name)
+                score += weight
+        return Detection(cls.bank_name, min(score, 1.0), signals)
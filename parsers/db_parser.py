@@ -3,28 +3,165 @@ Deutsche Bank Kontoauszug Parser
 Extrahiert Transaktionen aus Deutsche Bank PDF-Kontoauszügen.
 """
 
-import pdfplumber
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Dict, Any, NamedTuple, Optional, Tuple
 from .base_parser import BaseParser
+from core.matcher import KeywordMatcher, Replacer
+from core.batch import schema
+from core.normalize import amounts_to_floats, infer_years
+from core.pdf_extractor import CHARS_BACKEND, PDFPLUMBER_BACKEND, PDFSource, open_document
+from core.utils import find_blz, has_line_with
 from datetime import datetime
 
 
+# --- Zeilenklassifikation: einmal kompiliert, jede Zeile wird genau einmal klassifiziert ---
+
+LINE_OTHER = 0
+LINE_START = 1
+LINE_FOOTER = 2
+
+FOOTER_KEYWORDS = [
+    'auszug', 'seite', 'iban de76',
+    'neuer saldo', 'alter saldo', 'wichtige hinweise',
+    'bitte erheben', 'filialnummer', 'kontonummer',
+    'bic (swift)'
+]
+
+TECHNICAL_KEYWORDS = [
+    'Gläubiger-ID', 'Mand-ID', 'RCUR', 'OTHR', 'SALA', 'RINP',
+    'Wiederholungslastschrift', 'Dauerauftrag', 'BIC ', 'IBAN',
+    'Folgenr.', 'Verfalld.', 'Kartennr.'
+]
+
+# Fix common stuck words
+STUCK_WORDS = {
+    'vonvon': 'von von',
+    'einzugvon': 'einzug von',
+    'überweisungvon': 'überweisung von',
+    'überweisungan': 'überweisung an',
+    'Einkaufbei': 'Einkauf bei',
+    'Ratefuer': 'Rate für',
+    'fuerMonat': 'für Monat',
+    'sagtDanke': 'sagt Danke',
+    'mangelsDeckung': 'mangels Deckung',
+    'oderwegen': 'oder wegen',
+}
+
+FOOTER_MATCHER = KeywordMatcher(FOOTER_KEYWORDS, prefixes=['iban de'], ignore_case=True)
+TECHNICAL_MATCHER = KeywordMatcher(TECHNICAL_KEYWORDS)
+STUCK_WORD_REPLACER = Replacer(STUCK_WORDS)
+
+DATE_PATTERN = re.compile(r'\d{2}\.\d{2}\.')
+DATE_PARTS_PATTERN = re.compile(r'(\d{2})\.(\d{2})\.')
+DATE_PREFIX_PATTERN = re.compile(r'^\d{2}\.\d{2}')
+AMOUNT_PATTERN = re.compile(r'([+-])\s*(\d{1,3}(?:\.\d{3})*,\d{2})$')
+YEAR_PATTERN = re.compile(r'(20\d{2})')
+YEAR_LINE_PATTERN = re.compile(r'^(20\d{2}\s*)+$')
+YEAR_PREFIX_PATTERN = re.compile(r'^(?:20\d{2}\s+)+')
+CAMEL_CASE_PATTERN = re.compile(r'([a-zäöü])([A-ZÄÖÜ])')
+
+
+class RawBooking(NamedTuple):
+    """
+    Roh-Tokens einer Buchung, wie sie im PDF stehen. Betrag und Jahr werden
+    erst in finalize_bookings für die ganze Seite auf einmal normalisiert.
+    """
+    buchungstag: str  # "28.12."
+    valuta: str
+    month: int
+    year: Optional[int]  # Jahr aus der Folgezeile, falls vorhanden
+    amount: str  # "-1.234,56"
+    vorgang: str
+
+
+class TransactionBlock(NamedTuple):
+    """
+    Zeilen einer Transaktion: Startzeile, Folgezeilen bis `body_end` und ggf.
+    die Zeile, an der die Transaktion endet (nächste Transaktion oder Footer).
+    Die Endzeile wird nur für die Jahreserkennung mitgeführt.
+    """
+    lines: List[str]
+    body_end: int
+
 
-def parse_deutsche_bank_pdf(pdf_path: str, debug: bool = False) -> List[Dict[str, Any]]:
+@dataclass
+class DBParseContext:
+    """
+    Zustand eines einzelnen Dokuments während des Parsens.
+
+    Jedes Dokument bekommt einen eigenen Kontext, daher können beliebig viele
+    Auszüge parallel (Threads, langlebige Celery-Worker) geparst werden, ohne
+    dass Monat/Jahr eines Auszugs in den nächsten durchsickern.
+    """
+    last_month: Optional[int] = None
+    last_year: Optional[int] = None
+    debug: bool = False
+
+    def resolve_year(self, month: int, year: Optional[int] = None) -> int:
+        """
+        Liefert das Jahr einer Buchung und erkennt Jahreswechsel (Dez → Jan).
+
+        Args:
+            month: Monat der Buchung
+            year: Jahr aus der Folgezeile (nur für die erste Buchung relevant,
+                Fallback: aktuelles Kalenderjahr)
+        """
+        if self.last_month is None:
+            self.last_month = month
+            self.last_year = year if year is not None else datetime.now().year
+
+        # Detect year rollover (e.g. Dec → Jan)
+        if month < self.last_month:
+            self.last_year += 1
+
+        self.last_month = month
+        return self.last_year
+
+    def resolve_years(self, months: List[int], year: Optional[int] = None) -> List[int]:
+        """
+        Wie resolve_year, aber für alle Buchungen einer Seite auf einmal.
+
+        Args:
+            months: Monate der Buchungen in Seitenreihenfolge
+            year: Jahr aus der Folgezeile der ersten Buchung
+        """
+        if not months:
+            return []
+        if self.last_month is None:
+            self.last_month = months[0]
+            self.last_year = year if year is not None else datetime.now().year
+
+        years = infer_years(months, last_month=self.last_month, last_year=self.last_year).tolist()
+        self.last_month = months[-1]
+        self.last_year = years[-1]
+        return years
+
+
+def parse_deutsche_bank_pdf(source: PDFSource, debug: bool = False) -> List[Dict[str, Any]]:
     """
     Parst einen Deutsche Bank Kontoauszug und extrahiert ALLE Transaktionen.
 
     Args:
-        pdf_path: Pfad zur PDF-Datei
+        source: Pfad zur PDF-Datei oder bereits geöffnetes ExtractedDocument
         debug: Aktiviert Debug-Ausgaben
 
     Returns:
         Liste von Transaktions-Dictionaries
     """
-    transactions = []
+    return list(iter_deutsche_bank_pdf(source, debug))
+
+
+def iter_deutsche_bank_pdf(source: PDFSource, debug: bool = False,
+                           backend: str = PDFPLUMBER_BACKEND) -> Iterator[Dict[str, Any]]:
+    """
+    Wie parse_deutsche_bank_pdf, liefert die Transaktionen aber Seite für Seite als Stream.
+    `backend` wählt die Text-Extraktion (siehe core.pdf_extractor).
+    """
+    count = 0
+    context = DBParseContext(debug=debug)
 
-    with pdfplumber.open(pdf_path) as pdf:
+    with open_document(source) as pdf:
         if debug:
             print(f"\n=== PDF hat {len(pdf.pages)} Seiten ===\n")
 
@@ -34,237 +171,263 @@ def parse_deutsche_bank_pdf(pdf_path: str, debug: bool = False) -> List[Dict[str
                 print(f"Verarbeite Seite {page_number}/{len(pdf.pages)}")
                 print(f"{'='*60}\n")
 
-            text = page.extract_text()
-            if not text:
-                if debug:
-                    print("  ✗ Kein Text auf dieser Seite")
-                continue
-
-            lines = text.split('\n')
-
-            # Find transaction area (starts after "Buchung Valuta Vorgang")
-            transaction_area_start = -1
-            for i, line in enumerate(lines):
-                if 'Buchung' in line and 'Valuta' in line and 'Vorgang' in line:
-                    transaction_area_start = i + 1
-                    if debug:
-                        print(f"  ✓ Header gefunden in Zeile {i}, starte Scan ab Zeile {transaction_area_start}")
-                    break
-
-            if transaction_area_start == -1:
-                if debug:
-                    print("  ✗ Kein Transaction-Header gefunden")
-                continue
-
-            # Parse all transactions
-            i = transaction_area_start
-            page_transaction_count = 0
-            while i < len(lines):
-                line = lines[i].strip()
-
-                # Stop at page footer
-                if is_page_footer(line):
-                    if debug:
-                        print(f"  ! Reached page footer at line {i}")
-                    break
-
-                # Check if this is a transaction start (line with date and amount)
-                if is_transaction_start(line):
-                    if debug:
-                        print(f"  → Line {i}: Found transaction start: {line[:60]}")
-                    transaction, lines_consumed = parse_full_transaction(lines, i, debug)
-                    if transaction:
-                        transactions.append(transaction)
-                        page_transaction_count += 1
-                        if debug:
-                            print(f"✓ {transaction['Buchungstag']} | "
-                                  f"{transaction['Vorgang'][:50]:50s} | "
-                                  f"{transaction['Betrag EUR']:>10.2f} €")
-                    i += lines_consumed
-                else:
-                    i += 1
-
-            if debug:
-                print(f"  ✓ {page_transaction_count} Transaktionen auf dieser Seite")
+            blocks = extract_transaction_blocks(page.lines(backend=backend), debug)
+            page_transactions = parse_transaction_blocks(blocks, context)
+            count += len(page_transactions)
+            yield from page_transactions
 
     if debug:
         print(f"\n{'='*60}")
-        print(f"✓ {len(transactions)} Transaktionen extrahiert")
+        print(f"✓ {count} Transaktionen extrahiert")
         print(f"{'='*60}\n")
 
-    return transactions
 
+def extract_transaction_blocks(lines: List[str], debug: bool = False) -> List[TransactionBlock]:
+    """
+    Zerlegt die Zeilen einer Seite in Blöcke, einen pro Transaktion.
 
-def is_transaction_start(line: str) -> bool:
-    """Prüft ob eine Zeile eine Transaktion startet (Datum + Betrag)."""
-    if not line:
-        return False
+    Rein seitenlokal (kein Zustand über Seiten hinweg), kann daher parallel
+    laufen. Jede Zeile wird dabei genau einmal klassifiziert.
+    """
+    if not lines:
+        if debug:
+            print("  ✗ Kein Text auf dieser Seite")
+        return []
+
+    # Find transaction area (starts after "Buchung Valuta Vorgang")
+    transaction_area_start = -1
+    for i, line in enumerate(lines):
+        if 'Buchung' in line and 'Valuta' in line and 'Vorgang' in line:
+            transaction_area_start = i + 1
+            if debug:
+                print(f"  ✓ Header gefunden in Zeile {i}, starte Scan ab Zeile {transaction_area_start}")
+            break
 
-    # Must start with date (DD.MM.)
-    if not re.match(r'^\d{2}\.\d{2}\.', line):
-        return False
+    if transaction_area_start == -1:
+        if debug:
+            print("  ✗ Kein Transaction-Header gefunden")
+        return []
+
+    blocks = []
+    block_start = None
+    for i in range(transaction_area_start, len(lines)):
+        kind = classify_line(lines[i].strip())
+        if kind == LINE_OTHER:
+            continue
+
+        # Next transaction or footer ends the open block
+        if block_start is not None:
+            blocks.append(TransactionBlock(lines[block_start:i + 1], i - block_start))
+            block_start = None
+
+        # Stop at page footer
+        if kind == LINE_FOOTER:
+            if debug:
+                print(f"  ! Reached page footer at line {i}")
+            break
 
-    # Must contain an amount at the end (+/-X,XX)
-    if not re.search(r'[+-]\s*\d{1,3}(?:\.\d{3})*,\d{2}$', line):
-        return False
+        if debug:
+            print(f"  → Line {i}: Found transaction start: {lines[i].strip()[:60]}")
+        block_start = i
 
-    return True
+    if block_start is not None:
+        blocks.append(TransactionBlock(lines[block_start:], len(lines) - block_start))
 
+    return blocks
 
-def is_page_footer(line: str) -> bool:
-    """Prüft ob eine Zeile zum Seiten-Footer gehört."""
-    footer_keywords = [
-        'auszug', 'seite', 'iban de76',
-        'neuer saldo', 'alter saldo', 'wichtige hinweise',
-        'bitte erheben', 'filialnummer', 'kontonummer',
-        'bic (swift)'
+
+def parse_transaction_blocks(blocks: List[TransactionBlock], context: DBParseContext) -> List[Dict[str, Any]]:
+    """Parst die Transaktionsblöcke einer Seite (in Seitenreihenfolge, ein Kontext pro Dokument)"""
+    debug = context.debug
+    bookings = []
+    for block in blocks:
+        try:
+            booking = extract_booking(block)
+        except Exception as e:
+            if debug:
+                print(f"✗ Fehler beim Parsen: {e}")
+            continue
+        if booking:
+            bookings.append(booking)
+
+    transactions = finalize_bookings(bookings, context)
+
+    if debug:
+        for transaction in transactions:
+            print(f"✓ {transaction['Buchungstag']} | "
+                  f"{transaction['Vorgang'][:50]:50s} | "
+                  f"{transaction['Betrag EUR']:>10.2f} €")
+        print(f"  ✓ {len(transactions)} Transaktionen auf dieser Seite")
+
+    return transactions
+
+
+def finalize_bookings(bookings: List[RawBooking], context: DBParseContext) -> List[Dict[str, Any]]:
+    """
+    Normalisiert die Roh-Tokens einer Seite: Beträge exakt über Cent,
+    Jahre über den Dokument-Kontext (Jahreswechsel Dez → Jan).
+    """
+    if not bookings:
+        return []
+
+    amounts = amounts_to_floats([booking.amount for booking in bookings])
+    years = context.resolve_years([booking.month for booking in bookings], bookings[0].year)
+
+    return [
+        {
+            "Buchungstag": booking.buchungstag + str(year),
+            "Valuta": booking.valuta + str(year),
+            "Vorgang": booking.vorgang,
+            "Betrag EUR": amount,
+        }
+        for booking, amount, year in zip(bookings, amounts, years)
     ]
-    line_lower = line.lower()
 
-    if 'seite' in line_lower and ('von' in line_lower or 'iban' in line_lower):
-        return True
 
-    if line_lower.startswith('iban de'):
-        return True
+def classify_line(line: str) -> int:
+    """Klassifiziert eine (gestrippte) Zeile als LINE_FOOTER, LINE_START oder LINE_OTHER."""
+    if FOOTER_MATCHER.search(line):
+        return LINE_FOOTER
+    if is_transaction_start(line):
+        return LINE_START
+    return LINE_OTHER
+
+
+def is_transaction_start(line: str) -> bool:
+    """Prüft ob eine Zeile eine Transaktion startet (Datum + Betrag)."""
+    if not line:
+        return False
+
+    # Must start with date (DD.MM.) and contain an amount at the end (+/-X,XX)
+    return DATE_PATTERN.match(line) is not None and AMOUNT_PATTERN.search(line) is not None
 
-    if any(keyword in line_lower for keyword in footer_keywords):
-        return True
 
-    return False
+def is_page_footer(line: str) -> bool:
+    """Prüft ob eine Zeile zum Seiten-Footer gehört."""
+    return FOOTER_MATCHER.search(line)
 
 
-def parse_full_transaction(lines: List[str], start_idx: int, debug: bool = False) -> Tuple[Optional[Dict[str, Any]], int]:
+def parse_full_transaction(lines: List[str], start_idx: int, debug: bool = False,
+                           context: Optional[DBParseContext] = None) -> Tuple[Optional[Dict[str, Any]], int]:
     """
     Parst eine vollständige Transaktion ab der Startzeile.
 
+    Args:
+        lines: Zeilen der Seite
+        start_idx: Index der Startzeile
+        debug: Aktiviert Debug-Ausgaben
+        context: Dokument-Kontext für die Jahreserkennung; ohne Kontext wird
+            die Transaktion unabhängig von vorherigen Aufrufen geparst
+
     Returns:
         (transaction_dict, number_of_lines_consumed)
     """
-    try:
-        first_line = lines[start_idx].strip()
-
-        # Extract dates (DD.MM.)
-        dates = re.findall(r'\d{2}\.\d{2}\.', first_line)
-        if len(dates) < 1:
-            return None, 1
-
-        buchungstag = dates[0]
-        valuta = dates[1] if len(dates) > 1 else buchungstag
-
-        # Extract amount from end
-        betrag_match = re.search(r'([+-])\s*(\d{1,3}(?:\.\d{3})*,\d{2})$', first_line)
-        if not betrag_match:
-            return None, 1
-
-        sign = betrag_match.group(1)
-        amount_str = betrag_match.group(2).replace('.', '').replace(',', '.')
-        betrag = float(amount_str) * (1 if sign == '+' else -1)
-
-        # Extract description (between date(s) and amount)
-        desc_start = first_line.find(dates[-1]) + len(dates[-1])
-        desc_end = betrag_match.start()
-        beschreibung = first_line[desc_start:desc_end].strip()
-
-        # Remove date prefix (if present)
-        if re.match(r'^\d{2}\.\d{2}', beschreibung):
-            beschreibung = beschreibung[6:].strip()
-
-        beschreibung = clean_text(beschreibung)
-
-        # --- Dynamic year detection (handles statements spanning multiple years) ---
-
-        # Fallback: current calendar year
-        year = datetime.now().year
-
-        # Try to find an explicit year in the next line (e.g. "2024", "2025")
-        next_idx = start_idx + 1
-        if next_idx < len(lines):
-            next_line = lines[next_idx].strip()
-            year_match = re.search(r'(20\d{2})', next_line)
-            if year_match:
-                year = int(year_match.group(1))
-
-        # Extract month and day from first date in 'dates' list (e.g. "28.12.")
-        month_match = re.match(r'(\d{2})\.(\d{2})\.', dates[0])
-        if month_match:
-            day, month = int(month_match.group(1)), int(month_match.group(2))
-
-            # Use function-scoped persistent variables
-            # (or you can store them in class attributes if using OOP)
-            if not hasattr(parse_full_transaction, "last_month"):
-                parse_full_transaction.last_month = month
-                parse_full_transaction.last_year = year
-
-            # Detect year rollover (e.g. Dec → Jan)
-            if month < parse_full_transaction.last_month:
-                parse_full_transaction.last_year += 1  # increment year
-            else:
-                # keep same year
-                parse_full_transaction.last_year = parse_full_transaction.last_year
-
-            parse_full_transaction.last_month = month
-            year = parse_full_transaction.last_year
-
-        # Append year to the dates
-        buchungstag = buchungstag + str(year)
-        valuta = valuta + str(year)
-
-
-        # --- Simplified logic: collect all following lines into one single Vorgang ---
-        vorgang_lines = [beschreibung]
-        i = start_idx + 1
-        lines_consumed = 1
-
-        while i < len(lines):
-            line = lines[i].strip()
-            lines_consumed += 1
-
-            # Stop if we hit next transaction or footer
-            if is_transaction_start(line) or is_page_footer(line):
-                lines_consumed -= 1
-                break
-
-            # Skip empty or technical lines
-            if not line or is_technical_line(line):
-                i += 1
-                continue
-
-            # Skip year line (format: "2025 2025" or variations like "2025 2025 2025")
-            if re.match(r'^(20\d{2}\s*)+$', line):
-                i += 1
-                continue
-
-            # Remove year prefixes from lines (e.g., "2025 2025 PayPal" -> "PayPal")
-            line = re.sub(r'^(?:20\d{2}\s+)+', '', line)
-
-            if line:  # Only add if something remains after removing years
-                vorgang_lines.append(line)
-            i += 1
-
-        # Combine everything into one field
-        vorgang = clean_text(' '.join(vorgang_lines))
-
-        return {
-            "Buchungstag": buchungstag,
-            "Valuta": valuta,
-            "Vorgang": vorgang[:750],
-            "Betrag EUR": betrag,
-        }, lines_consumed
+    if context is None:
+        context = DBParseContext(debug=debug)
+    debug = debug or context.debug
+
+    # Stop if we hit next transaction or footer
+    end = start_idx + 1
+    while end < len(lines) and classify_line(lines[end].strip()) == LINE_OTHER:
+        end += 1
+    block = TransactionBlock(lines[start_idx:end + 1], end - start_idx)
 
+    try:
+        transaction = parse_block(block, context)
     except Exception as e:
         if debug:
             print(f"✗ Fehler beim Parsen: {e}")
         return None, 1
 
+    if transaction is None:
+        return None, 1
+    return transaction, block.body_end
+
+
+def parse_block(block: TransactionBlock, context: DBParseContext) -> Optional[Dict[str, Any]]:
+    """Parst einen Transaktionsblock ohne die Zeilen erneut zu klassifizieren."""
+    booking = extract_booking(block)
+    if booking is None:
+        return None
+    return finalize_bookings([booking], context)[0]
+
+
+def extract_booking(block: TransactionBlock) -> Optional[RawBooking]:
+    """Sammelt die Roh-Tokens eines Transaktionsblocks (Daten, Betrag, Vorgang)."""
+    lines = block.lines
+    first_line = lines[0].strip()
+
+    # Extract dates (DD.MM.)
+    dates = DATE_PATTERN.findall(first_line)
+    if len(dates) < 1:
+        return None
+
+    buchungstag = dates[0]
+    valuta = dates[1] if len(dates) > 1 else buchungstag
+
+    # Extract amount from end
+    betrag_match = AMOUNT_PATTERN.search(first_line)
+    if not betrag_match:
+        return None
+
+    amount = betrag_match.group(1) + betrag_match.group(2)
+
+    # Extract description (between date(s) and amount)
+    desc_start = first_line.find(dates[-1]) + len(dates[-1])
+    desc_end = betrag_match.start()
+    beschreibung = first_line[desc_start:desc_end].strip()
+
+    # Remove date prefix (if present)
+    if DATE_PREFIX_PATTERN.match(beschreibung):
+        beschreibung = beschreibung[6:].strip()
+
+    beschreibung = clean_text(beschreibung)
+
+    # --- Dynamic year detection (handles statements spanning multiple years) ---
+
+    # Fallback (current calendar year) is applied by the context, only when needed
+    year: Optional[int] = None
+
+    # Try to find an explicit year in the next line (e.g. "2024", "2025")
+    if len(lines) > 1:
+        year_match = YEAR_PATTERN.search(lines[1].strip())
+        if year_match:
+            year = int(year_match.group(1))
+
+    # Extract month and day from first date in 'dates' list (e.g. "28.12."),
+    # always matches because `dates` was found with the same pattern
+    month = int(DATE_PARTS_PATTERN.match(dates[0]).group(2))
+
+    # --- Simplified logic: collect all following lines into one single Vorgang ---
+    vorgang_lines = [beschreibung]
+    for line in lines[1:block.body_end]:
+        line = line.strip()
+
+        # Skip empty or technical lines
+        if not line or TECHNICAL_MATCHER.search(line):
+            continue
+
+        # Skip year line (format: "2025 2025" or variations like "2025 2025 2025")
+        if YEAR_LINE_PATTERN.match(line):
+            continue
+
+        # Remove year prefixes from lines (e.g., "2025 2025 PayPal" -> "PayPal")
+        year_prefix = YEAR_PREFIX_PATTERN.match(line)
+        if year_prefix:
+            line = line[year_prefix.end():]
+
+        if line:  # Only add if something remains after removing years
+            vorgang_lines.append(line)
+
+    # Combine everything into one field
+    vorgang = clean_text(' '.join(vorgang_lines))
+
+    return RawBooking(buchungstag, valuta, month, year, amount, vorgang[:750])
+
 
 def is_technical_line(line: str) -> bool:
     """Prüft ob eine Zeile technische Informationen enthält (soll nicht in Verwendungszweck)."""
-    technical_keywords = [
-        'Gläubiger-ID', 'Mand-ID', 'RCUR', 'OTHR', 'SALA', 'RINP',
-        'Wiederholungslastschrift', 'Dauerauftrag', 'BIC ', 'IBAN',
-        'Folgenr.', 'Verfalld.', 'Kartennr.'
-    ]
-    return any(keyword in line for keyword in technical_keywords)
+    return TECHNICAL_MATCHER.search(line)
 
 
 def clean_text(text: str) -> str:
@@ -273,24 +436,10 @@ def clean_text(text: str) -> str:
         return ""
 
     # Add space before capitals
-    text = re.sub(r'([a-zäöü])([A-ZÄÖÜ])', r'\1 \2', text)
-
-    # Fix common stuck words
-    replacements = {
-        'vonvon': 'von von',
-        'einzugvon': 'einzug von',
-        'überweisungvon': 'überweisung von',
-        'überweisungan': 'überweisung an',
-        'Einkaufbei': 'Einkauf bei',
-        'Ratefuer': 'Rate für',
-        'fuerMonat': 'für Monat',
-        'sagtDanke': 'sagt Danke',
-        'mangelsDeckung': 'mangels Deckung',
-        'oderwegen': 'oder wegen',
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    text = CAMEL_CASE_PATTERN.sub(r'\1 \2', text)
+
+    # Fix common stuck words (one pass over the text)
+    text = STUCK_WORD_REPLACER(text)
 
     # Normalize whitespace
     text = ' '.join(text.split())
@@ -301,14 +450,28 @@ def clean_text(text: str) -> str:
 class DBParser(BaseParser):
     """Parser für Deutsche Bank Kontoauszüge im PDF-Format"""
 
-    def parse(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """
-        Parst einen Deutsche Bank Kontoauszug und extrahiert alle Transaktionen.
+    bank_name = "deutsche_bank"
 
-        Args:
-            pdf_path: Pfad zur PDF-Datei
+    COLUMNS = schema("Buchungstag", "Valuta", "Vorgang", "Betrag EUR")
 
-        Returns:
-            Liste von Transaktions-Dictionaries
-        """
-        return parse_deutsche_bank_pdf(pdf_path, debug=False)
+    # Reines Textlayout: nur Zeichen lesen, keine Linien/Rechtecke
+    EXTRACTION_BACKEND = CHARS_BACKEND
+
+    # Seiten ohne Tabellenkopf ("Buchung Valuta Vorgang") enthalten keine Buchungen
+    TRIAGE_TOKENS = ("Buchung Valuta Vorgang",)
+
+    FINGERPRINTS = [
+        ("header", 0.4, lambda text: "Deutsche Bank" in text),
+        ("bic", 0.5, lambda text: "DEUTDE" in text),
+        # BLZ der Deutschen Bank: xxx 700 xx (z.B. 100 700 24)
+        ("blz", 0.5, lambda text: any(blz[3:6] == "700" for blz in find_blz(text))),
+        ("table_header", 0.4, lambda text: has_line_with(text, "Buchung", "Valuta", "Vorgang")),
+    ]
+
+    def parse_page_lines(self, lines: List[str]) -> List[TransactionBlock]:
+        return extract_transaction_blocks(lines)
+
+    def merge_pages(self, fragments: Iterable[List[TransactionBlock]]) -> Iterator[Dict[str, Any]]:
+        context = DBParseContext()
+        for blocks in fragments:
+            yield from parse_transaction_blocks(blocks, context)
@@ -4,11 +4,17 @@ ING Kontoauszug Parser
 Extrahiert Transaktionen aus ING PDF-Kontoauszügen über mehrere Seiten hinweg.
 """
 
-import pdfplumber
-import pandas as pd
-from typing import List, Dict, Any, Optional
+import re
+from typing import Iterable, Iterator, List, Dict, Any
 from dataclasses import dataclass, field
 
+from core.matcher import KeywordMatcher
+from core.batch import schema
+from core.normalize import amounts_to_floats
+from core.pdf_extractor import CHARS_BACKEND, ExtractedPage, PDFSource, open_document
+from core.utils import find_blz, has_line_with
+from .base_parser import BaseParser
+
 
 @dataclass
 class Transaction:
@@ -17,7 +23,7 @@ class Transaction:
     valuta: str = ""
     empfaenger: str = ""
     transaktion: str = ""
-    betrag_eur: Optional[float] = None
+    betrag: str = ""  # Roh-Token ("-1.234,56"), normalisiert wird seitenweise in extract_page
     verwendungszweck: List[str] = field(default_factory=list)
     erlaeuterung: str = ""
 
@@ -28,7 +34,7 @@ class Transaction:
             "Valuta": self.valuta,
             "Empfänger": self.empfaenger,
             "Transaktion": self.transaktion,
-            "Betrag EUR": self.betrag_eur,
+            "Betrag EUR": self.betrag,
             "Verwendungszweck": " | ".join(self.verwendungszweck),
         }
 
@@ -46,14 +52,48 @@ class Transaction:
         self.valuta = ""
         self.empfaenger = ""
         self.transaktion = ""
-        self.betrag_eur = None
+        self.betrag = ""
         self.verwendungszweck = []
         self.erlaeuterung = ""
 
 
-class INGParser:
+class TableLine:
+    """
+    Eine Tabellenzeile, einmal kleingeschrieben, tokenisiert und klassifiziert.
+    Alle Prüfungen im Seiten-Loop teilen sich diese Werte.
+    """
+    __slots__ = ("text", "lower", "tokens", "is_skip")
+
+    def __init__(self, text: str, lower: str, is_skip: bool):
+        self.text = text
+        self.lower = lower
+        self.tokens = text.split()
+        self.is_skip = is_skip
+
+    def __repr__(self) -> str:
+        return f"TableLine({self.text!r})"
+
+
+class INGParser(BaseParser):
     """Parser für ING Kontoauszüge im PDF-Format"""
+
+    bank_name = "ing"
+
+    COLUMNS = schema("Datum", "Valuta", "Empfänger", "Transaktion", "Betrag EUR", "Verwendungszweck")
+
+    # Reines Textlayout: nur Zeichen lesen, keine Linien/Rechtecke
+    EXTRACTION_BACKEND = CHARS_BACKEND
+
+    FINGERPRINTS = [
+        ("header", 0.4, lambda text: "ING-DiBa" in text or re.search(r"\bING\b", text) is not None),
+        ("bic", 0.5, lambda text: "INGDDEFF" in text),
+        ("blz", 0.5, lambda text: "50010517" in find_blz(text)),
+        ("table_header", 0.4, lambda text: has_line_with(text, "Buchung / Verwendungszweck")),
+    ]
     
+    # Seiten ohne einen der Tabellenanfänge (siehe TABLE_START_KEYWORDS) werden übersprungen
+    TRIAGE_TOKENS = ("Buchung / Verwendungszweck", "Betrag (EUR)", "Valuta")
+
     # PDF-Extraktionseinstellungen
     PDF_SETTINGS = {
         "vertical_strategy": "text",
@@ -98,60 +138,103 @@ class INGParser:
         "alter saldo", "kontostand",
     ]
 
-    def parse(self, pdf_path: str, debug: bool = False) -> List[Dict[str, Any]]:
+    # Keywords für Tabellenanfang (Präfixe zählen nur am Zeilenanfang)
+    TABLE_START_KEYWORDS = ["buchung / verwendungszweck", "betrag (eur)"]
+    TABLE_START_PREFIXES = ["valuta"]
+
+    @classmethod
+    def _compile_classifier(cls):
+        """
+        Übersetzt die Keyword-Listen einmal pro Klasse in Matcher und Sets.
+        Unterklassen mit eigenen Listen werden über __init_subclass__ neu kompiliert.
+        """
+        cls._skip_matcher = KeywordMatcher(kw.lower() for kw in cls.SKIP_KEYWORDS)
+        cls._table_start_matcher = KeywordMatcher(
+            (kw.lower() for kw in cls.TABLE_START_KEYWORDS),
+            prefixes=[prefix.lower() for prefix in cls.TABLE_START_PREFIXES],
+        )
+        cls._table_end_matcher = KeywordMatcher(kw.lower() for kw in cls.TABLE_END_KEYWORDS)
+        cls._transaction_types = frozenset(kw.lower() for kw in cls.TRANSACTION_TYPES)
+        cls._transaction_type_matcher = KeywordMatcher(kw.lower() for kw in cls.TRANSACTION_TYPES)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_classifier()
+
+    def parse(self, source: PDFSource, debug: bool = False) -> List[Dict[str, Any]]:
         """
         Parst einen ING Kontoauszug und extrahiert alle Transaktionen.
         
         Args:
-            pdf_path: Pfad zur PDF-Datei
+            source: Pfad zur PDF-Datei oder bereits geöffnetes ExtractedDocument
             debug: Aktiviert Debug-Ausgaben
             
         Returns:
             Liste von Transaktions-Dictionaries
         """
-        transactions = []
-        current_transaction = Transaction()
+        return list(self.iter_transactions(source, debug))
+
+    def iter_transactions(self, source: PDFSource, debug: bool = False) -> Iterator[Dict[str, Any]]:
+        """Wie parse, liefert die Transaktionen aber Seite für Seite als Stream"""
+        count = 0
         
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_document(source) as pdf:
             if debug:
                 print(f"📄 PDF hat {len(pdf.pages)} Seiten")
             
-            for page_number, page in enumerate(pdf.pages, start=1):
+            for page in self.iter_pages(pdf):
                 if debug:
                     print(f"\n{'='*60}")
-                    print(f"📄 Verarbeite Seite {page_number}/{len(pdf.pages)}")
+                    print(f"📄 Verarbeite Seite {page.page_number}/{len(pdf.pages)}")
                     print(f"{'='*60}")
                 
-                # Transaktion am Seitenende speichern
-                self._save_transaction(current_transaction, transactions, debug)
-                current_transaction.reset()
-                
                 # Seite verarbeiten
-                self._process_page(page, current_transaction, transactions, debug)
-            
-            # Letzte Transaktion speichern
-            self._save_transaction(current_transaction, transactions, debug)
+                page_transactions = self.extract_page(page, debug)
+                count += len(page_transactions)
+                yield from page_transactions
         
         if debug:
             print(f"\n{'='*60}")
-            print(f"✅ Insgesamt {len(transactions)} Transaktionen extrahiert")
+            print(f"✅ Insgesamt {count} Transaktionen extrahiert")
             print(f"{'='*60}")
-        
+
+    def extract_page(self, page: ExtractedPage, debug: bool = False) -> List[Dict[str, Any]]:
+        """Verarbeitet eine Seite vollständig (siehe parse_page_lines)"""
+        return self.parse_page_lines(self.extract_lines(page), debug)
+
+    def extract_lines(self, page: ExtractedPage) -> List[str]:
+        return page.lines(backend=self.EXTRACTION_BACKEND, x_tolerance=self.PDF_SETTINGS["join_tolerance"])
+
+    def parse_page_lines(self, lines: List[str], debug: bool = False) -> List[Dict[str, Any]]:
+        """
+        Parst die Textzeilen einer Seite.
+        Die offene Transaktion wird am Seitenende gespeichert, Seiten hängen
+        also nicht voneinander ab und können parallel verarbeitet werden.
+        """
+        transactions = []
+        current_transaction = Transaction()
+        self._process_page(lines, current_transaction, transactions, debug)
+        self._save_transaction(current_transaction, transactions, debug)
+
+        # Beträge der ganzen Seite auf einmal in Euro umrechnen
+        amounts = amounts_to_floats([transaction["Betrag EUR"] for transaction in transactions])
+        for transaction, amount in zip(transactions, amounts):
+            transaction["Betrag EUR"] = amount
         return transactions
 
+    def merge_pages(self, fragments: Iterable[List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        for page_transactions in fragments:
+            yield from page_transactions
+
     def _process_page(
         self, 
-        page, 
+        page_lines: List[str], 
         current_transaction: Transaction, 
         transactions: List[Dict[str, Any]], 
         debug: bool
     ):
-        """Verarbeitet eine einzelne PDF-Seite"""
-        text = page.extract_text(x_tolerance=self.PDF_SETTINGS["join_tolerance"])
-        if not text:
-            return
-        
-        lines = self._extract_table_lines(text, debug)
+        """Verarbeitet die Zeilen einer einzelnen PDF-Seite"""
+        lines = self._extract_table_lines(page_lines, debug)
         if not lines:
             return
         
@@ -160,9 +243,9 @@ class INGParser:
             line = lines[i]
             
             # Header-Zeilen überspringen
-            if self._is_skip_line(line):
+            if line.is_skip:
                 if debug:
-                    print(f"  ⏭️  Überspringe: {line[:60]}...")
+                    print(f"  ⏭️  Überspringe: {line.text[:60]}...")
                 i += 1
                 continue
             
@@ -173,57 +256,65 @@ class INGParser:
                 current_transaction.reset()
                 
                 # Neue Transaktion parsen
-                self._parse_booking_line(line, current_transaction, page, debug)
+                self._parse_booking_line(line, current_transaction, debug)
                 
                 # Nächste Zeile auf Valuta prüfen
                 if i + 1 < len(lines):
                     next_line = lines[i + 1]
-                    if not self._is_skip_line(next_line):
+                    if not next_line.is_skip:
                         valuta_consumed = self._try_parse_valuta(next_line, current_transaction)
                         if valuta_consumed:
                             i += 2
                             continue
             else:
-                # Verwendungszweck hinzufügen
-                if current_transaction.datum and not self._is_skip_line(line):
-                    current_transaction.verwendungszweck.append(line)
+                # Verwendungszweck hinzufügen (Skip-Zeilen sind oben schon aussortiert)
+                if current_transaction.datum:
+                    current_transaction.verwendungszweck.append(line.text)
                     if debug:
-                        print(f"    ➕ Verwendungszweck: {line[:60]}...")
+                        print(f"    ➕ Verwendungszweck: {line.text[:60]}...")
             
             i += 1
 
-    def _extract_table_lines(self, text: str, debug: bool) -> List[str]:
-        """Extrahiert nur die Zeilen der Transaktions-Tabelle"""
-        lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-        
+    def _extract_table_lines(self, page_lines: Iterable[str], debug: bool) -> List[TableLine]:
+        """
+        Extrahiert nur die Zeilen der Transaktions-Tabelle.
+        Jede Zeile wird dabei genau einmal kleingeschrieben, tokenisiert und
+        gegen die Skip-Keywords geprüft.
+        """
+        is_table_start = self._table_start_matcher.search
+        is_table_end = self._table_end_matcher.search
+        is_skip = self._skip_matcher.search
+
         in_table = False
         table_lines = []
         
-        for line in lines:
+        for raw_line in page_lines:
+            line = raw_line.strip()
+            if not line:
+                continue
             lower_line = line.lower()
             
             # Tabellenanfang erkennen
-            if any(start in lower_line for start in [
-                "buchung / verwendungszweck",
-                "betrag (eur)",
-            ]) or lower_line.startswith("valuta"):
+            if is_table_start(lower_line):
                 in_table = True
                 continue
             
+            if not in_table:
+                continue
+            
             # Tabellenende erkennen
-            if in_table and any(end in lower_line for end in self.TABLE_END_KEYWORDS):
+            if is_table_end(lower_line):
                 if debug:
                     print(f"  🛑 Tabellenende: {line[:60]}...")
                 break
             
-            if in_table:
-                table_lines.append(line)
+            table_lines.append(TableLine(line, lower_line, is_skip(lower_line)))
         
         return table_lines
 
-    def _is_booking_line(self, line: str) -> bool:
+    def _is_booking_line(self, line: TableLine) -> bool:
         """Prüft ob eine Zeile eine neue Buchung ist"""
-        parts = line.split()
+        parts = line.tokens
         return (
             len(parts) >= 3
             and parts[0].count(".") == 2
@@ -231,36 +322,26 @@ class INGParser:
             and parts[0][2] == "."
         )
 
-    def _is_skip_line(self, line: str) -> bool:
-        """Prüft ob eine Zeile übersprungen werden soll"""
-        line_lower = line.lower()
-        return any(keyword in line_lower for keyword in self.SKIP_KEYWORDS)
-
     def _parse_booking_line(
         self, 
-        line: str, 
+        line: TableLine, 
         transaction: Transaction, 
-        page, 
         debug: bool
     ):
         """Parst eine Buchungszeile und füllt die Transaktion"""
-        parts = line.split()
+        parts = line.tokens
         
         # Datum extrahieren
         transaction.datum = parts[0]
         
-        # Betrag extrahieren
-        try:
-            amount_str = parts[-1].replace(".", "").replace(",", ".")
-            transaction.betrag_eur = float(amount_str)
-        except (ValueError, IndexError):
-            transaction.betrag_eur = None
+        # Betrag als Roh-Token übernehmen
+        transaction.betrag = parts[-1]
         
         # Mittleren Teil in Transaktion und Empfänger aufteilen
-        middle_text = " ".join(parts[1:-1])
-        transaction.erlaeuterung = middle_text
+        middle_words = parts[1:-1]
+        transaction.erlaeuterung = " ".join(middle_words)
         
-        split_data = self._split_transaction_recipient(middle_text)
+        split_data = self._split_transaction_recipient(middle_words)
         transaction.transaktion = split_data["transaktion"]
         transaction.empfaenger = split_data["empfaenger"]
         
@@ -269,15 +350,14 @@ class INGParser:
             print(f"     📅 Datum: {transaction.datum}")
             print(f"     🏷️  Typ: {transaction.transaktion}")
             print(f"     👤 Empfänger: {transaction.empfaenger}")
-            print(f"     💶 Betrag: {transaction.betrag_eur}")
+            print(f"     💶 Betrag: {transaction.betrag}")
 
-    def _split_transaction_recipient(self, text: str) -> Dict[str, str]:
+    def _split_transaction_recipient(self, words: List[str]) -> Dict[str, str]:
         """
         Trennt Transaktionstyp und Empfänger.
-        Beispiel: "Lastschrift VISA DOTT SCOOTER" → 
+        Beispiel: ["Lastschrift", "VISA", "DOTT", "SCOOTER"] → 
                   Transaktion="Lastschrift VISA", Empfänger="DOTT SCOOTER"
         """
-        words = text.split()
         if not words:
             return {"transaktion": "", "empfaenger": ""}
         
@@ -289,15 +369,13 @@ class INGParser:
             clean_word = word.strip(" -").lower()
             
             # Exakte Übereinstimmung mit Transaktionstyp
-            if any(kw.lower() == clean_word for kw in self.TRANSACTION_TYPES):
+            if clean_word in self._transaction_types:
                 in_transaction_type = True
                 transaktion_words.append(word)
                 continue
             
             # Teilübereinstimmung (z.B. "VISA-Zahlung")
-            if in_transaction_type and any(
-                kw.lower() in clean_word for kw in self.TRANSACTION_TYPES
-            ):
+            if in_transaction_type and self._transaction_type_matcher.search(clean_word):
                 transaktion_words.append(word)
                 continue
             
@@ -317,23 +395,22 @@ class INGParser:
         
         return {"transaktion": transaktion, "empfaenger": empfaenger}
 
-    def _try_parse_valuta(self, line: str, transaction: Transaction) -> bool:
+    def _try_parse_valuta(self, line: TableLine, transaction: Transaction) -> bool:
         """
         Versucht ein Valuta-Datum aus der Zeile zu extrahieren.
         Returns True wenn Valuta gefunden und konsumiert wurde.
         """
-        date_token = self._find_date_token(line)
+        date_token = self._find_date_token(line.tokens)
         if date_token:
             transaction.valuta = date_token
-            rest = line.replace(date_token, "").strip()
+            rest = line.text.replace(date_token, "").strip()
             if rest:
                 transaction.verwendungszweck.append(rest)
             return True
         return False
 
-    def _find_date_token(self, text: str) -> str:
+    def _find_date_token(self, tokens: List[str]) -> str:
         """Findet ein Datums-Token im Format DD.MM oder DD.MM.YYYY"""
-        tokens = text.split()
         for token in tokens:
             clean_token = token.strip("(),;:")
             parts = clean_token.split(".")
@@ -365,4 +442,7 @@ class INGParser:
         if transaction.is_valid():
             transactions.append(transaction.to_dict())
             if debug:
-                print(f"  ✅ Transaktion gespeichert")
\ No newline at end of file
+                print(f"  ✅ Transaktion gespeichert")
+
+
+INGParser._compile_classifier()
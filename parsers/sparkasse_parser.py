@@ -1,74 +1,122 @@
 # parsers/sparkasse_parser.py
-import pdfplumber
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from .base_parser import BaseParser
+from core.batch import schema
+from core.normalize import amounts_to_floats
+from core.pdf_extractor import (
+    CHARS_BACKEND, BBox, ExtractedDocument, ExtractedPage, PDFSource, TableTemplate, open_document,
+)
+from core.table_engine import extract_table, find_ruled_table
+from core.utils import find_blz, has_line_with
 
-OPTIMAL_SETTINGS = {
-    "vertical_strategy": "lines", 
-    "horizontal_strategy": "text", 
-    "snap_y_tolerance": 8,
-    "join_tolerance": 3,
-}
+# Eine Tabellenzeile nach dem Aufteilen der Zellen: (Datum, Text, Betrag)
+TableLine = Tuple[str, str, Optional[float]]
 
 class SparkasseParser(BaseParser):
-    def parse(self, pdf_path: str) -> List[Dict[str, Any]]:
-        result = []
-        current_transaction = {"Datum": "", "Erläuterung": "", "Betrag": None, "Bemerkung_List": []}
+    bank_name = "sparkasse"
+
+    COLUMNS = schema("Datum", "Erläuterung", "Betrag EUR", "Bemerkung")
+
+    # Tabelle aus Zeichen und Spaltenlinien (core.table_engine), ohne Layout-Analyse
+    EXTRACTION_BACKEND = CHARS_BACKEND
+
+    # Jede Seite mit Buchungen wiederholt den Tabellenkopf
+    TRIAGE_TOKENS = ("Erläuterung Betrag",)
+
+    FINGERPRINTS = [
+        ("header", 0.4, lambda text: "Sparkasse" in text),
+        # Sparkassen-BLZ haben eine 5 an vierter Stelle (z.B. 370 501 98)
+        ("blz", 0.5, lambda text: any(blz[3] == "5" for blz in find_blz(text))),
+        ("table_header", 0.4, lambda text: has_line_with(text, "Erläuterung", "Betrag")),
+    ]
+
+    def extract_page(self, page: ExtractedPage) -> List[TableLine]:
+        return self.parse_page_rows(self.extract_rows(page))
+
+    def extract_rows(self, page: ExtractedPage) -> List[List[str]]:
+        """Extraktionsschritt: Tabellenzeilen der Seite (Zellen, erste Zeile ist der Tabellenkopf)"""
+        return self._extract_table(page)
+
+    def parse_page_rows(self, rows: List[List[str]]) -> List[TableLine]:
+        """Tabelle der Seite in einzelne Zeilen (Datum, Text, Betrag) aufteilen"""
+        # Erste Zeile ist der Tabellenkopf
+        cells = [(row[0], row[1], row[2]) for row in rows[1:] if len(row) >= 3]
+
+        # Beträge der Seite gesammelt normalisieren (leer/ungültig -> None)
+        amounts = amounts_to_floats([amt for _, _, amt in cells])
+        return [(d, desc, amt_clean) for (d, desc, _), amt_clean in zip(cells, amounts)]
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    table = page.extract_table(table_settings=OPTIMAL_SETTINGS)
-                    if not table or len(table) < 2:
-                        continue
-                    for row in table[1:]:
-                        if not row or len(row) < 3:
-                            continue
-                        dates = str(row[0]).split("\n") if row[0] else []
-                        descs = str(row[1]).split("\n") if row[1] else []
-                        amounts = str(row[2]).split("\n") if row[2] else []
-
-                        max_len = max(len(dates), len(descs), len(amounts))
-                        dates += [""] * (max_len - len(dates))
-                        descs += [""] * (max_len - len(descs))
-                        amounts += [""] * (max_len - len(amounts))
-
-                        for d, desc, amt in zip(dates, descs, amounts):
-                            d = d.strip()
-                            desc = desc.strip()
-                            amt_clean = None
-                            if amt and amt.strip():
-                                try:
-                                    amt_clean = float(amt.replace(".", "").replace(",", "."))
-                                except ValueError:
-                                    pass
-
-                            # Start new transaction
-                            if d and amt_clean is not None:
-                                if current_transaction["Datum"]:
-                                    result.append({
-                                        "Datum": current_transaction["Datum"],
-                                        "Erläuterung": current_transaction["Erläuterung"],
-                                        "Betrag EUR": current_transaction["Betrag"],
-                                        "Bemerkung": " | ".join(current_transaction["Bemerkung_List"])
-                                    })
-                                current_transaction = {"Datum": d, "Erläuterung": desc, "Betrag": amt_clean, "Bemerkung_List": []}
-
-                            # Continuation line
-                            elif not d and amt_clean is None and desc:
-                                if current_transaction["Datum"]:
-                                    current_transaction["Bemerkung_List"].append(desc)
-
-                # Final append
-                if current_transaction["Datum"]:
-                    result.append({
-                        "Datum": current_transaction["Datum"],
-                        "Erläuterung": current_transaction["Erläuterung"],
-                        "Betrag EUR": current_transaction["Betrag"],
-                        "Bemerkung": " | ".join(current_transaction["Bemerkung_List"])
-                    })
-
-            return result
-        except Exception as e:
-            print(f"Error processing {pdf_path}: {e}")
+    def parse_rows(self, pages: Iterable[List[List[str]]]) -> List[Dict[str, Any]]:
+        """Wie parse_lines, aber auf Tabellenzeilen pro Seite (wie von dump_rows geliefert)"""
+        return list(self.merge_pages(self.parse_page_rows(rows) for rows in pages))
+
+    def dump_rows(self, source: PDFSource) -> List[List[List[str]]]:
+        """Tabellenzeilen aller Seiten, die die Triage bestehen (Eingabe für parse_rows)"""
+        with open_document(source) as document:
+            return [self.extract_rows(page) for page in self.iter_pages(document)]
+
+    def _extract_table(self, page: ExtractedPage) -> List[List[str]]:
+        """Tabellenzeilen der Seite (siehe _table_bbox)"""
+        found = self._table_bbox(page)
+        if found is None:
             return []
+        template, bbox = found
+        return extract_table(page.raw_chars, template.columns, bbox)
+
+    def _table_bbox(self, page: ExtractedPage) -> Optional[Tuple[TableTemplate, BBox]]:
+        """
+        Template und Lage der Tabelle auf der Seite. Die erste Seite mit
+        Tabelle legt Lage und Spaltengrenzen (aus den senkrechten
+        Tabellenlinien) als Template im Dokument ab; Folgeseiten prüfen nur,
+        ob an diesen Grenzen wieder Linien liegen. Passt das Template nicht,
+        wird die Tabelle der Seite neu gesucht und das Template neu gelernt.
+        """
+        template = page.templates.get(self.bank_name)
+        bbox = page.ruled_bbox(template.columns) if template is not None else None
+        if bbox is None:
+            found = find_ruled_table(page.raw_rules)
+            if found is None:
+                return None
+            bbox, columns = found
+            template = TableTemplate(bbox, columns, page.page_number)
+            page.templates[self.bank_name] = template
+        return template, bbox
+
+    def learn_templates(self, document: ExtractedDocument):
+        """Template von der ersten Seite mit Tabelle, wie im seriellen Durchlauf"""
+        for page in self.iter_pages(document):
+            learned = self._table_bbox(page) is not None
+            page.release()
+            if learned:
+                break
+
+    def merge_pages(self, fragments: Iterable[List[TableLine]]) -> Iterator[Dict[str, Any]]:
+        """Zeilen aller Seiten zu Transaktionen zusammensetzen (Bemerkungen laufen über Seitengrenzen)"""
+        current_transaction = {"Datum": "", "Erläuterung": "", "Betrag": None, "Bemerkung_List": []}
+
+        for lines in fragments:
+            for d, desc, amt_clean in lines:
+                # Start new transaction
+                if d and amt_clean is not None:
+                    if current_transaction["Datum"]:
+                        yield {
+                            "Datum": current_transaction["Datum"],
+                            "Erläuterung": current_transaction["Erläuterung"],
+                            "Betrag EUR": current_transaction["Betrag"],
+                            "Bemerkung": " | ".join(current_transaction["Bemerkung_List"])
+                        }
+                    current_transaction = {"Datum": d, "Erläuterung": desc, "Betrag": amt_clean, "Bemerkung_List": []}
+
+                # Continuation line
+                elif not d and amt_clean is None and desc:
+                    if current_transaction["Datum"]:
+                        current_transaction["Bemerkung_List"].append(desc)
+
+        # Final append
+        if current_transaction["Datum"]:
+            yield {
+                "Datum": current_transaction["Datum"],
+                "Erläuterung": current_transaction["Erläuterung"],
+                "Betrag EUR": current_transaction["Betrag"],
+                "Bemerkung": " | ".join(current_transaction["Bemerkung_List"])
+            }
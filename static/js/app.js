@@ -5,6 +5,7 @@ const API_BASE = window.location.origin;
 let selectedFile = null;
 let currentJobId = null;
 let pollInterval = null;
+let jobEvents = null;
 
 // DOM Elements
 let fileInput, uploadZone, uploadButton, bankSelect, formatSelect;
@@ -267,7 +268,7 @@ async function startUpload() {
         currentJobId = job.job_id;
 
         updateProcessingStatus('PDF wird analysiert...', 33);
-        startPolling();
+        watchJob();
 
     } catch (error) {
         console.error('Upload error:', error);
@@ -275,7 +276,37 @@ async function startUpload() {
     }
 }
 
-// Job Status Polling
+// Job Status: Server-Sent Events, Polling als Fallback
+function watchJob() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    const jobId = currentJobId;
+    jobEvents = new EventSource(`${API_BASE}/api/jobs/${jobId}/events`);
+    jobEvents.addEventListener('status', (event) => {
+        handleJobStatus(JSON.parse(event.data));
+    });
+    jobEvents.onerror = () => {
+        // Stream abgebrochen oder nicht verfügbar (503, Proxy): weiter per Polling
+        if (!jobEvents) return;
+        console.warn('Status stream unavailable, falling back to polling');
+        stopWatching();
+        if (currentJobId === jobId) {
+            startPolling();
+        }
+    };
+}
+
+function stopWatching() {
+    if (jobEvents) {
+        jobEvents.close();
+        jobEvents = null;
+    }
+    stopPolling();
+}
+
 function startPolling() {
     pollInterval = setInterval(checkJobStatus, 2000); // Every 2 seconds
     checkJobStatus(); // First check immediately
@@ -299,36 +330,42 @@ async function checkJobStatus() {
         }
 
         const job = await response.json();
-
-        switch (job.status) {
-            case 'pending':
-                updateProcessingStatus('Warte auf Verarbeitung...', 33);
-                break;
-
-            case 'processing':
-                updateProcessingStatus('PDF wird verarbeitet...', 66);
-                break;
-
-            case 'completed':
-                console.log('Job completed! Showing review state...');
-                stopPolling();
-                await showReview(job);
-                console.log('Review state should be visible now');
-                break;
-
-            case 'failed':
-                stopPolling();
-                showError(job.error_message || 'Verarbeitung fehlgeschlagen');
-                break;
-        }
+        await handleJobStatus(job);
 
     } catch (error) {
         console.error('Status check error:', error);
-        stopPolling();
+        stopWatching();
         showError(error.message);
     }
 }
 
+async function handleJobStatus(job) {
+    // Späte Antwort zu einem bereits verworfenen Job
+    if (job.job_id !== currentJobId) return;
+
+    switch (job.status) {
+        case 'pending':
+            updateProcessingStatus('Warte auf Verarbeitung...', 33);
+            break;
+
+        case 'processing':
+            updateProcessingStatus('PDF wird verarbeitet...', 66);
+            break;
+
+        case 'completed':
+            console.log('Job completed! Showing review state...');
+            stopWatching();
+            await showReview(job);
+            console.log('Review state should be visible now');
+            break;
+
+        case 'failed':
+            stopWatching();
+            showError(job.error_message || 'Verarbeitung fehlgeschlagen');
+            break;
+    }
+}
+
 function updateProcessingStatus(message, progress) {
     document.getElementById('processingStatus').textContent = message;
     document.getElementById('progressFill').style.width = progress + '%';
@@ -421,8 +458,8 @@ async function deleteAndReset() {
 }
 
 function resetToUpload() {
-    // Stop any polling
-    stopPolling();
+    // Stop status stream and polling
+    stopWatching();
 
     // Reset state
     selectedFile = null;
@@ -454,6 +491,13 @@ function resetToUpload() {
 // Review State Functions
 let reviewHeaders = [];
 
+function formatReviewValue(value) {
+    if (value instanceof Date) {
+        return XLSX.SSF.format('dd.mm.yyyy', value);
+    }
+    return String(value || '');
+}
+
 async function showReview(job) {
     console.log('Showing review state for job:', job);
 
@@ -472,7 +516,8 @@ async function showReview(job) {
             console.log('Excel file downloaded, size:', arrayBuffer.byteLength);
 
             // Parse with XLSX library
-            const workbook = XLSX.read(arrayBuffer, { type: 'array' });
+            // cellDates: Datumszellen kommen als Date statt als Excel-Seriennummer
+            const workbook = XLSX.read(arrayBuffer, { type: 'array', cellDates: true });
             const firstSheet = workbook.Sheets[workbook.SheetNames[0]];
 
             // Get data WITHOUT headers (use header: 1 to get raw array)
@@ -494,7 +539,7 @@ async function showReview(job) {
                 reviewData = rawData.slice(1).map(row => {
                     const obj = {};
                     reviewHeaders.forEach((header, index) => {
-                        obj[header] = String(row[index] || '');
+                        obj[header] = formatReviewValue(row[index]);
                     });
                     return obj;
                 });
@@ -0,0 +1,43 @@
+"""
+Gemeinsame Test-Fixtures
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+TESTS_DIR = Path(__file__).resolve().parent
+for path in (ROOT_DIR, TESTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from pdf_factory import db_page, ing_page, sparkasse_page, write_pdf  # noqa: E402
+
+DB_BOOKINGS = [
+    ("28.12.", "SEPA Lastschrift von PayPal", "-12,50", ["PayPal Europe S.a.r.l.", "Ref 123"]),
+    ("02.01.", "Gutschrift Gehalt", "+2.500,00", ["Arbeitgeber GmbH"]),
+]
+ING_BOOKINGS = [
+    ("02.01.2024", "Lastschrift REWE Markt", "-23,45", ["Einkauf Filiale 123"]),
+    ("03.01.2024", "Gutschrift Max Mustermann", "1.000,00", ["Miete Januar"]),
+]
+SPARKASSE_BOOKINGS = [
+    ("02.01.2024", "Lastschrift REWE", "-23,45", ["Einkauf Filiale 123", "Karte 1"]),
+    ("03.01.2024", "Gutschrift Lohn", "1.000,00", ["Arbeitgeber"]),
+]
+
+
+@pytest.fixture
+def db_pdf(tmp_path):
+    return write_pdf(tmp_path / "db.pdf", [db_page(DB_BOOKINGS)])
+
+
+@pytest.fixture
+def ing_pdf(tmp_path):
+    return write_pdf(tmp_path / "ing.pdf", [ing_page(ING_BOOKINGS)])
+
+
+@pytest.fixture
+def sparkasse_pdf(tmp_path):
+    return write_pdf(tmp_path / "sparkasse.pdf", [sparkasse_page(SPARKASSE_BOOKINGS)])
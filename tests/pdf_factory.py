@@ -0,0 +1,270 @@
+"""
+Minimaler PDF-Generator für Tests
+Erzeugt synthetische Kontoauszüge ohne externe Abhängigkeiten (kein reportlab).
+"""
+import random
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+# Fonts: Standard-14 Helvetica (WinAnsi, nicht eingebettet) oder ein
+# eingebetteter Font wie in echten Auszügen (Type0/Identity-H mit
+# ToUnicode-CMap, Breitentabelle und Fontdatei; Glyphenbreiten wie Helvetica)
+HELVETICA = "helvetica"
+CID = "cid"
+
+# Zeichenvorrat des eingebetteten Fonts: Latin-1 und Latin Extended-A/B
+# (vollständig eingebettete westliche Schrift), plus alle verwendeten Zeichen
+CID_CHARSET = [chr(code) for code in range(0x20, 0x250) if not 0x7F <= code < 0xA0]
+
+# (x, top, text) oder (x, top, text, size)
+TextItem = Tuple
+# (x0, top0, x1, top1)
+LineItem = Tuple[float, float, float, float]
+
+
+def _escape(text: str) -> bytes:
+    raw = text.encode("cp1252")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _content_stream(texts: Iterable[TextItem], lines: Iterable[LineItem],
+                    rotated: Iterable[TextItem] = (), encode: Callable[[str], bytes] = _escape) -> bytes:
+    parts: List[bytes] = []
+    for item in texts:
+        x, top, text = item[0], item[1], item[2]
+        size = item[3] if len(item) > 3 else 9
+        y = PAGE_HEIGHT - top - size
+        parts.append(b"BT /F1 %d Tf %.2f %.2f Td " % (size, x, y) + encode(text) + b" Tj ET")
+    for item in rotated:
+        # Um 90° gedreht, von unten nach oben laufend (wie Randtexte in Auszügen)
+        x, top, text = item[0], item[1], item[2]
+        size = item[3] if len(item) > 3 else 9
+        parts.append(b"BT /F1 %d Tf 0 1 -1 0 %.2f %.2f Tm " % (size, x, PAGE_HEIGHT - top) + encode(text) + b" Tj ET")
+    for x0, top0, x1, top1 in lines:
+        parts.append(b"%.2f %.2f m %.2f %.2f l S" % (x0, PAGE_HEIGHT - top0, x1, PAGE_HEIGHT - top1))
+    return b"\n".join(parts)
+
+
+def _stream(data: bytes, attrs: bytes = b"", compress: bool = False) -> bytes:
+    if compress:
+        data = zlib.compress(data)
+        attrs += b" /Filter /FlateDecode"
+    return b"<< /Length %d%s >>\nstream\n" % (len(data), attrs) + data + b"\nendstream"
+
+
+def _to_unicode_cmap(glyphs: Sequence[str]) -> bytes:
+    entries = [b"<%04X> <%04X>" % (cid, ord(char)) for cid, char in enumerate(glyphs, start=1)]
+    blocks = [
+        b"%d beginbfchar\n" % len(entries[i:i + 100]) + b"\n".join(entries[i:i + 100]) + b"\nendbfchar"
+        for i in range(0, len(entries), 100)
+    ]
+    return b"\n".join([
+        b"/CIDInit /ProcSet findresource begin", b"12 dict begin", b"begincmap",
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        b"/CMapName /Adobe-Identity-UCS def", b"/CMapType 2 def",
+        b"1 begincodespacerange", b"<0000> <FFFF>", b"endcodespacerange",
+        *blocks,
+        b"endcmap", b"CMapName currentdict /CMap defineresource pop", b"end", b"end",
+    ])
+
+
+def _add_cid_font(add: Callable[[bytes], int], glyphs: Sequence[str]) -> int:
+    """Type0-Font mit den Glyphen `glyphs` (CID = Position + 1), liefert die Objekt-ID"""
+    from pdfminer.fontmetrics import FONT_METRICS
+    metrics = FONT_METRICS["Helvetica"][1]
+    widths = b" ".join(b"%d" % metrics.get(char, 556) for char in glyphs)
+    # Fontdatei: TrueType-Kopf ohne Tabellen, aufgefüllt auf die Größe eines typischen Subsets
+    filler = random.Random(len(glyphs)).randbytes(24000)
+    font_file = add(_stream(b"\x00\x01\x00\x00" + bytes(8) + filler, b" /Length1 %d" % (12 + len(filler)), compress=True))
+    descriptor = add(
+        b"<< /Type /FontDescriptor /FontName /AAAAAA+Helvetica /Flags 32 /FontBBox [-166 -225 1000 931] "
+        b"/ItalicAngle 0 /Ascent 718 /Descent -207 /CapHeight 718 /StemV 88 /FontFile2 %d 0 R >>" % font_file
+    )
+    descendant = add(
+        b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /AAAAAA+Helvetica "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        b"/FontDescriptor %d 0 R /W [1 [%s]] /CIDToGIDMap /Identity >>" % (descriptor, widths)
+    )
+    to_unicode = add(_stream(_to_unicode_cmap(glyphs), compress=True))
+    return add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /AAAAAA+Helvetica /Encoding /Identity-H "
+        b"/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (descendant, to_unicode)
+    )
+
+
+def build_pdf(pages: Sequence[dict], font: str = HELVETICA, font_per_page: bool = False) -> bytes:
+    """
+    Baut ein PDF aus Seitenbeschreibungen.
+
+    Args:
+        pages: Liste von Dicts mit "texts" (x, top, text[, size]), optional "lines"
+            und "rotated" (gedrehte Texte, gleiche Form wie "texts")
+        font: HELVETICA oder CID (eingebetteter Font, siehe oben)
+        font_per_page: Jede Seite bekommt eigene, inhaltsgleiche Font-Objekte
+            (wie bei Auszügen, die aus Einzelseiten zusammengefügt wurden)
+
+    Returns:
+        PDF als Bytes
+    """
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    used = {char for page in pages for item in page.get("texts", []) + page.get("rotated", []) for char in item[2]}
+    glyphs = sorted(used.union(CID_CHARSET))
+    cids: Dict[str, int] = {char: cid for cid, char in enumerate(glyphs, start=1)}
+
+    def encode(text: str) -> bytes:
+        if font == CID:
+            return b"<" + b"".join(b"%04X" % cids[char] for char in text) + b">"
+        return _escape(text)
+
+    def add_font() -> int:
+        if font == CID:
+            return _add_cid_font(add, glyphs)
+        return add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    catalog_id = add(b"")
+    pages_id = add(b"")
+    font_id = add_font()
+
+    page_ids = []
+    for page in pages:
+        if font_per_page and page_ids:
+            font_id = add_font()
+        stream = _content_stream(page.get("texts", []), page.get("lines", []), page.get("rotated", []), encode)
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, content_id)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(out)
+
+
+def write_pdf(path: Path, pages: Sequence[dict], **options) -> Path:
+    """Schreibt ein synthetisches PDF nach `path` (`options` siehe build_pdf)"""
+    path = Path(path)
+    path.write_bytes(build_pdf(pages, **options))
+    return path
+
+
+def text_width(text: str, size: float = 9) -> float:
+    """Breite eines Helvetica-Strings in Punkten"""
+    from pdfminer.fontmetrics import FONT_METRICS
+    widths = FONT_METRICS["Helvetica"][1]
+    return sum(widths.get(ch, 556) for ch in text) * size / 1000
+
+
+def text_page(lines: Sequence[str], top: float = 60, step: float = 14, x: float = 50) -> dict:
+    """Seite mit einer einfachen Textspalte (eine Zeile pro Eintrag)"""
+    return {"texts": [(x, top + i * step, line) for i, line in enumerate(lines)]}
+
+
+# ---------------------------------------------------------------------------
+# Bank-spezifische Beispielseiten
+# ---------------------------------------------------------------------------
+
+def db_page(bookings: Sequence[Tuple[str, str, str, Sequence[str]]], year: int = 2024,
+            header: Optional[Sequence[str]] = None) -> dict:
+    """
+    Deutsche-Bank-Seite.
+
+    Args:
+        bookings: (datum "DD.MM.", vorgang, betrag "-12,50", verwendungszweck-zeilen)
+    """
+    lines = list(header or ["Deutsche Bank", "Kontoauszug vom 31.12.2024 bis 31.01.2025"])
+    lines.append("Buchung Valuta Vorgang Soll Haben")
+    for datum, vorgang, betrag, extra in bookings:
+        lines.append(f"{datum} {datum} {vorgang} {betrag}")
+        lines.append(f"{year} {year}")
+        lines.extend(extra)
+    lines.append("Auszug 1 Seite 1 von 1 IBAN DE76 1007 0024 0123 4567 00")
+    return text_page(lines)
+
+
+def ing_page(bookings: Sequence[Tuple[str, str, str, Sequence[str]]]) -> dict:
+    """
+    ING-Seite.
+
+    Args:
+        bookings: (datum "DD.MM.YYYY", text, betrag "-12,50", verwendungszweck-zeilen)
+    """
+    lines = [
+        "ING-DiBa AG Theodor-Heuss-Allee 2 60486 Frankfurt am Main",
+        "Girokonto Nummer 1234567890",
+        "IBAN DE12 5001 0517 1234 5678 90 BIC INGDDEFFXXX",
+        "Buchung / Verwendungszweck Betrag (EUR)",
+        "Valuta",
+    ]
+    for datum, text, betrag, extra in bookings:
+        lines.append(f"{datum} {text} {betrag}")
+        lines.append(datum)
+        lines.extend(extra)
+    lines.append("Neuer Saldo 1.234,56")
+    return text_page(lines)
+
+
+SPK_COLUMNS = (40, 120, 460, 560)
+
+
+def sparkasse_page(bookings: Sequence[Tuple[str, str, str, Sequence[str]]],
+                   columns: Sequence[float] = SPK_COLUMNS, segmented: bool = False) -> dict:
+    """
+    Sparkasse-Seite mit Tabellenlinien.
+
+    Args:
+        bookings: (datum "DD.MM.YYYY", erläuterung, betrag "-12,50", bemerkung-zeilen)
+        columns: x-Positionen der senkrechten Tabellenlinien
+        segmented: Spaltenlinien als ein Stück pro Tabellenzeile zeichnen
+    """
+    texts = [
+        (50, 40, "Sparkasse KölnBonn"),
+        (50, 54, "IBAN DE05 3705 0198 0012 3456 78 BIC COLSDE33XXX"),
+        (50, 68, "Kontoauszug 1/2024"),
+    ]
+    top = 110
+    date_x, text_x, right = columns[0] + 2, columns[1] + 5, columns[-1] - 2
+    texts += [(date_x, top, "Datum"), (text_x, top, "Erläuterung"), (right - text_width("Betrag EUR"), top, "Betrag EUR")]
+    top += 16
+    row_bounds = [100]
+    for datum, text, betrag, extra in bookings:
+        row_bounds.append(top - 4)
+        texts += [(date_x, top, datum), (text_x, top, text), (right - text_width(betrag), top, betrag)]
+        top += 12
+        for line in extra:
+            texts.append((text_x, top, line))
+            top += 12
+        top += 4
+    bottom = top + 4
+    if segmented:
+        row_bounds.append(bottom)
+        lines = [(x, start, x, stop) for x in columns for start, stop in zip(row_bounds, row_bounds[1:])]
+    else:
+        lines = [(x, 100, x, bottom) for x in columns]
+    lines += [(columns[0], 100, columns[-1], 100), (columns[0], bottom, columns[-1], bottom)]
+    return {"texts": texts, "lines": lines}
@@ -0,0 +1,86 @@
+"""
+Tests für spaltenorientierte Transaktions-Batches
+"""
+from datetime import date
+
+import pytest
+
+from core.batch import (
+    AMOUNT_EUR, BOOKING_DATE, TransactionBatch, infer_schema, iter_batches, parse_amount, schema,
+)
+from parsers.ing_parser import INGParser
+
+
+def _ing_rows(count):
+    return [
+        {
+            "Datum": f"{n % 28 + 1:02d}.01.2024",
+            "Valuta": f"{n % 28 + 1:02d}.01" if n % 5 == 0 else f"{n % 28 + 1:02d}.01.2024",
+            "Empfänger": f"Händler {n % 7}",
+            "Transaktion": "Lastschrift",
+            "Betrag EUR": -(n + 0.99),
+            "Verwendungszweck": f"Referenz {n}",
+        }
+        for n in range(count)
+    ]
+
+
+def test_round_trip_is_exact():
+    rows = _ing_rows(50)
+    rows[3]["Betrag EUR"] = None
+    rows[4]["Betrag EUR"] = 0.125  # nicht in Cent darstellbar
+    rows[5]["Datum"] = ""
+
+    batch = TransactionBatch.from_rows(rows, INGParser.COLUMNS)
+
+    assert list(batch.rows()) == rows
+    # Sparse Fallback nur für die Ausnahmen
+    assert batch.columns["Betrag EUR"].raw == {4: 0.125}
+    assert set(batch.columns["Datum"].raw) == {5}
+    assert len(batch.columns["Empfänger"].categories) == 7
+
+
+def test_typed_columns_and_roles():
+    batch = TransactionBatch.from_rows(_ing_rows(3), INGParser.COLUMNS)
+
+    assert batch.role(BOOKING_DATE).name == "Datum"
+    assert batch.typed("Datum")[1] == date(2024, 1, 2)
+    assert batch.typed("Valuta")[0] == "01.01"
+    assert batch.columns[batch.role(AMOUNT_EUR).name].cents.tolist() == [-99, -199, -299]
+
+
+def test_iter_batches_and_concat():
+    rows = _ing_rows(10)
+
+    batches = list(iter_batches(rows, INGParser.COLUMNS, size=4))
+    merged = TransactionBatch.concat(batches)
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert list(merged.rows()) == rows
+
+
+def test_extend_rejects_other_schema():
+    batch = TransactionBatch(schema("Datum", "Betrag EUR"))
+
+    with pytest.raises(ValueError):
+        batch.extend(TransactionBatch(schema("Buchungstag", "Betrag EUR")))
+
+
+def test_batch_is_smaller_than_row_dicts():
+    import sys
+
+    rows = _ing_rows(2000)
+    row_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values()) for row in rows)
+
+    batch = TransactionBatch.from_rows(rows, INGParser.COLUMNS)
+
+    assert batch.nbytes() * 3 < row_bytes
+
+
+def test_infer_schema_and_amount_text():
+    columns = infer_schema(["Buchungstag", "Notiz"])
+
+    assert [(c.kind, c.role) for c in columns] == [("date", BOOKING_DATE), ("text", None)]
+    assert parse_amount("-1.234,56 €") == -1234.56
+    assert parse_amount("-12.5") == -12.5
+    assert parse_amount("abc") is None
@@ -0,0 +1,157 @@
+"""
+Tests für den Ergebnis-Cache nach PDF-Hash (Schlüssel, Verschlüsselung, TTL, Größe)
+"""
+import hashlib
+import os
+import shutil
+import time
+
+import pytest
+
+from api.models.job import JobCreate, JobStatus
+from api.services import database, tasks
+from api.services.conversion_cache import ConversionCache, cache_counts
+from api.services.sqlite_store import SQLiteJobStore
+
+ENTRY = {
+    "bank": "ing",
+    "detection": "bic",
+    "pages_total": 2,
+    "pages_skipped": 1,
+    "warnings": [],
+    "transactions": [{"Buchung": "02.01.2024", "Empfänger": "REWE Markt", "Betrag": "-23,45"}],
+}
+HASH = hashlib.sha256(b"auszug").hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache_counts():
+    cache_counts.clear()
+    yield
+    cache_counts.clear()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(tmp_path / "cache", max_bytes=10 ** 6, ttl_seconds=60)
+
+
+def _age(cache, seconds):
+    for path in cache.directory.iterdir():
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+
+def test_entry_round_trip(cache):
+    assert cache.get(HASH, "ing") is None
+    cache.put(HASH, "ing", ENTRY)
+
+    assert cache.get(HASH, "ing") == ENTRY
+    # Andere Bank oder anderes PDF: anderer Schlüssel
+    assert cache.get(HASH, "auto") is None
+    assert cache.get(hashlib.sha256(b"anders").hexdigest(), "ing") is None
+    assert cache_counts.snapshot() == {"hits": 1, "misses": 3, "stores": 1, "evictions": 0}
+
+
+def test_entries_are_encrypted(cache):
+    cache.put(HASH, "ing", ENTRY)
+    (path,) = cache.directory.iterdir()
+
+    data = path.read_bytes()
+    assert b"REWE" not in data and HASH.encode() not in data and HASH not in path.name
+
+    # Manipulierte Einträge werden verworfen
+    path.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+    assert cache.get(HASH, "ing") is None
+    assert not path.exists()
+
+
+def test_keys_need_the_server_secret(tmp_path):
+    directory = tmp_path / "cache"
+    ConversionCache(directory, 10 ** 6, 60, secret="geheim").put(HASH, "ing", ENTRY)
+
+    # Derselbe PDF-Hash mit anderem Geheimnis: Eintrag weder auffindbar noch lesbar
+    assert ConversionCache(directory, 10 ** 6, 60, secret="anders").get(HASH, "ing") is None
+    assert ConversionCache(directory, 10 ** 6, 60, secret="geheim").get(HASH, "ing") == ENTRY
+
+
+def test_secret_file_is_created_once_and_private(cache):
+    cache.put(HASH, "ing", ENTRY)
+    secret_file = cache.directory.with_name("cache.secret")
+
+    assert secret_file.stat().st_mode & 0o777 == 0o600 and len(secret_file.read_bytes()) == 32
+    assert ConversionCache(cache.directory, 10 ** 6, 60).get(HASH, "ing") == ENTRY
+    assert not list(cache.directory.glob("*.secret"))
+
+
+def test_entries_expire_after_ttl(cache):
+    cache.put(HASH, "ing", ENTRY)
+    _age(cache, 61)
+
+    assert cache.get(HASH, "ing") is None
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_size_cap_evicts_oldest(tmp_path):
+    probe = ConversionCache(tmp_path / "probe", max_bytes=10 ** 6, ttl_seconds=60)
+    probe.put(HASH, "ing", ENTRY)
+    entry_size = next(probe.directory.iterdir()).stat().st_size
+
+    cache = ConversionCache(tmp_path / "cache", max_bytes=int(entry_size * 2.5), ttl_seconds=60)
+    hashes = [hashlib.sha256(str(n).encode()).hexdigest() for n in range(3)]
+    for age, content_hash in zip((30, 20, 10), hashes):
+        cache.put(content_hash, "ing", ENTRY)
+        os.utime(cache._derive(content_hash, "ing")[0], (time.time() - age, time.time() - age))
+    cache.evict()
+
+    assert cache.get(hashes[0], "ing") is None
+    assert cache.get(hashes[1], "ing") == cache.get(hashes[2], "ing") == ENTRY
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] >= 1
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ConversionCache(tmp_path / "cache", max_bytes=0, ttl_seconds=60)
+    cache.put(HASH, "ing", ENTRY)
+    assert cache.get(HASH, "ing") is None and not cache.directory.exists()
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(tasks, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(tasks, "conversion_cache", ConversionCache(tmp_path / "cache", 10 ** 6, 60))
+    previous = database.set_store(SQLiteJobStore(tmp_path / "jobs.db"))
+    database.init_db()
+    yield tmp_path / "uploads"
+    database.close_connections()
+    database.set_store(previous)
+
+
+def _run(upload_dir, pdf_path, output_format):
+    job = database.create_job(JobCreate(bank="auto", output_format=output_format))
+    (upload_dir / job.job_id).mkdir(parents=True)
+    shutil.copy(pdf_path, upload_dir / job.job_id / "input.pdf")
+    content_hash = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+    return job.job_id, tasks.process_pdf_task(job.job_id, "auto", content_hash)
+
+
+def test_reupload_completes_from_cache_without_opening_pdf(worker, ing_pdf, monkeypatch):
+    job_id, first = _run(worker, ing_pdf, "jsonl")
+    assert first["status"] == "completed" and not first["cached"]
+
+    def no_pdf(*args, **kwargs):
+        raise AssertionError("PDF darf bei einem Cache-Treffer nicht geöffnet werden")
+
+    monkeypatch.setattr(tasks, "ExtractedDocument", no_pdf)
+    cached_id, second = _run(worker, ing_pdf, "jsonl")
+
+    assert second["cached"] and second["status"] == "completed"
+    assert {key: second[key] for key in ("bank", "detection", "transactions_count", "pages_total")} == \
+        {key: first[key] for key in ("bank", "detection", "transactions_count", "pages_total")}
+    assert (worker / cached_id / "output.jsonl").read_bytes() == (worker / job_id / "output.jsonl").read_bytes()
+    assert not (worker / cached_id / "input.pdf").exists()
+    assert database.get_job(cached_id).status == JobStatus.COMPLETED
+    assert second["conversion_cache"]["hits"] == 1
+
+    # Anderes Ausgabeformat trifft denselben Eintrag
+    _, csv_result = _run(worker, ing_pdf, "csv")
+    assert csv_result["cached"] and csv_result["transactions_count"] == first["transactions_count"]
@@ -0,0 +1,172 @@
+"""
+Tests für core/ (Extraktion, Dispatcher)
+"""
+import pdfplumber
+import pytest
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+from core.dispatcher import detect_bank, get_parser
+from core.pdf_extractor import ExtractedDocument, open_document
+from pdf_factory import db_page, write_pdf
+
+
+@pytest.fixture
+def pdfplumber_calls(monkeypatch):
+    """Zählt pdfplumber.open, extract_text, extract_table und interpretierte Seiten"""
+    calls = {"open": 0, "extract_text": 0, "extract_table": 0, "process_page": 0}
+
+    original_open = pdfplumber.open
+    original_text = pdfplumber.page.Page.extract_text
+    original_table = pdfplumber.page.Page.extract_table
+    original_process_page = PDFPageInterpreter.process_page
+
+    def counting_open(*args, **kwargs):
+        calls["open"] += 1
+        return original_open(*args, **kwargs)
+
+    def counting_text(self, *args, **kwargs):
+        calls["extract_text"] += 1
+        return original_text(self, *args, **kwargs)
+
+    def counting_table(self, *args, **kwargs):
+        calls["extract_table"] += 1
+        return original_table(self, *args, **kwargs)
+
+    def counting_process_page(self, *args, **kwargs):
+        calls["process_page"] += 1
+        return original_process_page(self, *args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, "open", counting_open)
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_text", counting_text)
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_table", counting_table)
+    monkeypatch.setattr(PDFPageInterpreter, "process_page", counting_process_page)
+    return calls
+
+
+def test_page_text_is_cached(db_pdf, pdfplumber_calls):
+    with ExtractedDocument(db_pdf) as document:
+        page = document.pages[0]
+        assert page.text() == page.text(x_tolerance=3)
+        assert page.lines() is page.lines()
+
+    assert pdfplumber_calls == {"open": 1, "extract_text": 1, "extract_table": 0, "process_page": 1}
+
+
+def test_open_document_keeps_shared_document_open(db_pdf):
+    with ExtractedDocument(db_pdf) as document:
+        with open_document(document) as shared:
+            assert shared is document
+        # Nach dem inneren Block noch nutzbar
+        assert len(document.pages) == 1
+
+
+def test_detect_and_parse_share_one_layout_pass(tmp_path, pdfplumber_calls):
+    pdf_path = write_pdf(tmp_path / "db.pdf", [
+        db_page([("28.12.", "Lastschrift", "-1,00", [])]),
+        db_page([("29.12.", "Gutschrift", "+2,00", [])]),
+    ])
+
+    with ExtractedDocument(pdf_path) as document:
+        detection = detect_bank(document)
+        transactions = get_parser(detection.bank).parse(document)
+
+    assert detection.bank == "deutsche_bank"
+    assert len(transactions) == 2
+    assert pdfplumber_calls["open"] == 1
+    # Erkennung layoutet Seite 1 mit pdfplumber, der Parser liest Seite 2 nur als Zeichen
+    assert pdfplumber_calls["extract_text"] == 1
+    assert pdfplumber_calls["process_page"] == 2  # jede Seite genau einmal interpretiert
+    assert pdfplumber_calls["extract_table"] == 0
+
+
+def test_dispatcher_import_does_not_load_parsers_or_pdfplumber():
+    import subprocess
+    import sys
+    from conftest import ROOT_DIR
+
+    code = (
+        "import sys, core.dispatcher; "
+        "print(sorted(m for m in sys.modules if m.startswith(('parsers.', 'pdfplumber'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True)
+
+    assert result.stdout.strip() == "['parsers.base_parser']"
+
+
+@pytest.mark.parametrize("alias, bank_name", [
+    ("Sparkasse", "sparkasse"),
+    ("ING", "ing"),
+    ("db", "deutsche_bank"),
+    ("Deutsche Bank", "deutsche_bank"),
+])
+def test_get_parser_resolves_aliases(alias, bank_name):
+    assert get_parser(alias).bank_name == bank_name
+
+
+def test_get_parser_rejects_unknown_bank():
+    with pytest.raises(ValueError):
+        get_parser("commerzbank")
+
+
+def test_entry_point_parsers_join_auto_detection(monkeypatch, db_pdf):
+    from importlib.metadata import EntryPoint
+    from core import registry as registry_module
+    from parsers.base_parser import Detection
+
+    class ThirdPartyParser:
+        bank_name = "testbank"
+        aliases = ("tb",)
+
+        @classmethod
+        def detect(cls, first_page):
+            return Detection(cls.bank_name, 1.0, ["header"])
+
+    monkeypatch.setattr(registry_module, "ThirdPartyParser", ThirdPartyParser, raising=False)
+    entry_point = EntryPoint("testbank", "core.registry:ThirdPartyParser", registry_module.ENTRY_POINT_GROUP)
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [entry_point])
+
+    registry = registry_module.ParserRegistry()
+    registry.register(registry_module.ParserSpec("ing", "parsers.ing_parser:INGParser"))
+    monkeypatch.setattr("core.dispatcher.registry", registry)
+
+    assert isinstance(get_parser("tb"), ThirdPartyParser)
+    assert detect_bank(db_pdf).bank == "testbank"
+
+
+def test_keyword_matcher_matches_like_substring_search():
+    from core.matcher import KeywordMatcher
+
+    keywords = ["saldo", "seite", "summe belastungen", "iban de76"]
+    matcher = KeywordMatcher(keywords, prefixes=["iban de"], ignore_case=True)
+
+    for line in ["Neuer Saldo", "SEITE 2", "Summe Belastungen 12,00", "IBAN DE12 3456", "x iban de76",
+                 "Lastschrift REWE", "summe gutschriften", "Konto IBAN DE12"]:
+        lower = line.lower()
+        expected = lower.startswith("iban de") or any(keyword in lower for keyword in keywords)
+        assert matcher.search(line) is expected, line
+
+
+def test_replacer_applies_table():
+    from core.matcher import Replacer
+
+    replace = Replacer({"vonvon": "von von", "Einkaufbei": "Einkauf bei", "fuerMonat": "für Monat"})
+
+    assert replace("Einkaufbei REWE fuerMonat Mai vonvon") == "Einkauf bei REWE für Monat Mai von von"
+    assert replace("nichts zu tun") == "nichts zu tun"
+
+
+def test_replacer_keeps_sequential_semantics_for_overlapping_keys():
+    from core.matcher import Replacer
+    from parsers.db_parser import STUCK_WORDS, clean_text
+
+    def sequential(text):
+        for old, new in STUCK_WORDS.items():
+            text = text.replace(old, new)
+        return text
+
+    replace = Replacer(STUCK_WORDS)
+    for text in ["einzugvonvon X", "Lastschrifteinzugvonvon X", "überweisungvonvon", "überweisunganvonvon"]:
+        assert replace(text) == sequential(text), text
+
+    assert clean_text("einzugvonvon X") == "einzug von von X"
+    assert clean_text("überweisungvonvon Max") == "überweisung von von Max"
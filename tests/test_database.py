@@ -0,0 +1,186 @@
+"""
+Tests für den Job-Store, gegen jedes Backend (SQLite, Redis, PostgreSQL)
+
+Redis läuft gegen fakeredis, PostgreSQL gegen TEST_POSTGRES_URL oder, falls
+nicht gesetzt, einen temporären Server aus dem Paket `pgserver`. Fehlt beides,
+werden die Fälle des Backends übersprungen.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from api.config import DATABASE_BUSY_TIMEOUT_MS, DATABASE_POOL_SIZE, JOB_RETENTION_MINUTES
+from api.models.job import JobCreate, JobStatus
+from api.services import database
+from api.services.job_store import create_store
+from api.services.sqlite_store import SQLiteJobStore
+
+BACKENDS = ["sqlite", "redis", "postgres"]
+
+
+@pytest.fixture(scope="session")
+def postgres_url(tmp_path_factory):
+    url = os.getenv("TEST_POSTGRES_URL")
+    if url:
+        yield url
+        return
+    pgserver = pytest.importorskip("pgserver")
+    server = pgserver.get_server(tmp_path_factory.mktemp("postgres"), cleanup_mode="stop")
+    yield server.get_uri()
+
+
+def _sqlite_store(request, tmp_path):
+    return SQLiteJobStore(tmp_path / "jobs.db")
+
+
+def _redis_store(request, tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    from api.services.redis_store import RedisJobStore
+
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    return RedisJobStore("redis://fake", client=client)
+
+
+def _postgres_store(request, tmp_path):
+    pytest.importorskip("psycopg")
+    from api.services.postgres_store import PostgresJobStore
+
+    store = PostgresJobStore(request.getfixturevalue("postgres_url"))
+    store.connection().execute("DROP TABLE IF EXISTS jobs")
+    return store
+
+
+STORES = {"sqlite": _sqlite_store, "redis": _redis_store, "postgres": _postgres_store}
+
+
+@pytest.fixture(params=BACKENDS)
+def store(request, tmp_path):
+    store = STORES[request.param](request, tmp_path)
+    previous = database.set_store(store)
+    database.init_db()
+    yield store
+    database.shutdown_pool()
+    database.set_store(previous)
+
+
+@pytest.fixture
+def sql_store(store):
+    if not hasattr(store, "connection"):
+        pytest.skip("nur SQL-Backends")
+    return store
+
+
+def _in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_store_is_selected_by_url(tmp_path):
+    store = create_store(f"sqlite:///{tmp_path}/jobs.db")
+    assert isinstance(store, SQLiteJobStore) and store.path == tmp_path / "jobs.db"
+    with pytest.raises(ValueError, match="mysql"):
+        create_store("mysql://localhost/jobs")
+
+
+def test_sqlite_connection_uses_wal(tmp_path):
+    conn = SQLiteJobStore(tmp_path / "jobs.db").connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == DATABASE_BUSY_TIMEOUT_MS
+
+
+def test_connection_is_reused_per_thread(sql_store):
+    conn = sql_store.connection()
+    assert sql_store.connection() is conn
+    assert _in_thread(sql_store.connection) is not conn
+
+    # Nach close_connections öffnet jeder Thread neu
+    database.close_connections()
+    assert sql_store.connection() is not conn
+
+
+def test_job_round_trip(store):
+    job = database.create_job(JobCreate(bank="ing"), ip_hash="abc")
+    assert database.get_job(job.job_id) == job
+
+    database.update_job(job.job_id, JobStatus.COMPLETED, bank="ing", pages_total=3, pages_over_budget=1,
+                        warnings=["Seite 2 übersprungen: mehr als 10 Objekte"])
+
+    # Ein anderer Thread (andere Verbindung) sieht den committeten Stand
+    stored = _in_thread(lambda: database.get_job(job.job_id))
+    assert stored.status == JobStatus.COMPLETED and stored.completed_at is not None
+    assert (stored.pages_total, stored.pages_skipped, stored.pages_over_budget) == (3, None, 1)
+    assert stored.warnings == ["Seite 2 übersprungen: mehr als 10 Objekte"]
+    assert stored.download_url == f"/api/download/{job.job_id}"
+    assert database.count_recent_jobs_by_ip("abc") == 1
+    assert database.count_recent_jobs_by_ip("xyz") == 0
+
+    # Ohne Bank wird nur der Status gesetzt
+    database.update_job(job.job_id, JobStatus.FAILED, error_message="kaputt")
+    stored = database.get_job(job.job_id)
+    assert (stored.status, stored.error_message, stored.bank, stored.pages_total) == (JobStatus.FAILED, "kaputt", "ing", 3)
+
+    database.delete_job(job.job_id)
+    assert database.get_job(job.job_id) is None
+
+
+def test_update_of_missing_job_is_ignored(store):
+    database.update_job("unbekannt", JobStatus.PROCESSING)
+    assert database.get_job("unbekannt") is None
+
+
+def test_expired_jobs(store, monkeypatch):
+    job = database.create_job(JobCreate(bank="ing"))
+    assert database.get_expired_jobs() == []
+
+    later = datetime.utcnow() + timedelta(minutes=JOB_RETENTION_MINUTES + 1)
+    clock = type("Later", (datetime,), {"utcnow": staticmethod(lambda: later)})
+    for module in ("api.services.sqlite_store", "api.services.redis_store"):
+        monkeypatch.setattr(f"{module}.datetime", clock)
+    assert database.get_expired_jobs() == [job.job_id]
+
+    database.delete_job(job.job_id)
+    assert database.get_expired_jobs() == []
+
+
+def test_redis_jobs_expire_with_key_ttl(store):
+    if not hasattr(store, "client"):
+        pytest.skip("nur Redis")
+    job = database.create_job(JobCreate(bank="ing"))
+
+    ttl = store.client.ttl(f"k2e:job:{job.job_id}")
+    assert JOB_RETENTION_MINUTES * 60 - 5 <= ttl <= JOB_RETENTION_MINUTES * 60 + 1
+
+
+def test_async_variants_run_on_database_pool(store):
+    async def poll(job_id):
+        names = await asyncio.gather(*(database.run_in_pool(lambda: threading.current_thread().name) for _ in range(8)))
+        return names, await database.get_job_async(job_id)
+
+    job = database.create_job(JobCreate(bank="ing"))
+    names, stored = asyncio.run(poll(job.job_id))
+
+    # Nie auf dem Thread der Event-Loop, höchstens DATABASE_POOL_SIZE Threads
+    assert all(name.startswith("database") for name in names)
+    assert len(set(names)) <= DATABASE_POOL_SIZE
+    assert stored == database.get_job(job.job_id)
+
+
+def test_job_status_route(store):
+    from api.main import app
+
+    async def poll(job_id):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(f"/api/jobs/{job_id}"), await client.get("/api/jobs/unbekannt")
+
+    job = database.create_job(JobCreate(bank="ing"))
+    found, missing = asyncio.run(poll(job.job_id))
+
+    assert found.status_code == 200 and found.json()["status"] == "pending"
+    assert missing.status_code == 404
@@ -0,0 +1,70 @@
+"""
+Tests für den Deutsche Bank Parser
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from parsers.db_parser import DBParser, DBParseContext, parse_full_transaction
+from pdf_factory import db_page, write_pdf
+
+DOCUMENTS = 8
+
+
+def _statement(tmp_path, index):
+    """Auszug mit eigenem Startjahr und Jahreswechsel über die Seitengrenze"""
+    year = 2010 + index
+    return write_pdf(tmp_path / f"db_{index}.pdf", [
+        db_page([
+            ("15.11.", f"Lastschrift Dokument {index}", f"-{index + 1},00", ["Ref A"]),
+            ("28.12.", "Gutschrift", f"+{index + 10},50", []),
+        ], year=year),
+        db_page([
+            ("02.01.", "Kartenzahlung", "-3,99", ["Ref B"]),
+        ], year=year + 1),
+    ])
+
+
+def test_year_rollover_within_document(tmp_path):
+    transactions = DBParser().parse(_statement(tmp_path, 4))
+
+    assert [t["Buchungstag"] for t in transactions] == ["15.11.2014", "28.12.2014", "02.01.2015"]
+
+
+def test_second_document_does_not_inherit_year(tmp_path):
+    parser = DBParser()
+    parser.parse(_statement(tmp_path, 0))
+
+    transactions = parser.parse(_statement(tmp_path, 5))
+
+    assert transactions[0]["Buchungstag"] == "15.11.2015"
+
+
+def test_concurrent_documents_match_serial_parse(tmp_path):
+    paths = [_statement(tmp_path, index) for index in range(DOCUMENTS)]
+    serial = [DBParser().parse(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=DOCUMENTS) as pool:
+        concurrent = list(pool.map(DBParser().parse, paths))
+
+    assert concurrent == serial
+    assert len({result[0]["Buchungstag"] for result in concurrent}) == DOCUMENTS
+
+
+def test_parse_full_transaction_without_context_is_stateless():
+    december = ["28.12. 28.12. Lastschrift -1,00", "2024 2024"]
+    january = ["02.01. 02.01. Lastschrift -1,00", "2024 2024"]
+
+    parse_full_transaction(december, 0)
+    transaction, _ = parse_full_transaction(january, 0)
+
+    assert transaction["Buchungstag"] == "02.01.2024"
+
+
+def test_context_detects_rollover():
+    context = DBParseContext()
+    december = ["28.12. 28.12. Lastschrift -1,00", "2024 2024"]
+    january = ["02.01. 02.01. Lastschrift -1,00", "2024 2024"]
+
+    parse_full_transaction(december, 0, context=context)
+    transaction, _ = parse_full_transaction(january, 0, context=context)
+
+    assert transaction["Buchungstag"] == "02.01.2025"
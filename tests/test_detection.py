@@ -0,0 +1,53 @@
+"""
+Tests für die Bank-Erkennung anhand der ersten Seite
+"""
+import pytest
+
+from core.dispatcher import detect_bank
+from core.pdf_extractor import ExtractedDocument
+from pdf_factory import db_page, text_page, write_pdf
+
+
+@pytest.mark.parametrize("fixture_name, bank", [
+    ("db_pdf", "deutsche_bank"),
+    ("ing_pdf", "ing"),
+    ("sparkasse_pdf", "sparkasse"),
+])
+def test_fingerprint_detects_bank(request, fixture_name, bank):
+    detection = detect_bank(request.getfixturevalue(fixture_name))
+
+    assert detection.bank == bank
+    assert "trial_parse" not in detection.signals
+    assert "table_header" in detection.signals
+
+
+def test_detection_only_reads_first_page(tmp_path, monkeypatch):
+    pages = [db_page([("0%d.01." % (i % 9 + 1), "Lastschrift", "-1,00", [])]) for i in range(20)]
+    pdf_path = write_pdf(tmp_path / "long.pdf", pages)
+
+    with ExtractedDocument(pdf_path) as document:
+        detection = detect_bank(document)
+        layouted = [page.page_number for page in document.pages if page._text_cache]
+
+    assert detection.bank == "deutsche_bank"
+    assert layouted == [1]
+
+
+def test_ambiguous_fingerprint_falls_back_to_trial_parse(tmp_path):
+    # Seite ohne Bank-Merkmale, aber mit parsebarer DB-Tabelle auf Seite 2
+    pdf_path = write_pdf(tmp_path / "anon.pdf", [
+        text_page(["Kontoauszug", "Übersicht"]),
+        db_page([("28.12.", "Lastschrift", "-1,00", [])], header=["Anonym"]),
+    ])
+
+    detection = detect_bank(pdf_path)
+
+    assert detection.bank == "deutsche_bank"
+    assert detection.signals == ["trial_parse"]
+
+
+def test_undetectable_pdf_raises(tmp_path):
+    pdf_path = write_pdf(tmp_path / "empty.pdf", [text_page(["Hallo Welt"])])
+
+    with pytest.raises(ValueError):
+        detect_bank(pdf_path)
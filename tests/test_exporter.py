@@ -0,0 +1,59 @@
+"""
+Tests für den Export
+"""
+import csv
+import json
+from datetime import date
+
+import pytest
+from openpyxl import load_workbook
+
+from core.exporter import XLSX_DATE_FORMAT, XLSX_EUR_FORMAT, export, export_to_excel, read_batch
+
+
+def _rows():
+    return ({"Datum": f"0{n}.01.2024", "Valuta": f"0{n}.01", "Betrag EUR": -n * 1.5} for n in range(1, 4))
+
+
+def test_export_consumes_stream_with_typed_cells(tmp_path):
+    count = export_to_excel(_rows(), str(tmp_path / "out.xlsx"))
+
+    sheet = load_workbook(tmp_path / "out.xlsx").active
+    rows = list(sheet.iter_rows())
+    assert count == 3
+    assert [cell.value for cell in rows[0]] == ["Datum", "Valuta", "Betrag EUR"]
+    datum, valuta, betrag = rows[1]
+    assert datum.value.date() == date(2024, 1, 1) and datum.number_format == XLSX_DATE_FORMAT
+    # Unvollständiges Datum bleibt Text
+    assert valuta.value == "01.01"
+    assert betrag.value == -1.5 and betrag.number_format == XLSX_EUR_FORMAT
+
+
+def test_export_without_transactions_writes_nothing(tmp_path):
+    assert export_to_excel(iter([]), str(tmp_path / "out.xlsx")) == 0
+    assert not (tmp_path / "out.xlsx").exists()
+
+
+def test_csv_and_jsonl_are_selected_by_format(tmp_path):
+    assert export(_rows(), tmp_path / "out.csv") == 3
+    assert export(_rows(), tmp_path / "out.txt", "jsonl") == 3
+
+    with open(tmp_path / "out.csv", encoding="utf-8-sig", newline="") as f:
+        assert list(csv.reader(f))[:2] == [["Datum", "Valuta", "Betrag EUR"], ["2024-01-01", "01.01", "-1.5"]]
+    records = [json.loads(line) for line in (tmp_path / "out.txt").read_text(encoding="utf-8").splitlines()]
+    assert records[2] == {"Datum": "2024-01-03", "Valuta": "03.01", "Betrag EUR": -4.5}
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export(_rows(), tmp_path / "out.pdf", "pdf")
+
+
+@pytest.mark.parametrize("suffix", ["xlsx", "csv", "jsonl"])
+def test_read_batch_round_trip(tmp_path, suffix):
+    path = tmp_path / f"out.{suffix}"
+    export(_rows(), path)
+
+    batch = read_batch(path)
+
+    assert list(batch.rows()) == list(_rows())
@@ -0,0 +1,104 @@
+"""
+Parität der Extraktions-Backends: "chars" (nur Textzeichen über pdfminer)
+muss dieselben Zeilen liefern wie die Layout-Analyse von pdfplumber
+"""
+import random
+
+import pytest
+
+from core.dispatcher import get_parser
+from core.pdf_extractor import CHARS_BACKEND, PDFPLUMBER_BACKEND, ExtractedDocument
+from pdf_factory import db_page, ing_page, sparkasse_page, write_pdf
+from test_parallel import _db_pages, _ing_pages
+
+WORDS = ["Buchung", "Valuta", "28.12.", "-1.234,56", "SEPA", "Lastschrift", "PayPal", "Köln", "(Ref)", "2024"]
+
+
+def _random_pages(count, seed=11):
+    """Frei verteilte Texte in verschiedenen Größen, knapp beieinander liegende Zeilen und gedrehte Randtexte"""
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        texts = []
+        for index in range(rng.randint(1, 40)):
+            top = rng.choice([rng.uniform(20, 800), 60 + index // 3 * 12 + rng.uniform(-2.5, 2.5)])
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + rng.choice(["", "  ", " x"])
+            texts.append((rng.uniform(20, 500), top, text, rng.choice([7, 9, 12])))
+        rotated = [(rng.uniform(5, 590), rng.uniform(100, 800), rng.choice(WORDS)) for _ in range(rng.randint(0, 2))]
+        pages.append({"texts": texts, "rotated": rotated, "lines": [(40, 100, 560, 100)]})
+    return pages
+
+
+@pytest.mark.parametrize("x_tolerance", [1, 3, 5])
+def test_chars_backend_lines_match_pdfplumber(tmp_path, x_tolerance):
+    pages = _random_pages(30) + [
+        db_page([("28.12.", "SEPA Lastschrift", "-12,50", ["PayPal"])]),
+        ing_page([("02.01.2024", "Lastschrift REWE", "-23,45", ["Filiale"])]),
+        sparkasse_page([("02.01.2024", "Lastschrift", "-1,00", ["Karte 1"])]),
+    ]
+    pdf_path = write_pdf(tmp_path / "layout.pdf", pages)
+
+    with ExtractedDocument(pdf_path) as plumber, ExtractedDocument(pdf_path) as chars:
+        for expected, page in zip(plumber.pages, chars.pages):
+            assert page.lines(backend=CHARS_BACKEND, x_tolerance=x_tolerance) == \
+                expected.lines(backend=PDFPLUMBER_BACKEND, x_tolerance=x_tolerance)
+            # Keine Layout-Analyse durch pdfplumber
+            assert not hasattr(page.page, "_layout")
+
+
+def test_cropped_page_matches_on_both_backends(tmp_path):
+    pdf_path = write_pdf(tmp_path / "layout.pdf", _random_pages(10, seed=5))
+    bbox = (60, 95.5, 420, 520)
+
+    with ExtractedDocument(pdf_path) as plumber, ExtractedDocument(pdf_path) as chars:
+        for expected, page in zip(plumber.pages, chars.pages):
+            cropped = page.crop(bbox)
+            assert cropped.lines(backend=CHARS_BACKEND) == expected.crop(bbox).lines(backend=PDFPLUMBER_BACKEND)
+            # Zeichen der ganzen Seite werden nur einmal gelesen und gefiltert
+            assert page._raw_chars is not None and not hasattr(page.page, "_layout")
+
+
+def test_chars_backend_reuses_existing_pdfplumber_layout(db_pdf):
+    with ExtractedDocument(db_pdf) as document:
+        page = document.pages[0]
+        expected = page.lines()
+        assert page.raw_chars is page.raw_chars
+        assert page.lines(backend=CHARS_BACKEND) == expected
+
+
+def test_released_page_is_read_again_on_both_backends(db_pdf):
+    from pdfminer.pdftypes import PDFObjRef
+
+    with ExtractedDocument(db_pdf) as document:
+        page = document.pages[0]
+        expected = (page.lines(), page.lines(backend=CHARS_BACKEND), page.contains_words(["Buchung"]))
+
+        page.release()
+        assert not hasattr(page.page, "_layout") and page._raw_chars is None and not page._lines_cache
+        assert all(isinstance(stream, PDFObjRef) for stream in page.page.page_obj.contents)
+        assert (page.lines(), page.lines(backend=CHARS_BACKEND), page.contains_words(["Buchung"])) == expected
+
+
+def test_chars_backend_rejects_unknown_settings(db_pdf):
+    with ExtractedDocument(db_pdf) as document:
+        page = document.pages[0]
+        with pytest.raises(ValueError):
+            page.lines(backend=CHARS_BACKEND, layout=True)
+        with pytest.raises(ValueError):
+            page.lines(backend="ocr")
+
+
+@pytest.mark.parametrize("bank, pages", [
+    ("deutsche_bank", _db_pages),
+    ("ing", _ing_pages),
+], ids=["deutsche_bank", "ing"])
+def test_parsers_give_same_transactions_on_both_backends(tmp_path, monkeypatch, bank, pages):
+    pdf_path = write_pdf(tmp_path / f"{bank}.pdf", pages())
+    parser = get_parser(bank)
+    assert parser.EXTRACTION_BACKEND == CHARS_BACKEND
+
+    chars = parser.parse(str(pdf_path))
+    monkeypatch.setattr(type(parser), "EXTRACTION_BACKEND", PDFPLUMBER_BACKEND)
+    plumber = parser.parse(str(pdf_path))
+
+    assert chars == plumber and len(chars) == 30
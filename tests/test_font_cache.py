@@ -0,0 +1,108 @@
+"""
+Tests für den Font-Cache (pro Dokument nach Inhalt, über Dokumente per LRU)
+"""
+from pdfminer.pdftypes import PDFObjRef
+
+from core.font_cache import FontCache, _detach
+from core.pdf_extractor import CHARS_BACKEND, ExtractedDocument
+from parsers.sparkasse_parser import SparkasseParser
+from pdf_factory import CID, sparkasse_page, write_pdf
+
+
+def _pages(count=3):
+    return [
+        sparkasse_page([(f"0{n + 1}.02.2024", f"Lastschrift Händler {page}-{n} äß", f"-{n + 1},{page}5", ["Zweck"]) for n in range(3)])
+        for page in range(count)
+    ]
+
+
+def _read(pdf_path, font_cache=None):
+    # Breiten summieren sich je nach Font-Typ in anderer Reihenfolge auf: auf 1/1000 pt runden
+    with ExtractedDocument(pdf_path, font_cache=font_cache) as document:
+        return [
+            ([(char.text, *(round(value, 3) for value in char[1:5])) for char in page.raw_chars],
+             page.lines(backend=CHARS_BACKEND))
+            for page in document.pages
+        ]
+
+
+def _references_document(obj):
+    if isinstance(obj, PDFObjRef):
+        return True
+    if isinstance(obj, dict):
+        return any(_references_document(value) for value in obj.values())
+    if isinstance(obj, list):
+        return any(_references_document(value) for value in obj)
+    return False
+
+
+def test_embedded_font_gives_same_chars_as_standard_font(tmp_path):
+    standard = write_pdf(tmp_path / "standard.pdf", _pages())
+    embedded = write_pdf(tmp_path / "embedded.pdf", _pages(), font=CID)
+
+    assert _read(embedded) == _read(standard)
+    with ExtractedDocument(embedded) as document:
+        assert [page.lines() for page in document.pages] == [lines for _, lines in _read(standard)]
+
+
+def test_identical_fonts_are_built_once_per_document(tmp_path):
+    pdf_path = write_pdf(tmp_path / "merged.pdf", _pages(4), font=CID, font_per_page=True)
+
+    with ExtractedDocument(pdf_path) as document:
+        for page in document.pages:
+            page.raw_chars
+        fonts = document._open().rsrcmgr._cached_fonts
+
+        # Vier Font-Objekte (eins pro Seite), ein PDFFont
+        assert len(fonts) == 4
+        assert len({id(font) for font in fonts.values()}) == 1
+
+
+def test_fonts_are_reused_across_documents(tmp_path):
+    first = write_pdf(tmp_path / "first.pdf", _pages(), font=CID)
+    second = write_pdf(tmp_path / "second.pdf", _pages(2), font=CID)
+    font_cache = FontCache()
+
+    expected = _read(second)
+    _read(first, font_cache)
+    assert (font_cache.hits, len(font_cache)) == (0, 2)  # Type0 + CIDFont
+
+    assert _read(second, font_cache) == expected
+    assert font_cache.hits == 1
+    # Gecachte Fonts halten kein (geschlossenes) Dokument fest
+    for font in font_cache._fonts.values():
+        assert not _references_document(vars(font))
+
+
+def test_font_cache_evicts_least_recently_used(tmp_path):
+    font_cache = FontCache(size=2)
+    for key in (b"a", b"b", b"a", b"c"):
+        if font_cache.get(key) is None:
+            font_cache.put(key, key.decode())
+
+    assert list(font_cache._fonts) == [b"a", b"c"]
+    assert (font_cache.hits, font_cache.misses) == (1, 3)
+
+
+def test_detached_font_spec_has_no_references(tmp_path):
+    pdf_path = write_pdf(tmp_path / "embedded.pdf", _pages(1), font=CID)
+
+    with ExtractedDocument(pdf_path) as document:
+        resources = document.pages[0].page.page_obj.resources
+        spec = _detach(resources["Font"])["F1"]
+
+    assert not _references_document(spec)
+    assert spec["DescendantFonts"][0]["FontDescriptor"]["FontFile2"].get_data().startswith(b"\x00\x01\x00\x00")
+
+
+def test_parser_output_unchanged_with_shared_font_cache(tmp_path):
+    pdf_path = write_pdf(tmp_path / "merged.pdf", _pages(), font=CID, font_per_page=True)
+    parser = SparkasseParser()
+    font_cache = FontCache()
+
+    with ExtractedDocument(pdf_path, font_cache=font_cache) as document:
+        cached = parser.parse(document)
+    with ExtractedDocument(pdf_path, font_cache=font_cache) as document:
+        assert parser.parse(document) == cached
+
+    assert len(cached) == 9 and cached[0]["Erläuterung"] == "Lastschrift Händler 0-0 äß"
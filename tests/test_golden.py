@@ -0,0 +1,74 @@
+"""
+Golden-Tests: Parse-Schritt ohne PDF auf anonymisierten Textzeilen (tests/golden/<bank>.json)
+
+Jede Datei enthält Fälle mit extrahierten Zeilen pro Seite ("lines", siehe
+BaseParser.dump_lines) bzw. Tabellenzeilen ("rows", SparkasseParser.dump_rows)
+und den erwarteten Transaktionen. Nach einer gewollten Regeländerung werden
+die Erwartungen neu geschrieben mit:
+
+    UPDATE_GOLDEN=1 python -m pytest tests/test_golden.py
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from core.dispatcher import get_parser
+from pdf_factory import db_page, ing_page, sparkasse_page, text_page, write_pdf
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+UPDATE = os.getenv("UPDATE_GOLDEN") == "1"
+
+
+def _fixtures():
+    return sorted(GOLDEN_DIR.glob("*.json"))
+
+
+def parse_fixture(parser, fixture, pages):
+    if fixture["format"] == "rows":
+        return parser.parse_rows(pages)
+    return parser.parse_lines(pages)
+
+
+@pytest.mark.parametrize("path", _fixtures(), ids=lambda path: path.stem)
+def test_golden_fixtures(path):
+    fixture = json.loads(path.read_text(encoding="utf-8"))
+    parser = get_parser(fixture["bank"])
+
+    for case in fixture["cases"]:
+        transactions = parse_fixture(parser, fixture, case["pages"])
+        if UPDATE:
+            case["expected"] = transactions
+            continue
+        assert transactions == case["expected"], case["name"]
+
+    if UPDATE:
+        path.write_text(json.dumps(fixture, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def _bookings(page):
+    return [(f"0{n + 1}.02.2024", f"Lastschrift Händler {page}-{n}", f"-{n + 1},{page}5", [f"Zweck {page}-{n}"]) for n in range(3)]
+
+
+STATEMENTS = {
+    "deutsche_bank": lambda page: db_page([(datum[:6], *rest) for datum, *rest in _bookings(page)]),
+    "ing": lambda page: ing_page(_bookings(page)),
+    "sparkasse": lambda page: sparkasse_page(_bookings(page)),
+}
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+def test_dumped_text_reparses_like_pdf(tmp_path, bank):
+    pages = [STATEMENTS[bank](0), text_page(["Wichtige Hinweise"]), STATEMENTS[bank](1)]
+    pdf_path = write_pdf(tmp_path / f"{bank}.pdf", pages)
+    parser = get_parser(bank)
+    fixture = {"format": "rows" if bank == "sparkasse" else "lines"}
+
+    dumped = parser.dump_rows(pdf_path) if fixture["format"] == "rows" else parser.dump_lines(pdf_path)
+
+    # Triage: die Hinweis-Seite wird nicht extrahiert
+    assert len(dumped) == 2
+    # Zwischenformat ist JSON-tauglich (Cache, Fixtures)
+    dumped = json.loads(json.dumps(dumped))
+    assert parse_fixture(parser, fixture, dumped) == parser.parse(str(pdf_path))
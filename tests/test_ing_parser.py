@@ -0,0 +1,65 @@
+"""
+Tests für den ING Parser
+"""
+from conftest import ING_BOOKINGS
+from parsers.ing_parser import INGParser
+
+
+def test_parse_statement(ing_pdf):
+    transactions = INGParser().parse(ing_pdf)
+
+    assert len(transactions) == len(ING_BOOKINGS)
+    assert transactions[0] == {
+        "Datum": "02.01.2024",
+        "Valuta": "02.01.2024",
+        "Empfänger": "REWE Markt",
+        "Transaktion": "Lastschrift",
+        "Betrag EUR": -23.45,
+        "Verwendungszweck": "Einkauf Filiale 123",
+    }
+    assert transactions[1]["Betrag EUR"] == 1000.0
+
+
+def test_classifier_skips_keywords_and_splits_types():
+    lines = [
+        "Kontoauszug Januar",
+        "Buchung / Verwendungszweck Betrag (EUR)",
+        "05.01.2024 Lastschrift VISA-Zahlung DOTT SCOOTER -4,20",
+        "05.01 Mandat M-1",
+        "Saldo Zwischensumme",
+        "Referenz 42",
+        "Neuer Saldo 100,00",
+        "06.01.2024 Gutschrift Nach Tabellenende 1,00",
+    ]
+
+    transactions = INGParser().parse_page_lines(lines)
+
+    assert transactions == [{
+        "Datum": "05.01.2024",
+        "Valuta": "05.01",
+        "Empfänger": "DOTT SCOOTER",
+        "Transaktion": "Lastschrift VISA-Zahlung",
+        "Betrag EUR": -4.2,
+        "Verwendungszweck": "Mandat M-1 | Referenz 42",
+    }]
+
+
+def test_subclass_keywords_are_compiled():
+    class CustomParser(INGParser):
+        SKIP_KEYWORDS = INGParser.SKIP_KEYWORDS + ["interne notiz"]
+        TRANSACTION_TYPES = INGParser.TRANSACTION_TYPES + ["Echtzeitüberweisung"]
+
+    lines = [
+        "Valuta",
+        "07.01.2024 Echtzeitüberweisung Erika Muster -9,99",
+        "07.01.2024",
+        "Interne Notiz 1",
+    ]
+
+    transactions = CustomParser().parse_page_lines(lines)
+
+    assert transactions[0]["Transaktion"] == "Echtzeitüberweisung"
+    assert transactions[0]["Empfänger"] == "Erika Muster"
+    assert transactions[0]["Verwendungszweck"] == ""
+    # Basisklasse bleibt unverändert
+    assert not INGParser._skip_matcher.search("interne notiz 1")
@@ -0,0 +1,150 @@
+"""
+Tests für Job-Events (Redis Pub/Sub) und den SSE-Endpoint
+"""
+import asyncio
+import json
+import shutil
+
+import httpx
+import pytest
+
+from api.models.job import JobCreate, JobStatus
+from api.routes import jobs
+from api.services import database, tasks
+from api.services.job_events import JobEvents
+from api.services.sqlite_store import SQLiteJobStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def store(tmp_path):
+    previous = database.set_store(SQLiteJobStore(tmp_path / "jobs.db"))
+    database.init_db()
+    yield
+    database.shutdown_pool()
+    database.set_store(previous)
+
+
+@pytest.fixture
+def events(monkeypatch):
+    server = fakeredis.FakeServer()
+    events = JobEvents(
+        "redis://fake",
+        client=fakeredis.FakeRedis(server=server, decode_responses=True),
+        async_client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    monkeypatch.setattr(jobs, "job_events", events)
+    monkeypatch.setattr(tasks, "job_events", events)
+    return events
+
+
+def _parse(body: str):
+    """SSE-Body in (event, daten)-Paare; Keepalive-Kommentare getrennt gezählt"""
+    parsed, keepalives = [], 0
+    for block in body.strip().split("\n\n"):
+        if block.startswith(":"):
+            keepalives += 1
+            continue
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed, keepalives
+
+
+async def _get(path):
+    from api.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def _subscribed(events, job_id):
+    # Warten, bis der Endpoint abonniert hat (vorher veröffentlichte Events gingen verloren)
+    channel = events.channel(job_id)
+    while not (await events.async_client.pubsub_numsub(channel))[0][1]:
+        await asyncio.sleep(0.01)
+
+
+def test_stream_sends_current_state_then_changes(store, events):
+    job = database.create_job(JobCreate(bank="ing", output_format="csv"))
+
+    async def run():
+        request = asyncio.create_task(_get(f"/api/jobs/{job.job_id}/events"))
+        await _subscribed(events, job.job_id)
+        for status in (JobStatus.PROCESSING, JobStatus.COMPLETED):
+            await database.update_job_async(job.job_id, status)
+            events.publish(await database.get_job_async(job.job_id))
+        return await asyncio.wait_for(request, 5)
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    parsed, _ = _parse(response.text)
+    assert [(event, data["status"]) for event, data in parsed] == [
+        ("status", "pending"), ("status", "processing"), ("status", "completed")]
+    assert parsed[-1][1]["job_id"] == job.job_id and parsed[-1][1]["output_format"] == "csv"
+
+
+def test_stream_of_finished_job_ends_immediately(store, events):
+    job = database.create_job(JobCreate())
+    database.update_job(job.job_id, JobStatus.FAILED, error_message="kaputt")
+
+    response = asyncio.run(_get(f"/api/jobs/{job.job_id}/events"))
+
+    parsed, _ = _parse(response.text)
+    assert [data["status"] for _, data in parsed] == ["failed"]
+    assert parsed[0][1]["error_message"] == "kaputt"
+
+
+def test_stream_sends_keepalives_and_ends_after_max_seconds(store, events, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_EVENTS_KEEPALIVE_SECONDS", 0.05)
+    monkeypatch.setattr(jobs, "JOB_EVENTS_MAX_SECONDS", 0.3)
+    job = database.create_job(JobCreate())
+
+    response = asyncio.run(_get(f"/api/jobs/{job.job_id}/events"))
+
+    parsed, keepalives = _parse(response.text)
+    assert [data["status"] for _, data in parsed] == ["pending"]
+    assert keepalives >= 2
+
+
+def test_unknown_job_and_missing_redis(store, events, monkeypatch):
+    assert asyncio.run(_get("/api/jobs/gibt-es-nicht/events")).status_code == 404
+    # Das Abo wurde wieder beendet
+    assert events.client.pubsub_numsub(events.channel("gibt-es-nicht")) == [(events.channel("gibt-es-nicht"), 0)]
+
+    job = database.create_job(JobCreate())
+    monkeypatch.setattr(jobs, "job_events", JobEvents(""))
+    assert asyncio.run(_get(f"/api/jobs/{job.job_id}/events")).status_code == 503
+
+    down = fakeredis.FakeServer()
+    down.connected = False
+    monkeypatch.setattr(jobs, "job_events", JobEvents(
+        "redis://fake", async_client=fakeredis.FakeAsyncRedis(server=down)))
+    assert asyncio.run(_get(f"/api/jobs/{job.job_id}/events")).status_code == 503
+
+
+def test_publish_failure_does_not_raise(store):
+    down = fakeredis.FakeServer()
+    down.connected = False
+    job = database.create_job(JobCreate())
+
+    assert JobEvents("redis://fake", client=fakeredis.FakeRedis(server=down)).publish(job) == 0
+
+
+def test_task_publishes_each_state_change(store, events, tmp_path, ing_pdf, monkeypatch):
+    monkeypatch.setattr(tasks, "UPLOAD_DIR", tmp_path / "uploads")
+    job = database.create_job(JobCreate(output_format="jsonl"))
+    (tmp_path / "uploads" / job.job_id).mkdir(parents=True)
+    shutil.copy(ing_pdf, tmp_path / "uploads" / job.job_id / "input.pdf")
+
+    subscriber = events.client.pubsub(ignore_subscribe_messages=True)
+    subscriber.subscribe(events.channel(job.job_id))
+    result = tasks.process_pdf_task(job.job_id, "auto")
+
+    # Die Abo-Bestätigung liefert ein None, deshalb feste Anzahl Versuche
+    messages = [subscriber.get_message(timeout=0.1) for _ in range(4)]
+    published = [json.loads(message["data"]) for message in messages if message]
+    assert result["status"] == "completed"
+    assert [(data["status"], data["bank"]) for data in published] == [("processing", "auto"), ("completed", "ing")]
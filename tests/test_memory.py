@@ -0,0 +1,61 @@
+"""
+Speicher-Regressionstest: der Spitzenwert des RSS beim Parsen darf nicht mit
+der Seitenzahl wachsen (Seiten werden nach dem Lesen freigegeben)
+"""
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+from pdf_factory import db_page, ing_page, sparkasse_page, write_pdf
+
+SHORT, LONG = 10, 100
+
+# Erlaubter Unterschied im RSS-Spitzenwert zwischen kurzem und langem Auszug
+# (Allocator-Rauschen); ohne Freigabe wächst er um 0,2-0,7 MB pro Seite
+MAX_GROWTH_MB = 10
+
+# Misst im eigenen Prozess, damit Imports und vorherige Tests nicht mitzählen
+CHILD = """
+import resource, sys
+sys.path.insert(0, sys.argv[1])
+from core.dispatcher import get_parser
+parser = get_parser(sys.argv[2])
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+count = sum(1 for _ in parser.iter_transactions(sys.argv[3]))
+print(count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+
+
+def _bookings(page):
+    return [(f"{n + 1:02d}.03.2024", f"Lastschrift Händler {page}-{n}", f"-{n + 1},{page % 10}5", [f"Zweck {n}", "Referenz"]) for n in range(12)]
+
+
+PAGES = {
+    "deutsche_bank": lambda page: db_page([(datum[:6], *rest) for datum, *rest in _bookings(page)]),
+    "ing": lambda page: ing_page(_bookings(page)),
+    "sparkasse": lambda page: sparkasse_page(_bookings(page)),
+}
+
+
+def _peak_growth_mb(bank, pdf_path):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, str(ROOT_DIR), bank, str(pdf_path)],
+        capture_output=True, text=True, check=True,
+    )
+    count, growth_kb = map(int, result.stdout.split())
+    return count, growth_kb / 1024
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss in KB nur unter Linux")
+@pytest.mark.parametrize("bank", sorted(PAGES))
+def test_peak_memory_does_not_depend_on_page_count(tmp_path, bank):
+    short = write_pdf(tmp_path / "short.pdf", [PAGES[bank](page) for page in range(SHORT)])
+    long = write_pdf(tmp_path / "long.pdf", [PAGES[bank](page) for page in range(LONG)])
+
+    short_count, short_mb = _peak_growth_mb(bank, short)
+    long_count, long_mb = _peak_growth_mb(bank, long)
+
+    assert (short_count, long_count) == (12 * SHORT, 12 * LONG)
+    assert long_mb - short_mb < MAX_GROWTH_MB, f"{SHORT} Seiten: {short_mb:.1f} MB, {LONG} Seiten: {long_mb:.1f} MB"
@@ -0,0 +1,108 @@
+"""
+Tests für die spaltenweise Normalisierung von Beträgen und Datumsangaben
+"""
+import random
+from datetime import date
+
+import pytest
+
+from core import normalize
+from core.normalize import amount_cents, amounts_to_floats, infer_years, parse_amounts, parse_dates, split_dates
+from parsers.db_parser import DBParseContext
+
+
+@pytest.mark.parametrize("token, cents", [
+    ("-1.234,56", -123456),
+    ("1.234,56-", -123456),
+    ("+12,50", 1250),
+    ("23,45+", 2345),
+    ("−7,00", -700),
+    (" 1 234,5 ", 123450),
+    ("1.000", 100000),
+    ("42", 4200),
+])
+def test_amount_grammar(token, cents):
+    assert amount_cents(token) == cents
+
+
+@pytest.mark.parametrize("token", ["", None, "abc", "1,234", "1,2,3", "-1,00-", "1-,00", ",50", "12,", "١٢,٣٤"])
+def test_invalid_amounts(token):
+    assert amount_cents(token) is None
+
+
+def test_dot_decimal_only_on_request():
+    assert amount_cents("-12.5") == -12500
+    assert amount_cents("-12.5", dot_decimal=True) == -1250
+    assert amount_cents("12.345", dot_decimal=True) is None
+    assert amount_cents("1.234,56", dot_decimal=True) == 123456
+
+
+@pytest.mark.parametrize("dot_decimal", [False, True])
+def test_vectorized_amounts_match_scalar(dot_decimal):
+    rng = random.Random(7)
+    tokens = []
+    for _ in range(5000):
+        if rng.random() < 0.5:
+            value = rng.randint(-10 ** 9, 10 ** 9)
+            text = f"{abs(value) // 100:,}".replace(",", ".") + f",{abs(value) % 100:02d}"
+            tokens.append(("-" + text if rng.random() < 0.5 else text + "-") if value < 0 else text)
+        else:
+            tokens.append("".join(rng.choice("0123456789.,+- −x") for _ in range(rng.randint(0, 9))))
+
+    cents, valid = parse_amounts(tokens, dot_decimal)
+
+    assert len(tokens) >= normalize.VECTOR_MIN_SIZE
+    expected = [amount_cents(token, dot_decimal) for token in tokens]
+    assert [c if ok else None for c, ok in zip(cents.tolist(), valid.tolist())] == expected
+
+
+def test_floats_are_exact_cents():
+    tokens = ["0,10", "0,20", "-1.234,56"] * 40
+    assert amounts_to_floats(tokens)[:3] == [0.1, 0.2, -1234.56]
+    assert amounts_to_floats(["x", "0,30"]) == [None, 0.3]
+
+
+def test_split_dates_formats():
+    tokens = ["28.12.2024", "28.12.", "28.12", "01.02.25", "2024-02-29", "32.01.2024", "x"]
+    day, month, year = split_dates(tokens * 20)
+    assert list(zip(day, month, year))[:7] == [
+        (28, 12, 2024), (28, 12, 0), (28, 12, 0), (1, 2, 2025), (29, 2, 2024), (0, 0, 0), (0, 0, 0),
+    ]
+
+
+def test_dates_infer_year_across_rollover():
+    tokens = ["15.11.", "28.12.", "02.01.", "03.01.", "05.03.2026", "01.02."]
+    ordinals = parse_dates(tokens, last_month=11, last_year=2024)
+    assert [date.fromordinal(o) for o in ordinals.tolist()] == [
+        date(2024, 11, 15), date(2024, 12, 28), date(2025, 1, 2), date(2025, 1, 3),
+        date(2026, 3, 5), date(2027, 2, 1),
+    ]
+    # Kein gültiges Datum (31.02.) -> 0
+    assert parse_dates(["31.02.2024"]).tolist() == [0]
+
+
+def test_infer_years_vectorized_matches_scalar():
+    rng = random.Random(3)
+    months = [rng.randint(1, 12) for _ in range(500)]
+    years = [rng.choice([0] * 9 + [2023]) for _ in range(500)]
+
+    vectorized = infer_years(months, years, last_month=6, last_year=2020).tolist()
+    scalar = [infer_years(months[i:i + 1], years[i:i + 1], *state).tolist()[0]
+              for i, state in _running_states(months, vectorized, 6, 2020)]
+    assert vectorized == scalar
+
+
+def _running_states(months, years, last_month, last_year):
+    for index, month in enumerate(months):
+        yield index, (last_month, last_year)
+        last_month, last_year = month, years[index]
+
+
+def test_context_resolve_years_matches_resolve_year():
+    months = [11, 12, 12, 1, 3, 2, 2, 12, 1]
+    single, page = DBParseContext(), DBParseContext()
+
+    expected = [single.resolve_year(month, 2023) for month in months]
+
+    assert page.resolve_years(months[:4], 2023) + page.resolve_years(months[4:], 1999) == expected
+    assert (page.last_month, page.last_year) == (single.last_month, single.last_year)
@@ -0,0 +1,131 @@
+"""
+Tests für das Arbeitsbudget pro Seite (Seiten darüber werden mit Warnung übersprungen)
+"""
+import pickle
+
+import pytest
+
+from core.dispatcher import detect_bank, get_parser
+from core.page_budget import (
+    CHARS_LIMIT, OBJECTS_LIMIT, SECONDS_LIMIT, BudgetWarning, PageBudget, PageBudgetExceeded, guard_counts,
+)
+from core.parallel import parse_document
+from core.pdf_extractor import CHARS_BACKEND, ExtractedDocument
+from pdf_factory import db_page, ing_page, sparkasse_page, write_pdf
+
+BUDGET = PageBudget(max_chars=5000, max_objects=500)
+
+
+def _bookings(page):
+    return [(f"0{n + 1}.02.2024", f"Lastschrift Händler {page}-{n}", f"-{n + 1},{page}5", [f"Zweck {page}-{n}"]) for n in range(3)]
+
+
+STATEMENTS = {
+    "deutsche_bank": lambda page: db_page([(datum[:6], *rest) for datum, *rest in _bookings(page)]),
+    "ing": lambda page: ing_page(_bookings(page)),
+    "sparkasse": lambda page: sparkasse_page(_bookings(page)),
+}
+
+
+def _vector_glyphs(page):
+    # Text als tausende kleine Pfade (wie bei Auszügen mit Text in Kurven)
+    page["lines"] = page.get("lines", []) + [(50 + n % 400, 500 + n // 400, 51 + n % 400, 500 + n // 400) for n in range(2000)]
+    return page
+
+
+def _char_flood(page):
+    # Zeichensalat, z.B. eine Textebene über einem Scan
+    page["texts"] = page["texts"] + [(20, 400 + n % 300, "x" * 90, 2) for n in range(100)]
+    return page
+
+
+@pytest.fixture(autouse=True)
+def _reset_guard_counts():
+    guard_counts.clear()
+    yield
+    guard_counts.clear()
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+@pytest.mark.parametrize("poison, limit", [(_vector_glyphs, OBJECTS_LIMIT), (_char_flood, CHARS_LIMIT)])
+def test_over_budget_page_is_skipped_with_warning(tmp_path, bank, poison, limit):
+    page = STATEMENTS[bank]
+    pdf_path = write_pdf(tmp_path / "statement.pdf", [page(0), poison(page(1)), page(2)])
+    expected_path = write_pdf(tmp_path / "expected.pdf", [page(0), page(2)])
+    parser = get_parser(bank)
+
+    with ExtractedDocument(pdf_path, budget=BUDGET) as document:
+        transactions = parser.parse(document)
+        (warning,) = document.over_budget[bank].values()
+
+    assert (warning.page_number, warning.limit) == (2, limit)
+    assert warning.message.startswith("Seite 2 übersprungen: mehr als")
+    assert guard_counts.snapshot()[limit] == 1
+    assert len(transactions) == 6
+    assert transactions == parser.parse(str(expected_path))
+
+
+def test_pages_within_budget_are_unchanged(tmp_path):
+    pdf_path = write_pdf(tmp_path / "statement.pdf", [sparkasse_page(_bookings(page)) for page in range(3)])
+    parser = get_parser("sparkasse")
+
+    with ExtractedDocument(pdf_path, budget=BUDGET) as document:
+        assert parser.parse(document) == parser.parse(str(pdf_path))
+        assert document.over_budget["sparkasse"] == {}
+    assert not any(guard_counts.snapshot().values())
+
+
+def test_time_budget_stops_both_backends(tmp_path):
+    pdf_path = write_pdf(tmp_path / "statement.pdf", [ing_page(_bookings(0))])
+
+    with ExtractedDocument(pdf_path, budget=PageBudget(max_seconds=1e-9)) as document:
+        page = document.pages[0]
+        for read in (lambda: page.lines(backend=CHARS_BACKEND), page.text):
+            with pytest.raises(PageBudgetExceeded) as excinfo:
+                read()
+            assert excinfo.value.warning.limit == SECONDS_LIMIT
+        # Abgebrochene Seiten hinterlassen kein halbes Ergebnis
+        assert page._raw_chars is None and not hasattr(page.page, "_layout")
+
+
+def test_budget_exceeded_survives_pickling():
+    # Worker-Prozesse schicken Fehler und Warnungen gepickelt zurück
+    error = PageBudgetExceeded(BudgetWarning(3, OBJECTS_LIMIT, 10))
+    restored = pickle.loads(pickle.dumps(error))
+    assert restored.warning == error.warning
+    assert str(restored) == "Seite 3 übersprungen: mehr als 10 Objekte"
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+def test_parallel_parsing_reports_over_budget_pages(tmp_path, bank):
+    page = STATEMENTS[bank]
+    pages = [page(n) for n in range(8)]
+    pages[5] = _vector_glyphs(pages[5])
+    pdf_path = write_pdf(tmp_path / "statement.pdf", pages)
+    parser = get_parser(bank)
+
+    with ExtractedDocument(pdf_path, budget=BUDGET) as document:
+        serial = parser.parse(document)
+    assert guard_counts.snapshot()[OBJECTS_LIMIT] == 1
+    with ExtractedDocument(pdf_path, budget=BUDGET) as document:
+        parallel = parse_document(parser, document, workers=2, min_pages=2)
+        assert list(document.over_budget[bank]) == [6]
+    # Die Limits aus den Worker-Prozessen landen in den Zählern des Elternprozesses
+    assert guard_counts.snapshot()[OBJECTS_LIMIT] == 2
+
+    assert len(parallel) == 21 and parallel == serial
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+def test_auto_detection_skips_over_budget_first_page(tmp_path, bank):
+    junk = _char_flood({"texts": []})
+    page = STATEMENTS[bank]
+    pdf_path = write_pdf(tmp_path / "statement.pdf", [junk, page(1), page(2)])
+
+    with ExtractedDocument(pdf_path, budget=BUDGET) as document:
+        detection = detect_bank(document)
+        transactions = get_parser(detection.bank).parse(document)
+
+        assert detection.bank == bank
+        assert document.over_budget[bank][1].limit == CHARS_LIMIT
+    assert len(transactions) == 6
@@ -0,0 +1,93 @@
+"""
+Tests für den Sparkasse-Parser (Tabellen-Template über mehrere Seiten)
+"""
+import pytest
+
+from core.pdf_extractor import ExtractedDocument, ExtractedPage
+from parsers.sparkasse_parser import SparkasseParser
+from pdf_factory import SPK_COLUMNS, sparkasse_page, write_pdf
+
+
+def _bookings(page, count=4):
+    return [
+        (f"0{n + 1}.02.2024", f"Lastschrift Händler {page}-{n}", f"-{n + 1}2,{page}5", [f"Bemerkung {page}-{n}"])
+        for n in range(count)
+    ]
+
+
+def _parse_without_template(parser, document):
+    # Jede Seite für sich: volle Tabellen-Erkennung, kein geteiltes Template
+    pages = (ExtractedPage(page.page, page.page_number) for page in document.pages)
+    return list(parser.merge_pages(parser.extract_page(page) for page in pages))
+
+
+def test_template_is_learned_once_and_reused(tmp_path):
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf", [sparkasse_page(_bookings(page)) for page in range(4)])
+    parser = SparkasseParser()
+
+    with ExtractedDocument(pdf_path) as document:
+        transactions = parser.parse(document)
+
+        template = document.templates["sparkasse"]
+        assert template.page_number == 1
+        assert template.columns == SPK_COLUMNS
+        # Nur Zeichen und Linien gelesen, keine Layout-Analyse durch pdfplumber
+        assert all(not hasattr(page.page, "_layout") for page in document.pages)
+
+    with ExtractedDocument(pdf_path) as document:
+        assert transactions == _parse_without_template(parser, document)
+    assert len(transactions) == 16
+    assert transactions[5] == {
+        "Datum": "02.02.2024", "Erläuterung": "Lastschrift Händler 1-1", "Betrag EUR": -22.15, "Bemerkung": "Bemerkung 1-1",
+    }
+
+
+def test_changed_layout_falls_back_and_relearns(tmp_path):
+    shifted = (30, 150, 470, 565)
+    pages = [
+        sparkasse_page(_bookings(0)),
+        {"texts": [(50, 60, "Wichtige Hinweise zu Ihrem Konto")]},
+        sparkasse_page(_bookings(2), columns=shifted),
+        sparkasse_page(_bookings(3), columns=shifted),
+    ]
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf", pages)
+    parser = SparkasseParser()
+
+    with ExtractedDocument(pdf_path) as document:
+        transactions = parser.parse(document)
+
+        template = document.templates["sparkasse"]
+        assert (template.columns, template.page_number) == (shifted, 3)
+
+    with ExtractedDocument(pdf_path) as document:
+        assert transactions == _parse_without_template(parser, document)
+    assert len(transactions) == 12
+
+
+def test_column_rules_drawn_per_row(tmp_path):
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf",
+                         [sparkasse_page(_bookings(page, count=5), segmented=True) for page in range(2)])
+
+    with ExtractedDocument(pdf_path) as document:
+        transactions = SparkasseParser().parse(document)
+        assert document.templates["sparkasse"].page_number == 1
+
+    assert len(transactions) == 10
+    assert transactions[0]["Erläuterung"] == "Lastschrift Händler 0-0"
+
+
+def test_failing_page_aborts_instead_of_truncating(tmp_path, monkeypatch):
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf", [sparkasse_page(_bookings(page)) for page in range(3)])
+    parser = SparkasseParser()
+    extract_rows = SparkasseParser.extract_rows
+
+    def broken_second_page(self, page):
+        if page.page_number == 2:
+            raise RuntimeError("Seite kaputt")
+        return extract_rows(self, page)
+
+    monkeypatch.setattr(SparkasseParser, "extract_rows", broken_second_page)
+
+    with ExtractedDocument(pdf_path) as document:
+        with pytest.raises(RuntimeError, match="Seite kaputt"):
+            parser.parse(document)
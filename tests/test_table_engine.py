@@ -0,0 +1,110 @@
+"""
+Tests für die Tabellen-Engine (Zeilen/Spalten aus Zeichen-Koordinaten)
+"""
+import numpy as np
+import pytest
+
+from core.pdf_extractor import ExtractedDocument, RawChar, RawRule
+from core.table_engine import (
+    Boxes, assign_columns, chars_to_words, cluster_rows, extract_table, find_ruled_table, merge_rules, table_rows,
+)
+from pdf_factory import SPK_COLUMNS, sparkasse_page, write_pdf
+
+
+def _chars(text, x, top, width=5.0, height=9.0):
+    return [RawChar(ch, x + i * width, x + (i + 1) * width, top, top + height, True) for i, ch in enumerate(text)]
+
+
+def test_cluster_rows_chains_within_tolerance():
+    top = np.array([50.0, 10.0, 12.5, 14.0, 30.0, 50.0])
+
+    assert cluster_rows(top, 3).tolist() == [2, 0, 0, 0, 1, 2]
+    assert cluster_rows(top, 1).tolist() == [4, 0, 1, 2, 3, 4]
+
+
+def test_assign_columns_by_center():
+    x0 = np.array([0.0, 41.0, 118.0, 130.0, 555.0, 600.0])
+    x1 = x0 + 4
+
+    assert assign_columns(x0, x1, SPK_COLUMNS).tolist() == [-1, 0, 1, 1, 2, -1]
+
+
+def test_chars_to_words_splits_on_spaces_and_gaps():
+    chars = _chars("SEPA Lastschrift", 100, 20) + _chars("ﬁx", 300, 21) + _chars("-1,00", 200, 19.5)
+
+    words = chars_to_words(Boxes.from_chars(chars))
+
+    assert words.text == ["SEPA", "Lastschrift", "-1,00", "fix"]
+    assert words.x0[1] == 125 and words.x1[1] == 180
+
+
+def test_table_rows_from_words():
+    words = Boxes.from_words([
+        {"x0": 130, "x1": 180, "top": 30, "bottom": 39, "text": "Karte"},
+        {"x0": 42, "x1": 90, "top": 10, "bottom": 19, "text": "02.01.2024"},
+        {"x0": 125, "x1": 170, "top": 11, "bottom": 20, "text": "REWE"},
+        {"x0": 180, "x1": 200, "top": 10, "bottom": 19, "text": "Markt"},
+        {"x0": 520, "x1": 555, "top": 10, "bottom": 19, "text": "-23,45"},
+        {"x0": 600, "x1": 620, "top": 10, "bottom": 19, "text": "Rand"},
+    ])
+
+    assert table_rows(words, SPK_COLUMNS) == [
+        ["02.01.2024", "REWE Markt", "-23,45"],
+        ["", "Karte", ""],
+    ]
+
+
+def test_find_ruled_table_picks_group_with_most_columns():
+    rules = [RawRule(x, 100, 400) for x in (40, 120, 121.5, 460, 560)] + [RawRule(300, 20, 60), RawRule(500, 20, 60)]
+
+    assert find_ruled_table(rules) == ((40.0, 100.0, 560.0, 400.0), (40.0, 120.0, 460.0, 560.0))
+    assert find_ruled_table(rules[:1]) is None
+
+
+def test_find_ruled_table_joins_segments_per_row():
+    # Spaltenlinien als ein Stück pro Zeile, mit kleinen Lücken und etwas Versatz in x
+    rows = [(100, 130), (131, 160), (160, 200), (202, 400)]
+    rules = [RawRule(x + (0.5 if n % 2 else 0), start, stop)
+             for x in (40, 120, 460, 560) for n, (start, stop) in enumerate(rows)]
+
+    assert [(rule.top, rule.bottom) for rule in merge_rules(rules)] == [(100, 400)] * 4
+    assert find_ruled_table(rules) == ((40.0, 100.0, 560.0, 400.0), (40.0, 120.0, 460.0, 560.0))
+    # Größere Lücken trennen die Linien
+    assert len(merge_rules([RawRule(40, 100, 130), RawRule(40, 140, 200)])) == 2
+
+
+def test_segmented_rules_from_pdf(tmp_path):
+    bookings = [(f"0{n + 1}.01.2024", f"Lastschrift {n}", f"-{n + 1},00", ["Zweck"]) for n in range(5)]
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf", [sparkasse_page(bookings, segmented=True)])
+
+    with ExtractedDocument(pdf_path) as document:
+        page = document.pages[0]
+        bbox, columns = find_ruled_table(page.raw_rules)
+        rows = extract_table(page.raw_chars, columns, bbox)
+
+    assert columns == SPK_COLUMNS
+    assert [row[0] for row in rows if row[0]] == ["Datum"] + [datum for datum, *_ in bookings]
+
+
+@pytest.mark.parametrize("extra", [[], ["Einkauf Filiale 123", "Karte 1  (Kontaktlos)"]])
+def test_matches_pdfplumber_table_line_by_line(tmp_path, extra):
+    bookings = [
+        ("02.01.2024", "Lastschrift REWE", "-1.023,45", extra),
+        ("03.01.2024", "Gutschrift  Lohn", "1.000,00", []),
+    ]
+    pdf_path = write_pdf(tmp_path / "sparkasse.pdf", [sparkasse_page(bookings)])
+    settings = {"vertical_strategy": "lines", "horizontal_strategy": "text", "snap_y_tolerance": 8, "join_tolerance": 3}
+
+    with ExtractedDocument(pdf_path) as document:
+        page = document.pages[0]
+        bbox, columns = find_ruled_table(page.raw_rules)
+        rows = extract_table(page.raw_chars, columns, bbox)
+
+        expected = []
+        for row in page.table(settings):
+            cells = [(cell or "").split("\n") for cell in row]
+            depth = max(len(lines) for lines in cells)
+            expected += [[lines[i] if i < len(lines) else "" for lines in cells] for i in range(depth)]
+
+    assert columns == SPK_COLUMNS
+    assert rows == expected
@@ -0,0 +1,92 @@
+"""
+Tests für die Seiten-Triage (Seiten ohne Buchungen werden vor der Layout-Analyse übersprungen)
+"""
+import pytest
+
+import core.pdf_extractor
+from core.dispatcher import get_parser
+from core.parallel import parse_document
+from core.pdf_extractor import ExtractedDocument
+from pdf_factory import db_page, ing_page, sparkasse_page, text_page, write_pdf
+
+BOILERPLATE = [
+    text_page(["Wichtige Hinweise", "Bitte prüfen Sie die Buchungen Ihres Kontoauszugs."]),
+    text_page(["Einlagensicherung", "Informationsbogen für den Einleger", "Allgemeine Geschäftsbedingungen (AGB)"]),
+]
+
+
+def _bookings(page):
+    return [(f"0{n + 1}.02.2024", f"Lastschrift Händler {page}-{n}", f"-{n + 1},{page}5", [f"Zweck {page}-{n}"]) for n in range(3)]
+
+
+def _db_bookings(page):
+    # Deutsche Bank: Datum ohne Jahr ("DD.MM.")
+    return [(datum[:6], vorgang, betrag, extra) for datum, vorgang, betrag, extra in _bookings(page)]
+
+
+STATEMENTS = {
+    "deutsche_bank": lambda page: db_page(_db_bookings(page)),
+    "ing": lambda page: ing_page(_bookings(page)),
+    "sparkasse": lambda page: sparkasse_page(_bookings(page)),
+}
+
+
+def _statement(bank):
+    # Buchungsseiten mit Hinweis-/AGB-Seiten dazwischen und am Ende
+    page = STATEMENTS[bank]
+    return [page(0), BOILERPLATE[0], page(1), page(2), *BOILERPLATE]
+
+
+def test_contains_words_reads_content_stream_only(tmp_path):
+    pdf_path = write_pdf(tmp_path / "doc.pdf", [ing_page(_bookings(0)), BOILERPLATE[1]])
+
+    with ExtractedDocument(pdf_path) as document:
+        statement, boilerplate = document.pages
+        assert statement.contains_words(["buchung", "/", "VERWENDUNGSZWECK"])
+        assert statement.contains_words(["Betrag(EUR)"])
+        assert boilerplate.contains_words(["Geschäftsbedingungen", "(AGB)"])
+        assert not boilerplate.contains_words(["Einlagensicherung", "Valuta"])
+        # Bekanntes Encoding (WinAnsi): weder Zeichen interpretiert noch layoutet
+        assert statement._raw_chars is None and not hasattr(statement.page, "_layout")
+
+
+def test_contains_words_falls_back_to_chars(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.pdf_extractor, "_content_text", lambda page: None)
+    pdf_path = write_pdf(tmp_path / "doc.pdf", [sparkasse_page(_bookings(0)), BOILERPLATE[0]])
+
+    with ExtractedDocument(pdf_path) as document:
+        statement, boilerplate = document.pages
+        assert statement.contains_words(["Erläuterung", "Betrag"])
+        assert not boilerplate.contains_words(["Erläuterung", "Betrag"])
+        # Die gelesenen Zeichen stehen dem Parser danach zur Verfügung
+        assert statement._raw_chars is not None
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+def test_boilerplate_pages_are_skipped_without_layout(tmp_path, monkeypatch, bank):
+    pdf_path = write_pdf(tmp_path / f"{bank}.pdf", _statement(bank))
+    parser = get_parser(bank)
+
+    with ExtractedDocument(pdf_path) as document:
+        transactions = parser.parse(document)
+
+        assert document.skipped_pages[bank] == {2, 5, 6}
+        for number in (2, 5, 6):
+            page = document.pages[number - 1]
+            assert not hasattr(page.page, "_layout") and page._raw_chars is None
+
+    monkeypatch.setattr(type(parser), "TRIAGE_TOKENS", ())
+    assert len(transactions) == 9
+    assert transactions == parser.parse(str(pdf_path))
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENTS))
+def test_parallel_parsing_reports_skipped_pages(tmp_path, bank):
+    pdf_path = write_pdf(tmp_path / f"{bank}.pdf", _statement(bank) * 2)
+    parser = get_parser(bank)
+
+    with ExtractedDocument(pdf_path) as document:
+        parallel = parse_document(parser, document, workers=2, min_pages=2)
+        assert document.skipped_pages[bank] == {2, 5, 6, 8, 11, 12}
+
+    assert parallel == parser.parse(str(pdf_path))
@@ -0,0 +1,151 @@
+"""
+Tests für den Streaming-Upload (Größenlimit, PDF-Prüfung, SHA-256)
+"""
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from api.routes import upload
+from api.services import database
+from api.services.sqlite_store import SQLiteJobStore
+from api.services.upload_stream import UploadRejected, receive_pdf_upload
+from pdf_factory import build_pdf, text_page
+
+BOUNDARY = "k2e-boundary"
+
+
+def _multipart(content: bytes, filename="auszug.pdf", fields=(("bank", "ing"), ("output_format", "csv"))):
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode()
+    tail = b"".join(f"\r\n--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}".encode()
+                    for name, value in fields)
+    return head + content + tail + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+class Body:
+    """Body in Chunks, zählt, wie viel davon gelesen wurde"""
+
+    def __init__(self, data: bytes, chunk_size: int = 4096):
+        self.chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+        self.read = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+@pytest.fixture
+def pdf_bytes():
+    return build_pdf([text_page(["Kontoauszug"]), text_page(["Seite 2"])])
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(upload, "INCOMING_DIR", tmp_path / ".incoming")
+    previous = database.set_store(SQLiteJobStore(tmp_path / "jobs.db"))
+    database.init_db()
+    yield tmp_path
+    database.shutdown_pool()
+    database.set_store(previous)
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(upload.process_pdf_task, "delay", lambda *args: calls.append(args))
+    return calls
+
+
+def _post(content, headers=None):
+    from api.main import app
+
+    async def send():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/api/upload", content=content, headers={
+                "content-type": f"multipart/form-data; boundary={BOUNDARY}", **(headers or {})})
+
+    return asyncio.run(send())
+
+
+def _request(body: Body, headers=()):
+    chunks = body.__aiter__()
+
+    async def receive():
+        try:
+            return {"type": "http.request", "body": await chunks.__anext__(), "more_body": True}
+        except StopAsyncIteration:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/api/upload", "headers": [
+        (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()), *headers]}
+    return Request(scope, receive)
+
+
+def test_upload_is_streamed_into_job_directory(upload_dir, queued, pdf_bytes):
+    response = _post(_multipart(pdf_bytes))
+
+    assert response.status_code == 200
+    job = response.json()
+    assert (job["bank"], job["output_format"]) == ("ing", "csv")
+    assert (upload_dir / job["job_id"] / "input.pdf").read_bytes() == pdf_bytes
+    assert queued == [(job["job_id"], "ing", hashlib.sha256(pdf_bytes).hexdigest())]
+    assert list((upload_dir / ".incoming").iterdir()) == []
+
+
+def test_upload_reports_hash_and_pages(tmp_path, pdf_bytes):
+    stored = asyncio.run(receive_pdf_upload(_request(Body(_multipart(pdf_bytes), chunk_size=100)), tmp_path, 10 ** 6, 10))
+
+    assert stored.sha256 == hashlib.sha256(pdf_bytes).hexdigest()
+    assert (stored.size, stored.page_count, stored.filename) == (len(pdf_bytes), 2, "auszug.pdf")
+    assert stored.fields == {"bank": "ing", "output_format": "csv"}
+    assert stored.path.read_bytes() == pdf_bytes
+
+
+def test_oversized_upload_stops_reading(tmp_path, pdf_bytes):
+    body = Body(_multipart(pdf_bytes + b"%" * 200_000))
+
+    with pytest.raises(UploadRejected) as excinfo:
+        asyncio.run(receive_pdf_upload(_request(body), tmp_path, 50_000, 10))
+
+    assert excinfo.value.status_code == 413
+    # Abbruch kurz nach dem Limit, der Rest des Bodys wird nicht gelesen
+    assert body.read <= 50_000 // 4096 + 2 < len(body.chunks)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_content_length_is_rejected_before_reading(tmp_path):
+    body = Body(b"x" * 10)
+    request = _request(body, headers=[(b"content-length", b"999999999")])
+
+    with pytest.raises(UploadRejected) as excinfo:
+        asyncio.run(receive_pdf_upload(request, tmp_path, 10 ** 6, 10))
+
+    assert excinfo.value.status_code == 413 and body.read == 0
+
+
+@pytest.mark.parametrize("content, filename, status, detail", [
+    (b"MZ\x90\x00" + b"\x00" * 3000, "auszug.pdf", 400, "keine PDF"),
+    (b"%PDF-1.4\nkaputt", "auszug.pdf", 400, "beschädigt"),
+    (b"%PDF-1.4\n", "auszug.exe", 400, "Nur PDF"),
+])
+def test_invalid_uploads_are_rejected(upload_dir, queued, content, filename, status, detail):
+    response = _post(_multipart(content, filename=filename))
+
+    assert response.status_code == status
+    assert detail in response.json()["detail"]
+    assert queued == []
+    assert list((upload_dir / ".incoming").glob("*")) == []
+
+
+def test_too_many_pages(upload_dir, queued, pdf_bytes, monkeypatch):
+    monkeypatch.setattr(upload, "MAX_PDF_PAGES", 1)
+
+    response = _post(_multipart(pdf_bytes))
+
+    assert response.status_code == 413 and "Seiten" in response.json()["detail"]
+    assert queued == []